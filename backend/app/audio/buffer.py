@@ -0,0 +1,128 @@
+"""Preallocated per-session audio storage for conversation buffering."""
+
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+
+logger = logging.getLogger("webrtc.audio.buffer")
+
+_INT16_SCALE = 32768.0
+
+
+class AudioRingBuffer:
+    """Growable ring of samples that hands out zero-copy views.
+
+    Samples are written in place into a preallocated array. When the buffer
+    fills up, already-consumed samples are reclaimed first; only if that is
+    not enough does the storage grow (geometrically, so appends stay amortised
+    O(1)). Views returned by :meth:`view` alias the underlying storage and stay
+    valid after a later growth because NumPy keeps the old block alive; a
+    reclaim after :meth:`consume` may overwrite them, so callers must not hold
+    views across a consume + write.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        initial_seconds: float = 30.0,
+        dtype: str | np.dtype = np.float32,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.dtype(np.float32), np.dtype(np.int16)):
+            raise ValueError(f"Unsupported buffer dtype: {self.dtype}")
+        capacity = max(int(initial_seconds * sample_rate), 1)
+        self._data = np.empty(capacity, dtype=self.dtype)
+        self._head = 0  # first unconsumed sample
+        self._tail = 0  # one past the last written sample
+        self._consumed = 0  # samples discarded from the front since creation
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    @property
+    def capacity(self) -> int:
+        return self._data.shape[0]
+
+    @property
+    def duration_seconds(self) -> float:
+        return len(self) / self.sample_rate
+
+    @property
+    def start_offset(self) -> int:
+        """Absolute index (since creation) of the first retained sample."""
+        return self._consumed
+
+    @property
+    def end_offset(self) -> int:
+        """Absolute index (since creation) one past the last written sample."""
+        return self._consumed + len(self)
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append float32 samples in [-1, 1] or int16 PCM, converting in place."""
+        count = samples.shape[0]
+        if count == 0:
+            return
+        self._reserve(count)
+        dest = self._data[self._tail : self._tail + count]
+        if samples.dtype == self.dtype:
+            dest[:] = samples
+        elif self.dtype == np.int16:
+            dest[:] = np.clip(samples * _INT16_SCALE, -32768, 32767)
+        elif samples.dtype == np.int16:
+            np.multiply(samples, 1.0 / _INT16_SCALE, out=dest, casting="unsafe")
+        else:
+            # Other float dtypes are already in [-1, 1]; only the precision changes.
+            dest[:] = samples
+        self._tail += count
+
+    def view(self, start: int | None = None, end: int | None = None) -> np.ndarray:
+        """Zero-copy view over retained samples using absolute offsets."""
+        lo = self._consumed if start is None else max(start, self._consumed)
+        hi = self.end_offset if end is None else min(end, self.end_offset)
+        if hi <= lo:
+            return self._data[:0]
+        base = self._head - self._consumed
+        return self._data[base + lo : base + hi]
+
+    def as_float32(self, start: int | None = None, end: int | None = None) -> np.ndarray:
+        """Float32 samples for downstream models.
+
+        Zero-copy when the buffer stores float32; int16 storage is converted
+        (one copy at half the resident size of a float32 buffer).
+        """
+        samples = self.view(start, end)
+        if self.dtype == np.float32:
+            return samples
+        return samples.astype(np.float32) / _INT16_SCALE
+
+    def consume(self, count: int) -> None:
+        """Discard ``count`` samples from the front; storage is reused on write."""
+        count = min(max(count, 0), len(self))
+        self._head += count
+        self._consumed += count
+        if self._head == self._tail:
+            self._head = self._tail = 0
+
+    def clear(self) -> None:
+        self._consumed += len(self)
+        self._head = self._tail = 0
+
+    def _reserve(self, count: int) -> None:
+        if self._tail + count <= self.capacity:
+            return
+        live = len(self)
+        if live + count <= self.capacity:
+            # Reclaim the consumed prefix before resorting to a reallocation.
+            self._data[:live] = self._data[self._head : self._tail]
+        else:
+            new_capacity = self.capacity
+            while new_capacity < live + count:
+                new_capacity *= 2
+            grown = np.empty(new_capacity, dtype=self.dtype)
+            grown[:live] = self._data[self._head : self._tail]
+            self._data = grown
+            logger.debug("Grew audio buffer to %d samples", new_capacity)
+        self._head, self._tail = 0, live
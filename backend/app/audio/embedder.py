@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
 import os
 from datetime import datetime
@@ -11,6 +10,7 @@ from datetime import datetime
 import numpy as np
 import torch
 from ..core import AudioSegment, SpeakerEmbedding
+from ..core.executors import run_in_pool
 
 logger = logging.getLogger("webrtc.audio.embedder")
 
@@ -78,7 +78,7 @@ class PyannoteSpeakerEmbedder:
             )
             return result
 
-        embedding_vector = await asyncio.to_thread(_infer)
+        embedding_vector = await run_in_pool("inference", _infer)
         if hasattr(embedding_vector, "cpu"):
             embedding_vector = embedding_vector.cpu().numpy()
 
@@ -0,0 +1,136 @@
+"""Live ingestion of WebRTC audio frames into the audio pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from ..core.frames import PcmFrame
+
+if TYPE_CHECKING:
+    from .pipeline import AudioPipeline
+
+logger = logging.getLogger("webrtc.audio.ingest")
+
+
+def frame_to_mono_pcm16(frame) -> np.ndarray:
+    """Mono int16 samples from an aiortc/PyAV ``AudioFrame``.
+
+    Packed multi-channel frames arrive as ``(1, samples * channels)`` and
+    planar ones as ``(channels, samples)``; both are averaged to mono.
+    """
+    samples = frame.to_ndarray()
+    channels = len(frame.layout.channels)
+    if samples.dtype != np.int16:
+        if np.issubdtype(samples.dtype, np.floating):
+            samples = np.clip(samples * 32768.0, -32768, 32767)
+        samples = samples.astype(np.int16)
+    if channels <= 1:
+        return samples.reshape(-1)
+    if frame.format.is_planar:
+        stacked = samples.reshape(channels, -1)
+        return stacked.mean(axis=0, dtype=np.float32).astype(np.int16)
+    return samples.reshape(-1, channels).mean(axis=1, dtype=np.float32).astype(np.int16)
+
+
+class AudioIngestor:
+    """Aggregates 10–20 ms WebRTC frames into blocks for ``process_chunk``.
+
+    Blocks of ``block_ms`` are queued on a bounded per-session queue drained
+    by a single consumer task, so slow transcription or embedding never
+    blocks ``track.recv()``. When the pipeline falls more than
+    ``max_queue_blocks`` behind, the oldest block is dropped: stale audio
+    is worth less than keeping the live session current.
+    """
+
+    def __init__(
+        self,
+        pipeline: "AudioPipeline",
+        session_id: str,
+        block_ms: int = 160,
+        max_queue_blocks: int = 25,
+    ) -> None:
+        self.pipeline = pipeline
+        self.session_id = session_id
+        self.block_ms = block_ms
+        self.dropped_blocks = 0
+        self._queue: asyncio.Queue[Optional[PcmFrame]] = asyncio.Queue(
+            maxsize=max(max_queue_blocks, 1)
+        )
+        self._sample_rate: Optional[int] = None
+        self._block = np.empty(0, dtype=np.int16)
+        self._filled = 0
+        self._last_drop_log = 0.0
+        self._consumer = asyncio.create_task(self._consume())
+
+    @property
+    def sample_rate(self) -> Optional[int]:
+        return self._sample_rate
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def push_frame(self, frame) -> None:
+        """Append one decoded frame, emitting a block whenever one fills up."""
+        sample_rate = getattr(frame, "sample_rate", None) or 16000
+        samples = frame_to_mono_pcm16(frame)
+        if sample_rate != self._sample_rate:
+            self._emit()
+            self._sample_rate = sample_rate
+            self._block = np.empty(sample_rate * self.block_ms // 1000, dtype=np.int16)
+            self._filled = 0
+
+        offset = 0
+        while offset < samples.size:
+            take = min(self._block.size - self._filled, samples.size - offset)
+            self._block[self._filled : self._filled + take] = samples[offset : offset + take]
+            self._filled += take
+            offset += take
+            if self._filled == self._block.size:
+                self._emit()
+
+    async def close(self) -> None:
+        """Emit the partial block, drain the queue and flush the session."""
+        self._emit()
+        await self._queue.put(None)
+        await self._consumer
+        if self._sample_rate is not None:
+            await self.pipeline.flush_session(self.session_id, self._sample_rate)
+
+    def _emit(self) -> None:
+        if self._filled == 0 or self._sample_rate is None:
+            return
+        # Hand the filled block over as-is and start a fresh one, so the
+        # queued frame is a view with no copy.
+        chunk = PcmFrame.now(self.session_id, self._block[: self._filled], self._sample_rate)
+        self._block = np.empty_like(self._block)
+        self._filled = 0
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped_blocks += 1
+            now = time.monotonic()
+            if now - self._last_drop_log > 5.0:
+                self._last_drop_log = now
+                logger.warning(
+                    "Session %s audio pipeline lagging; dropped %d blocks so far",
+                    self.session_id,
+                    self.dropped_blocks,
+                )
+        self._queue.put_nowait(chunk)
+
+    async def _consume(self) -> None:
+        while True:
+            chunk = await self._queue.get()
+            if chunk is None:
+                return
+            try:
+                await self.pipeline.process_chunk(chunk)
+            except Exception as exc:  # noqa: BLE001
+                logger.exception(
+                    "Error processing audio for session %s: %s", self.session_id, exc
+                )
@@ -4,24 +4,31 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 import uuid
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import torch
 
-from ..core import AudioChunk, ConversationEvent, ConversationUtterance
+from ..core import ConversationEvent, ConversationUtterance
+from ..core.config import (
+    AUDIO_PRE_ROLL_SECONDS,
+    SPEAKER_PROFILE_DIR,
+    SPEAKER_SNAPSHOT_INTERVAL_SECONDS,
+)
+from ..core.executors import run_in_pool
+from ..core.frames import PcmFrame
+from ..core.model_workers import get_model_workers
 from ..services.conversation_stream import ConversationEventBus
+from .buffer import AudioRingBuffer
 from .denoiser import AdaptiveDenoiser
-
-try:  # pragma: no cover - optional dependency
-    from faster_whisper import WhisperModel
-    faster_whisper_available = True
-except ImportError:  # pragma: no cover
-    WhisperModel = None
-    faster_whisper_available = False
+from .resampler import ResamplerRegistry
+from .speakers import SpeakerProfileArchive, SpeakerRegistryState, normalize
+from .transcription import Transcriber, TranscriptSegment, build_default_router
+from .vad import BatchedVAD, float_to_pcm16
 
 try:  # pragma: no cover - optional dependency
     from groq import Groq
@@ -30,30 +37,6 @@ except ImportError:  # pragma: no cover
     Groq = None
     groq_available = False
 
-try:  # pragma: no cover - optional dependency
-    from elevenlabs.client import ElevenLabs
-    elevenlabs_available = True
-except ImportError:  # pragma: no cover
-    ElevenLabs = None
-    elevenlabs_available = False
-
-try:  # pragma: no cover - Sarvam AI for Indian English
-    from sarvamai import SarvamAI
-    sarvam_available = True
-except ImportError:  # pragma: no cover
-    SarvamAI = None
-    sarvam_available = False
-
-try:  # pragma: no cover - optional dependency
-    from torchaudio.functional import resample as ta_resample
-except ImportError:  # pragma: no cover
-    ta_resample = None
-
-try:  # pragma: no cover - optional dependency
-    import webrtcvad
-except ImportError:  # pragma: no cover
-    webrtcvad = None
-
 try:  # pragma: no cover - optional dependency
     from pyannote.audio import Inference as PyannoteInference, Model as PyannoteModel
 except ImportError:  # pragma: no cover
@@ -62,12 +45,6 @@ except ImportError:  # pragma: no cover
 
 logger = logging.getLogger("webrtc.audio.pipeline")
 
-# Indian English optimization prompt - hyper-focused on user's name
-# Repetition helps Whisper learn the correct spelling
-INDIAN_ENGLISH_PROMPT = """My name is Mayank. I'm Mayank. Hi, I'm Mayank Joshi. 
-Mayank speaking here. This is Mayank. Hello, my name is Mayank.
-Other names: Priya, Rahul, Aarav, Ananya, Vikram, Neha, Arjun."""
-
 
 @dataclass
 class PipelineConfig:
@@ -82,7 +59,19 @@ class PipelineConfig:
     embedding_model: str = "pyannote/embedding"
     speaker_match_threshold: float = 0.25
     embedding_window_seconds: float = 1.0
+    embedding_batch_size: int = 32  # windows per pyannote forward pass
+    embedding_windows_per_segment: int = 5
+    embedding_windows_non_overlapping: bool = False  # avoid near-duplicate windows
     disable_realtime_publish: bool = True  # Keep strictly for manual recording flow
+    buffer_dtype: str = "float32"  # "int16" halves resident memory per session
+    buffer_initial_seconds: float = 30.0
+    pre_roll_seconds: float = AUDIO_PRE_ROLL_SECONDS  # buffered audio kept before speech
+    streaming_transcription: bool = False  # Per-utterance; overrides disable_realtime_publish
+    utterance_silence_seconds: float = 0.4
+    min_utterance_seconds: float = 0.5
+    max_utterance_seconds: float = 20.0
+    speaker_profile_dir: str = SPEAKER_PROFILE_DIR  # "" keeps profiles in memory only
+    speaker_snapshot_interval_seconds: float = SPEAKER_SNAPSHOT_INTERVAL_SECONDS
 
 
 @dataclass
@@ -93,27 +82,13 @@ class ConversationState:
     last_speech_ts: float | None
     noise_floor_rms: float | None = None
     has_speech: bool = False
-    chunks: List[np.ndarray] | None = None
+    buffer: AudioRingBuffer | None = None
     last_speaker_id: str | None = None
-
-    def __post_init__(self) -> None:
-        if self.chunks is None:
-            self.chunks = []
-
-
-@dataclass
-class TranscriptSegment:
-    start: float
-    end: float
-    text: str
-    speaker: Optional[str] = None
-
-
-@dataclass
-class SpeakerProfile:
-    speaker_id: str
-    embedding: np.ndarray
-    count: int = 1
+    origin: int = 0  # buffer offset transcript times are relative to
+    utterance_start: int | None = None  # buffer offset of the open utterance
+    utterance_speech_end: int = 0
+    utterance_tasks: List[asyncio.Task] = field(default_factory=list)
+    transcript: List[TranscriptSegment] = field(default_factory=list)
 
 
 class AudioPipeline:
@@ -124,19 +99,32 @@ class AudioPipeline:
         denoiser: AdaptiveDenoiser,
         config: PipelineConfig | None = None,
         conversation_bus: ConversationEventBus | None = None,
+        transcriber: Transcriber | None = None,
     ) -> None:
         self.denoiser = denoiser
         self.config = config or PipelineConfig()
+        # Long-lived backends keep their SDK/HTTP clients across utterances.
+        self._transcriber = transcriber or build_default_router(
+            whisper_model=self.config.transcription_model
+        )
+        self._groq_client = None
         self._conversations: Dict[str, ConversationState] = {}
-        self._whisper_model = None
-        self._whisper_lock = asyncio.Lock()
-        self._vad = webrtcvad.Vad(self.config.vad_aggressiveness) if webrtcvad else None
+        self._resamplers = ResamplerRegistry()
+        self._vad = BatchedVAD(self.config.vad_aggressiveness, frame_ms=20)
         self._pyannote_inference = None
-        self._speaker_profiles: List[SpeakerProfile] = []
-        self._speaker_names: Dict[str, str] = {}  # speaker_id -> real name
-        self._speaker_convex_ids: Dict[str, str] = {}  # local speaker_id -> Convex ID
+        # Warm-load the speaker registry so restarts keep identities and Convex IDs.
+        self._speaker_archive = (
+            SpeakerProfileArchive(self.config.speaker_profile_dir)
+            if self.config.speaker_profile_dir
+            else None
+        )
+        registry = self._speaker_archive.load() if self._speaker_archive else SpeakerRegistryState()
+        self._speaker_store = registry.store
+        self._speaker_names: Dict[str, str] = registry.names  # speaker_id -> real name
+        self._speaker_convex_ids: Dict[str, str] = registry.convex_ids  # local speaker_id -> Convex ID
         self._speaker_lock = asyncio.Lock()
-        self._next_speaker_index = 10
+        self._next_speaker_index = registry.next_index
+        self._last_speaker_snapshot = time.monotonic()
         self._pyannote_auth_token = os.getenv("PYANNOTE_AUTH_TOKEN")
         self._conversation_bus = conversation_bus
         
@@ -144,7 +132,14 @@ class AudioPipeline:
         from ..services.convex_client import get_convex_service
         self._convex = get_convex_service()
 
-        if PyannoteInference is None:
+        # With MODEL_WORKER_PROCESSES set, embeddings run in worker processes
+        # that load their own copy of the model.
+        self._model_workers = get_model_workers(
+            self.config.embedding_model, self._pyannote_auth_token
+        )
+        if self._model_workers is not None:
+            logger.info("Speaker embeddings offloaded to model worker processes")
+        elif PyannoteInference is None:
             logger.warning(
                 "pyannote.audio is not installed; speaker attribution will remain disabled"
             )
@@ -183,18 +178,20 @@ class AudioPipeline:
                 )
                 self._pyannote_inference = None
 
-    async def process_chunk(self, chunk: AudioChunk) -> None:
+    async def process_chunk(self, chunk: PcmFrame) -> None:
         session_id = chunk.session_id
-        state = self._ensure_conversation(session_id, chunk.timestamp.timestamp())
+        state = self._ensure_conversation(session_id, chunk.timestamp)
 
         denoised = await self.denoiser.denoise(chunk)
-        audio = self._convert_to_target_sr(denoised.payload, denoised.sample_rate)
+        audio = self._convert_to_target_sr(
+            session_id, denoised.samples, denoised.sample_rate
+        )
         if audio.size == 0:
             logger.debug("Session %s chunk had no audio data", session_id)
             return
 
         rms = float(np.sqrt(np.mean(np.square(audio)))) if audio.size else 0.0
-        has_speech = self._chunk_has_speech(audio)
+        has_speech = self._chunk_has_speech(audio, state.noise_floor_rms)
         effective_threshold = self.config.min_speech_rms
         if state.noise_floor_rms is not None:
             effective_threshold = max(
@@ -213,10 +210,11 @@ class AudioPipeline:
             "Session %s chunk rms=%.5f has_speech=%s", session_id, rms, has_speech
         )
 
-        state.chunks.append(audio)
-        state.last_audio_ts = chunk.timestamp.timestamp()
+        chunk_start = state.buffer.end_offset
+        state.buffer.write(audio)
+        state.last_audio_ts = chunk.timestamp
 
-        now = chunk.timestamp.timestamp()
+        now = chunk.timestamp
         if not has_speech:
             smoothing = min(max(self.config.noise_floor_smoothing, 0.0), 0.999)
             if state.noise_floor_rms is None:
@@ -227,6 +225,8 @@ class AudioPipeline:
                     + rms * (1.0 - smoothing)
                 )
         if has_speech:
+            if not state.has_speech:
+                state.origin = state.buffer.start_offset
             state.last_speech_ts = now
             state.has_speech = True
             logger.info(
@@ -235,7 +235,10 @@ class AudioPipeline:
                 state.conversation_id,
                 rms,
             )
-        elif state.has_speech and state.last_speech_ts is not None:
+        if self.config.streaming_transcription:
+            self._track_utterance(state, session_id, has_speech, chunk_start)
+        self._trim_buffer(state)
+        if not has_speech and state.has_speech and state.last_speech_ts is not None:
             elapsed = now - state.last_speech_ts
             if elapsed >= self.config.silence_timeout_seconds:
                 logger.info(
@@ -249,12 +252,11 @@ class AudioPipeline:
     async def flush_session(self, session_id: str, sample_rate: int) -> None:  # noqa: ARG002
         if session_id in self._conversations:
             await self._finalize_conversation(session_id, "session flush")
+        self._resamplers.release(session_id)
+        self.denoiser.release(session_id)
 
     async def warm_whisper(self) -> None:
-        if not faster_whisper_available:
-            logger.info("faster-whisper not installed; skipping warm-up")
-            return
-        await self._load_whisper_model()
+        await self._transcriber.warm_up()
 
     def _ensure_conversation(self, session_id: str, ts: float) -> ConversationState:
         state = self._conversations.get(session_id)
@@ -265,6 +267,11 @@ class AudioPipeline:
                 started_ts=ts,
                 last_audio_ts=ts,
                 last_speech_ts=None,
+                buffer=AudioRingBuffer(
+                    self.config.target_sample_rate,
+                    initial_seconds=self.config.buffer_initial_seconds,
+                    dtype=self.config.buffer_dtype,
+                ),
             )
             self._conversations[session_id] = state
             logger.info(
@@ -279,8 +286,9 @@ class AudioPipeline:
         if state is None:
             return
 
-        # Skip real-time transcription if disabled (only Record button will work)
-        if self.config.disable_realtime_publish:
+        # Skip real-time transcription if disabled (only Record button will work).
+        # Asking for streaming transcription explicitly overrides that default.
+        if self.config.disable_realtime_publish and not self.config.streaming_transcription:
             logger.info(
                 "Skipping real-time transcription for %s (disable_realtime_publish=True)",
                 state.conversation_id,
@@ -297,9 +305,16 @@ class AudioPipeline:
                 duration,
                 state.has_speech,
             )
+            for task in state.utterance_tasks:
+                task.cancel()
             return
 
-        audio = np.concatenate(state.chunks) if state.chunks else np.array([], dtype=np.float32)
+        if self.config.streaming_transcription:
+            transcript = await self._drain_utterances(state, session_id)
+            await self._complete_conversation(state, session_id, reason, duration, transcript)
+            return
+
+        audio = state.buffer.as_float32()
         if audio.size == 0:
             logger.info(
                 "Conversation %s for session=%s had no samples after buffering",
@@ -315,7 +330,17 @@ class AudioPipeline:
         for seg in transcript:
             if seg.speaker and seg.text:
                 await self._extract_and_assign_name(seg.text, seg.speaker)
-        
+
+        await self._complete_conversation(state, session_id, reason, duration, transcript)
+
+    async def _complete_conversation(
+        self,
+        state: ConversationState,
+        session_id: str,
+        reason: str,
+        duration: float,
+        transcript: List[TranscriptSegment],
+    ) -> None:
         if transcript:
             # Save conversation to Convex for each speaker (Generates/Gets Convex IDs)
             await self._save_conversation_to_convex(transcript, duration)
@@ -335,295 +360,129 @@ class AudioPipeline:
             "Ending conversation %s for session=%s (reason=%s, duration=%.2fs)",
             state.conversation_id,
             session_id,
-        reason,
+            reason,
             duration,
         )
-
-    async def _transcribe_audio(self, audio: np.ndarray) -> List[TranscriptSegment]:
-        # Try Sarvam AI first (Best for Indian English)
-        if sarvam_available and os.environ.get("SARVAM_API_KEY"):
-            sarvam_result = await self._transcribe_with_sarvam(audio)
-            if sarvam_result:
-                return sarvam_result
-        
-        # Try Groq cloud API second (with Indian English prompting)
-        if groq_available and os.environ.get("GROQ_API_KEY"):
-            groq_result = await self._transcribe_with_groq(audio)
-            if groq_result:
-                return groq_result
-        
-        # Try ElevenLabs Scribe v2 third
-        if elevenlabs_available and os.environ.get("ELEVENLABS_API_KEY"):
-            scribe_result = await self._transcribe_with_elevenlabs(audio)
-            if scribe_result:
-                return scribe_result
-
-        # Fallback to local faster-whisper
-        return await self._transcribe_with_local_whisper(audio)
-    
-    async def _transcribe_with_sarvam(self, audio: np.ndarray) -> List[TranscriptSegment]:
-        """Transcribe audio using Sarvam AI (optimized for Indian English).
-        
-        Handles audio longer than 30 seconds by chunking into smaller segments.
+        await self.save_speaker_profiles()
+
+    def _trim_buffer(self, state: ConversationState) -> None:
+        """Discard buffered audio no transcription will read.
+
+        Before speech only ``pre_roll_seconds`` are kept, so a silent room
+        does not grow the buffer without bound. When streaming, transcribed
+        audio ahead of the open utterance is dropped as well; otherwise the
+        whole conversation is transcribed at the end and nothing after the
+        first speech may go. Utterance tasks hold views into the buffer,
+        which a reclaim after :meth:`AudioRingBuffer.consume` could
+        overwrite, so nothing is dropped while one is running.
         """
-        import tempfile
-        import wave
-        
-        api_key = os.environ.get("SARVAM_API_KEY")
-        if not api_key:
-            return []
-        
-        try:
-            sample_rate = self.config.target_sample_rate
-            duration_sec = len(audio) / sample_rate
-            
-            # Sarvam has 30-second limit, use 25-second chunks with 1-second overlap
-            MAX_CHUNK_SEC = 25.0
-            OVERLAP_SEC = 1.0
-            
-            all_segments: List[TranscriptSegment] = []
-            
-            if duration_sec <= MAX_CHUNK_SEC:
-                # Single chunk - original logic
-                chunks = [(audio, 0.0)]
-            else:
-                # Split into overlapping chunks
-                chunks = []
-                chunk_samples = int(MAX_CHUNK_SEC * sample_rate)
-                overlap_samples = int(OVERLAP_SEC * sample_rate)
-                step_samples = chunk_samples - overlap_samples
-                
-                offset = 0
-                while offset < len(audio):
-                    chunk_end = min(offset + chunk_samples, len(audio))
-                    chunk_audio = audio[offset:chunk_end]
-                    chunk_start_time = offset / sample_rate
-                    chunks.append((chunk_audio, chunk_start_time))
-                    offset += step_samples
-                    
-                logger.info("Splitting %.2fs audio into %d chunks for Sarvam", duration_sec, len(chunks))
-            
-            for chunk_audio, chunk_offset in chunks:
-                # Convert float32 audio to int16 WAV
-                audio_int16 = (chunk_audio * 32767).astype(np.int16)
-                
-                # Save to temp WAV file
-                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-                    temp_path = f.name
-                    with wave.open(f, 'wb') as wav:
-                        wav.setnchannels(1)
-                        wav.setsampwidth(2)
-                        wav.setframerate(sample_rate)
-                        wav.writeframes(audio_int16.tobytes())
-                
-                # Call Sarvam API
-                def _call_sarvam():
-                    client = SarvamAI(api_subscription_key=api_key)
-                    with open(temp_path, "rb") as audio_file:
-                        response = client.speech_to_text.transcribe(
-                            file=audio_file,
-                            language_code="en-IN",  # Indian English
-                            model="saarika:v2.5"
-                        )
-                    return response
-                
-                result = await asyncio.to_thread(_call_sarvam)
-                
-                # Clean up temp file
-                os.unlink(temp_path)
-                
-                # Parse response
-                if result and hasattr(result, 'transcript') and result.transcript:
-                    chunk_duration = len(chunk_audio) / sample_rate
-                    all_segments.append(TranscriptSegment(
-                        start=chunk_offset,
-                        end=chunk_offset + chunk_duration,
-                        text=result.transcript.strip(),
-                    ))
-            
-            if all_segments:
-                full_text = " ".join(seg.text for seg in all_segments)
-                logger.info("Sarvam transcription: %s", full_text[:100] + "..." if len(full_text) > 100 else full_text)
-            
-            return all_segments
-            
-        except Exception as exc:
-            logger.warning("Sarvam transcription failed: %s", exc)
-            return []
+        buffer = state.buffer
+        keep_from = buffer.end_offset - int(
+            self.config.pre_roll_seconds * self.config.target_sample_rate
+        )
+        if self.config.streaming_transcription:
+            if any(not task.done() for task in state.utterance_tasks):
+                return
+            if state.utterance_start is not None:
+                keep_from = min(keep_from, state.utterance_start)
+        elif state.has_speech:
+            return
+        if keep_from > buffer.start_offset:
+            buffer.consume(keep_from - buffer.start_offset)
 
-    async def _transcribe_with_elevenlabs(self, audio: np.ndarray) -> List[TranscriptSegment]:
-        """Transcribe audio using ElevenLabs Scribe v2."""
-        import tempfile
-        import wave
-        
-        api_key = os.environ.get("ELEVENLABS_API_KEY")
-        if not api_key:
-            return []
-            
-        try:
-            # Normalize audio
-            audio_rms = np.sqrt(np.mean(audio ** 2))
-            if audio_rms > 0.001:
-                target_rms = 0.1
-                gain = min(target_rms / audio_rms, 10.0)
-                audio = np.clip(audio * gain, -1.0, 1.0)
-            
-            # Convert to WAV
-            audio_int16 = (audio * 32767).astype(np.int16)
-            
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-                temp_path = f.name
-                with wave.open(f, 'wb') as wav:
-                    wav.setnchannels(1)
-                    wav.setsampwidth(2)
-                    wav.setframerate(self.config.target_sample_rate)
-                    wav.writeframes(audio_int16.tobytes())
-            
-            # Call ElevenLabs API
-            def _call_scribe():
-                client = ElevenLabs(api_key=api_key)
-                with open(temp_path, "rb") as audio_file:
-                    return client.speech_to_text.convert(
-                        file=audio_file,
-                        model_id="scribe_v2"
-                    )
-            
-            result = await asyncio.to_thread(_call_scribe)
-            os.unlink(temp_path)
-            
-            if result and hasattr(result, "text"):
-                logger.info("ElevenLabs transcription: %s", result.text)
-                # Create a single segment for now as Scribe v2 returns full text
-                return [TranscriptSegment(
-                    start=0.0,
-                    end=len(audio) / self.config.target_sample_rate,
-                    text=result.text.strip()
-                )]
-            return []
-            
-        except Exception as exc:
-            logger.warning("ElevenLabs transcription failed: %s", exc)
-            if 'temp_path' in locals() and os.path.exists(temp_path):
-                os.unlink(temp_path)
-            return []
+    def _track_utterance(
+        self,
+        state: ConversationState,
+        session_id: str,
+        has_speech: bool,
+        chunk_start: int,
+    ) -> None:
+        """Close the open utterance once VAD reports a stable pause."""
+        end = state.buffer.end_offset
+        if has_speech:
+            if state.utterance_start is None:
+                state.utterance_start = chunk_start
+            state.utterance_speech_end = end
+        if state.utterance_start is None:
+            return
 
-    async def _transcribe_with_local_whisper(self, audio: np.ndarray) -> List[TranscriptSegment]:
-        """Fallback transcription using local faster-whisper."""
-        if not faster_whisper_available:
-            logger.warning("No transcription backend available")
-            return []
+        sr = self.config.target_sample_rate
+        silence = (end - state.utterance_speech_end) / sr
+        length = (end - state.utterance_start) / sr
+        if (
+            silence >= self.config.utterance_silence_seconds
+            or length >= self.config.max_utterance_seconds
+        ):
+            self._submit_utterance(state, session_id, state.utterance_start, end)
+            state.utterance_start = None
+
+    def _submit_utterance(
+        self, state: ConversationState, session_id: str, start: int, end: int
+    ) -> None:
+        if (end - start) / self.config.target_sample_rate < self.config.min_utterance_seconds:
+            return
+        previous = state.utterance_tasks[-1] if state.utterance_tasks else None
+        state.utterance_tasks.append(
+            asyncio.create_task(
+                self._transcribe_utterance(state, session_id, start, end, previous)
+            )
+        )
 
-        model = await self._load_whisper_model()
-        if model is None:
-            return []
+    async def _transcribe_utterance(
+        self,
+        state: ConversationState,
+        session_id: str,
+        start: int,
+        end: int,
+        previous: asyncio.Task | None,
+    ) -> None:
+        """Transcribe one utterance and publish it as a partial result.
 
-        try:
-            def _transcribe():
-                segments, info = model.transcribe(
-                    audio,
-                    language="en",
-                    task="transcribe",
-                    beam_size=5,
-                    best_of=5,
-                    vad_filter=True,
-                    vad_parameters=dict(min_silence_duration_ms=500),
-                    condition_on_previous_text=False,
-                    initial_prompt=INDIAN_ENGLISH_PROMPT,  # Indian accent optimization
-                )
-                return list(segments), info
-            
-            segments, info = await asyncio.to_thread(_transcribe)
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Local Whisper transcription failed: %s", exc)
-            return []
+        Transcription runs concurrently with earlier utterances; attribution
+        and publishing wait for the previous utterance so partials stay in order.
+        """
+        audio = state.buffer.as_float32(start, end)
+        segments = await self._transcribe_audio(audio)
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        if not segments:
+            return
 
-        snippets: List[TranscriptSegment] = []
+        await self._assign_speakers(state, session_id, audio, segments)
         for seg in segments:
-            text = seg.text.strip() if seg.text else ""
-            if text:
-                snippets.append(TranscriptSegment(
-                    start=seg.start,
-                    end=seg.end,
-                    text=text,
-                ))
-        
-        return snippets
+            if seg.speaker and seg.text:
+                await self._extract_and_assign_name(seg.text, seg.speaker)
 
-    async def _transcribe_with_groq(self, audio: np.ndarray) -> List[TranscriptSegment]:
-        """Transcribe audio using Groq's cloud Whisper API."""
-        import tempfile
-        import wave
-        import os
-        
-        api_key = os.environ.get("GROQ_API_KEY")
-        if not api_key:
-            logger.debug("GROQ_API_KEY not set; skipping Groq transcription")
-            return []
-        
-        try:
-            # Skip robust normalization to match "Playground" raw quality
-            # Whisper is good at handling dynamic range. Normalization often amplifies noise.
-            audio_normalized = audio
-            
-            # Convert float32 audio to int16 WAV
-            audio_int16 = (audio_normalized * 32767).astype(np.int16)
-            
-            # Log audio duration for debugging
-            duration_sec = len(audio) / self.config.target_sample_rate
-            logger.debug("Sending %.2fs audio to Groq (samples=%d)", duration_sec, len(audio))
-            
-            # Save to temp WAV file
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-                temp_path = f.name
-                with wave.open(f, 'wb') as wav:
-                    wav.setnchannels(1)
-                    wav.setsampwidth(2)  # 16-bit
-                    wav.setframerate(self.config.target_sample_rate)
-                    wav.writeframes(audio_int16.tobytes())
-            
-            # Call Groq API
-            def _call_groq():
-                client = Groq(api_key=api_key)
-                with open(temp_path, "rb") as audio_file:
-                    transcription = client.audio.transcriptions.create(
-                        file=(temp_path, audio_file.read()),
-                        model="whisper-large-v3-turbo",
-                        temperature=0.0,  # Deterministic output
-                        prompt=INDIAN_ENGLISH_PROMPT,
-                        language="en",
-                        response_format="verbose_json",
-                    )
-                return transcription
-            
-            result = await asyncio.to_thread(_call_groq)
-            
-            # Clean up temp file
-            os.unlink(temp_path)
-            
-            # Parse segments
-            snippets: List[TranscriptSegment] = []
-            if hasattr(result, "segments") and result.segments:
-                for seg in result.segments:
-                    text = seg.get("text", "").strip() if isinstance(seg, dict) else getattr(seg, "text", "").strip()
-                    start = seg.get("start", 0.0) if isinstance(seg, dict) else getattr(seg, "start", 0.0)
-                    end = seg.get("end", 0.0) if isinstance(seg, dict) else getattr(seg, "end", 0.0)
-                    if text:
-                        snippets.append(TranscriptSegment(start=start, end=end, text=text))
-            elif hasattr(result, "text") and result.text:
-                # Fallback: single segment
-                snippets.append(TranscriptSegment(
-                    start=0.0,
-                    end=len(audio) / self.config.target_sample_rate,
-                    text=result.text.strip(),
-                ))
-            
-            if snippets:
-                logger.info("Groq transcription successful: %s", snippets[0].text[:50] + "..." if len(snippets[0].text) > 50 else snippets[0].text)
-            return snippets
-            
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Groq transcription failed: %s", exc)
-            return []
+        offset = (start - state.origin) / self.config.target_sample_rate
+        for seg in segments:
+            seg.start += offset
+            seg.end += offset
+        state.transcript.extend(segments)
+        await self._publish_conversation_event(
+            state, session_id, segments, event_type="CONVERSATION_PARTIAL"
+        )
+
+    async def _drain_utterances(
+        self, state: ConversationState, session_id: str
+    ) -> List[TranscriptSegment]:
+        """Submit the trailing utterance, wait for all partials and stitch them."""
+        if state.utterance_start is not None:
+            self._submit_utterance(
+                state, session_id, state.utterance_start, state.buffer.end_offset
+            )
+            state.utterance_start = None
+        results = await asyncio.gather(*state.utterance_tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.warning(
+                    "Utterance transcription failed in %s: %s",
+                    state.conversation_id,
+                    result,
+                )
+        return sorted(state.transcript, key=lambda seg: seg.start)
+
+    async def _transcribe_audio(self, audio: np.ndarray) -> List[TranscriptSegment]:
+        return await self._transcriber.transcribe(audio, self.config.target_sample_rate)
 
     async def _extract_and_assign_name(self, text: str, speaker_id: str) -> Optional[str]:
         """Use Groq LLM to extract a name from phrases like 'I'm John' or 'My name is Sarah'."""
@@ -647,14 +506,16 @@ class AudioPipeline:
             match = re.search(pattern, text, re.IGNORECASE)
             if match:
                 name = match.group(1).title()
-                self._speaker_names[speaker_id] = name
+                self._set_speaker_name(speaker_id, name)
                 logger.info("Extracted name '%s' for %s using pattern matching", name, speaker_id)
                 return name
         
         # Use Groq LLM for more complex cases
+        if self._groq_client is None:
+            self._groq_client = Groq(api_key=api_key)
+        client = self._groq_client
         try:
             def _call_groq():
-                client = Groq(api_key=api_key)
                 response = client.chat.completions.create(
                     model="llama-3.1-8b-instant",
                     messages=[
@@ -672,11 +533,11 @@ class AudioPipeline:
                 )
                 return response.choices[0].message.content.strip()
             
-            result = await asyncio.to_thread(_call_groq)
+            result = await run_in_pool("io", _call_groq)
             
             if result and result.upper() != "NONE" and len(result) < 30:
                 name = result.title()
-                self._speaker_names[speaker_id] = name
+                self._set_speaker_name(speaker_id, name)
                 logger.info("Extracted name '%s' for %s using LLM", name, speaker_id)
                 return name
                 
@@ -707,19 +568,18 @@ class AudioPipeline:
             convex_id = self._speaker_convex_ids.get(speaker_id)
             if not convex_id:
                 # Need to find/create speaker in Convex using their embedding
-                profile = next(
-                    (p for p in self._speaker_profiles if p.speaker_id == speaker_id), 
-                    None
-                )
-                if profile:
+                embedding = self._speaker_store.get(speaker_id)
+                if embedding is not None:
                     result = await self._convex.find_or_create_speaker(
-                        embedding=profile.embedding.tolist(),
+                        embedding=embedding.tolist(),
                         name=self._speaker_names.get(speaker_id),
                         speaking_time=duration,
                     )
                     convex_id = result.get("speakerId")
                     if convex_id:
                         self._speaker_convex_ids[speaker_id] = convex_id
+                        if self._speaker_archive is not None:
+                            self._speaker_archive.append_convex_id(speaker_id, convex_id)
             
             if convex_id:
                 combined_text = " ".join(texts)
@@ -736,6 +596,38 @@ class AudioPipeline:
                         name=self._speaker_names[speaker_id],
                     )
 
+    def _set_speaker_name(self, speaker_id: str, name: str) -> None:
+        self._speaker_names[speaker_id] = name
+        if self._speaker_archive is not None:
+            self._speaker_archive.append_name(speaker_id, name)
+
+    async def save_speaker_profiles(self, force: bool = False) -> None:
+        """Snapshot the speaker registry if it changed and the interval elapsed.
+
+        Args:
+            force: Snapshot regardless of the interval (used on shutdown).
+        """
+        archive = self._speaker_archive
+        if archive is None or not archive.dirty:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_speaker_snapshot < self.config.speaker_snapshot_interval_seconds:
+            return
+        self._last_speaker_snapshot = now
+        async with self._speaker_lock:
+            arrays = self._speaker_store.to_arrays()
+            names = dict(self._speaker_names)
+            convex_ids = dict(self._speaker_convex_ids)
+            next_index = self._next_speaker_index
+            changes = archive.rotate_journal()
+        try:
+            await run_in_pool(
+                "io", archive.write_snapshot, arrays, names, convex_ids, next_index, changes
+            )
+            logger.info("Saved %d speaker profiles to %s", len(arrays[0]), archive.directory)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to snapshot speaker profiles: %s", exc)
+
     def get_speaker_display_name(self, speaker_id: str) -> str:
         """Get display name for a speaker (real name if known, otherwise speaker_id)."""
         return self._speaker_names.get(speaker_id, speaker_id)
@@ -807,6 +699,7 @@ class AudioPipeline:
         state: ConversationState,
         session_id: str,
         snippets: List[TranscriptSegment],
+        event_type: str = "CONVERSATION_END",
     ) -> None:
         if not snippets or self._conversation_bus is None:
             return
@@ -837,7 +730,7 @@ class AudioPipeline:
             person_id = primary_speaker_id
 
         event = ConversationEvent(
-            event_type="CONVERSATION_END",
+            event_type=event_type,
             conversation_id=state.conversation_id,
             session_id=session_id,
             person_id=person_id,
@@ -847,7 +740,8 @@ class AudioPipeline:
         try:
             await self._conversation_bus.publish(event)
             logger.info(
-                "Published conversation event %s with %d utterances",
+                "Published %s for %s with %d utterances",
+                event_type,
                 state.conversation_id,
                 len(conversation),
             )
@@ -858,73 +752,31 @@ class AudioPipeline:
                 exc,
             )
 
-    async def _load_whisper_model(self):
-        async with self._whisper_lock:
-            if self._whisper_model is not None:
-                return self._whisper_model
-            if not faster_whisper_available:
-                logger.warning("faster-whisper not installed; cannot load model")
-                return None
-            try:
-                # Use int8 quantization for best accuracy within 8GB VRAM
-                def _load():
-                    return WhisperModel(
-                        self.config.transcription_model,
-                        device="cuda",
-                        compute_type="int8_float16",  # Best balance of speed and accuracy
-                    )
-                model = await asyncio.to_thread(_load)
-            except Exception as exc:  # noqa: BLE001
-                logger.warning(
-                    "Failed to load faster-whisper model '%s': %s",
-                    self.config.transcription_model,
-                    exc,
-                )
-                self._whisper_model = None
-                return None
-            self._whisper_model = model
-            logger.info(
-                "Loaded faster-whisper model '%s' for transcription (CUDA, int8_float16)",
-                self.config.transcription_model,
-            )
-            return self._whisper_model
-
-    def _convert_to_target_sr(self, audio_bytes: bytes, sample_rate: int) -> np.ndarray:
-        if not audio_bytes:
+    def _convert_to_target_sr(
+        self, session_id: str, samples: np.ndarray, sample_rate: int
+    ) -> np.ndarray:
+        if samples.size == 0:
             return np.array([], dtype=np.float32)
-        audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32)
+        audio = samples.astype(np.float32)
         audio /= 32768.0
         if sample_rate == self.config.target_sample_rate:
             return audio
-        if ta_resample is None:
-            duration = audio.shape[0] / sample_rate
-            target_length = int(duration * self.config.target_sample_rate)
-            if target_length <= 0:
-                return np.array([], dtype=np.float32)
-            x_old = np.linspace(0, duration, num=audio.shape[0], endpoint=False)
-            x_new = np.linspace(0, duration, num=target_length, endpoint=False)
-            resampled = np.interp(x_new, x_old, audio)
-            return resampled.astype(np.float32)
-        tensor = torch.from_numpy(audio).unsqueeze(0)
-        tensor = ta_resample(tensor, sample_rate, self.config.target_sample_rate)
-        return tensor.squeeze(0).cpu().numpy().astype(np.float32)
-
-    def _chunk_has_speech(self, audio: np.ndarray) -> bool:
-        if self._vad is None or audio.size == 0:
+        resampler = self._resamplers.get(
+            session_id, sample_rate, self.config.target_sample_rate
+        )
+        return resampler.process(audio)
+
+    def _chunk_has_speech(
+        self, audio: np.ndarray, noise_floor: float | None = None
+    ) -> bool:
+        if not self._vad.is_available or audio.size == 0:
             return True
-        frame_samples = int(self.config.target_sample_rate * 0.02)
-        pcm16 = np.clip(audio * 32768.0, -32768, 32767).astype(np.int16)
-        if pcm16.size < frame_samples:
+        pcm16 = float_to_pcm16(audio)
+        if pcm16.size < self._vad.frame_samples(self.config.target_sample_rate):
             return False
-        for start in range(0, pcm16.size - frame_samples + 1, frame_samples):
-            frame = pcm16[start : start + frame_samples].tobytes()
-            try:
-                if self._vad.is_speech(frame, self.config.target_sample_rate):
-                    return True
-            except Exception as exc:  # noqa: BLE001
-                logger.debug("WebRTC VAD error: %s", exc)
-                return True
-        return False
+        return self._vad.has_speech(
+            pcm16, self.config.target_sample_rate, noise_floor=noise_floor
+        )
 
     async def _assign_speakers(
         self,
@@ -938,31 +790,11 @@ class AudioPipeline:
 
         publish_queue: List[Tuple[str, Optional[str], bool]] = []
 
-        if self._pyannote_inference is None:
+        if self._pyannote_inference is None and self._model_workers is None:
             logger.warning(
                 "pyannote embedding unavailable; using fallback speaker attribution"
             )
-            async with self._speaker_lock:
-                speaker_id = state.last_speaker_id
-                is_new = False
-                if speaker_id is None:
-                    speaker_id = self._register_new_speaker(np.zeros(1, dtype=np.float32))
-                    state.last_speaker_id = speaker_id
-                    is_new = True
-
-                for segment in snippets:
-                    segment.speaker = speaker_id
-                    publish_queue.append((speaker_id, segment.text, is_new))
-                    is_new = False
-
-            for speaker_id, utterance, is_new in publish_queue:
-                await self._publish_person_detected(
-                    session_id=session_id,
-                    conversation_id=state.conversation_id,
-                    speaker_id=speaker_id,
-                    utterance=utterance,
-                    is_new=is_new,
-                )
+            await self._assign_fallback_speaker(state, session_id, snippets)
             return
 
         sr = self.config.target_sample_rate
@@ -986,16 +818,27 @@ class AudioPipeline:
         if not windows:
             return
 
+        flat_windows = [window for _, prepared in windows for window, _ in prepared]
+        matrix = await self._embed_batch(flat_windows)
+        if matrix is None:
+            # Worker processes that failed to load pyannote, or a failed
+            # batch, must not leave the utterances unattributed.
+            logger.info(
+                "pyannote produced no embeddings for conversation %s; "
+                "using fallback speaker attribution",
+                state.conversation_id,
+            )
+            await self._assign_fallback_speaker(state, session_id, snippets)
+            return
+
         embeddings: List[Tuple[TranscriptSegment, np.ndarray]] = []
+        row = 0
         for segment, prepared_windows in windows:
-            vectors: List[Tuple[np.ndarray, float]] = []
-            for window, weight in prepared_windows:
-                embedding = await self._embed_audio(window)
-                if embedding is None or embedding.size == 0:
-                    continue
-                vectors.append((embedding, weight))
-
-            if not vectors:
+            rows = matrix[row : row + len(prepared_windows)]
+            weights = np.array([max(weight, 1e-6) for _, weight in prepared_windows])
+            row += len(prepared_windows)
+            valid = np.isfinite(rows).all(axis=1)
+            if not valid.any():
                 logger.info(
                     "No embedding generated for segment %.2f-%.2f in %s",
                     segment.start,
@@ -1004,21 +847,17 @@ class AudioPipeline:
                 )
                 continue
 
-            if len(vectors) > 1:
-                embeddings_array = np.vstack([vec for vec, _ in vectors])
-                weights = np.array([max(weight, 1e-6) for _, weight in vectors])
-                weights /= weights.sum()
-                averaged = (embeddings_array * weights[:, None]).sum(axis=0)
-                logger.info(
+            weights = weights[valid] / weights[valid].sum()
+            averaged = weights @ rows[valid]
+            if valid.sum() > 1:
+                logger.debug(
                     "Averaged %d embedding windows for segment %.2f-%.2f in %s",
-                    len(vectors),
+                    int(valid.sum()),
                     segment.start,
                     segment.end,
                     state.conversation_id,
                 )
-            else:
-                averaged = vectors[0][0]
-            embeddings.append((segment, averaged))
+            embeddings.append((segment, averaged.astype(np.float32)))
 
         if not embeddings:
             logger.info(
@@ -1045,6 +884,11 @@ class AudioPipeline:
     def _prepare_embedding_windows(
         self, segment_audio: np.ndarray
     ) -> List[Tuple[np.ndarray, float]]:
+        """Pick the loudest embedding windows of a segment, loudest first.
+
+        Window RMS comes from a single pass over the segment's squared
+        samples rather than a separate reduction per overlapping window.
+        """
         window_size = int(self.config.embedding_window_seconds * self.config.target_sample_rate)
         if window_size <= 0:
             return []
@@ -1053,25 +897,142 @@ class AudioPipeline:
             return [(segment_audio, rms)]
 
         step = max(window_size // 6, 1)
-        windows: List[Tuple[float, np.ndarray]] = []
-        for start in range(0, segment_audio.size - window_size + 1, step):
-            window = segment_audio[start : start + window_size]
-            rms = float(np.sqrt(np.mean(np.square(window))))
-            windows.append((rms, window))
+        starts = np.arange(0, segment_audio.size - window_size + 1, step)
+        # Energy between consecutive window boundaries, summed once, then a
+        # cumulative sum over those blocks gives every window's energy.
+        edges = np.union1d(starts, starts + window_size)
+        edges = edges[edges < segment_audio.size]
+        energy = np.concatenate(
+            ([0.0], np.cumsum(np.add.reduceat(np.square(segment_audio), edges, dtype=np.float64)))
+        )
+        window_energy = (
+            energy[np.searchsorted(edges, starts + window_size)]
+            - energy[np.searchsorted(edges, starts)]
+        )
+        rms = np.sqrt(np.maximum(window_energy, 0.0) / window_size)
+
+        top_k = min(max(self.config.embedding_windows_per_segment, 1), starts.size)
+        if self.config.embedding_windows_non_overlapping:
+            # Greedy by loudness, skipping windows that overlap a chosen one.
+            chosen: List[int] = []
+            for idx in np.argsort(-rms, kind="stable"):
+                if all(abs(starts[idx] - starts[c]) >= window_size for c in chosen):
+                    chosen.append(int(idx))
+                    if len(chosen) == top_k:
+                        break
+            best = np.array(chosen, dtype=np.int64)
+        else:
+            best = np.argpartition(-rms, top_k - 1)[:top_k]
+            best = best[np.argsort(-rms[best], kind="stable")]
+        return [
+            (segment_audio[starts[i] : starts[i] + window_size], float(rms[i]))
+            for i in best
+        ]
 
-        if not windows:
-            tail = segment_audio[-window_size:]
-            rms = float(np.sqrt(np.mean(np.square(tail))))
-            return [(tail, rms)]
+    async def _assign_fallback_speaker(
+        self,
+        state: ConversationState,
+        session_id: str,
+        snippets: List[TranscriptSegment],
+    ) -> None:
+        """Attribute every snippet to the conversation's last speaker (or a new one)."""
+        publish_queue: List[Tuple[str, Optional[str], bool]] = []
+        async with self._speaker_lock:
+            speaker_id = state.last_speaker_id
+            is_new = False
+            if speaker_id is None:
+                speaker_id = self._register_new_speaker(np.zeros(1, dtype=np.float32))
+                state.last_speaker_id = speaker_id
+                is_new = True
+
+            for segment in snippets:
+                segment.speaker = speaker_id
+                publish_queue.append((speaker_id, segment.text, is_new))
+                is_new = False
+
+        for speaker_id, utterance, is_new in publish_queue:
+            await self._publish_person_detected(
+                session_id=session_id,
+                conversation_id=state.conversation_id,
+                speaker_id=speaker_id,
+                utterance=utterance,
+                is_new=is_new,
+            )
+
+    async def _embed_batch(self, audio_windows: List[np.ndarray]) -> Optional[np.ndarray]:
+        """Embed many windows with as few pyannote forward passes as possible.
 
-        windows.sort(key=lambda item: item[0], reverse=True)
-        top_k = min(5, len(windows))
-        return [(windows[i][1], windows[i][0]) for i in range(top_k)]
+        Windows shorter than ``embedding_window_seconds`` are wrap-padded to
+        that length (repeating the speech rather than appending silence, which
+        would skew the statistics pooling) and stacked into
+        ``(batch, 1, samples)`` tensors of at most ``embedding_batch_size``.
+
+        Returns:
+            ``(len(audio_windows), D)`` float32 matrix; rows whose embedding
+            failed are NaN. ``None`` if nothing could be embedded.
+        """
+        inference = self._pyannote_inference
+        if (inference is None and self._model_workers is None) or not audio_windows:
+            return None
+
+        window_size = max(
+            int(self.config.embedding_window_seconds * self.config.target_sample_rate),
+            max(window.size for window in audio_windows),
+        )
+        batch = np.empty((len(audio_windows), 1, window_size), dtype=np.float32)
+        for i, window in enumerate(audio_windows):
+            if window.size == 0:
+                batch[i, 0] = 0.0
+            elif window.size < window_size:
+                batch[i, 0] = np.pad(window, (0, window_size - window.size), mode="wrap")
+            else:
+                batch[i, 0] = window
+
+        if self._model_workers is not None:
+            try:
+                return await self._model_workers.embed_windows(
+                    batch, self.config.embedding_batch_size
+                )
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Worker pyannote embedding failed: %s", exc)
+                return None
+
+        def _infer() -> Optional[np.ndarray]:
+            if not hasattr(inference, "infer"):
+                return None
+            step = max(self.config.embedding_batch_size, 1)
+            parts = []
+            for start in range(0, len(batch), step):
+                result = inference.infer(torch.from_numpy(batch[start : start + step]))
+                if hasattr(result, "cpu"):
+                    result = result.detach().cpu().numpy()
+                parts.append(np.asarray(result, dtype=np.float32).reshape(
+                    min(step, len(batch) - start), -1
+                ))
+            return np.concatenate(parts, axis=0)
+
+        try:
+            matrix = await run_in_pool("inference", _infer)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Batched pyannote embedding failed; embedding per window: %s", exc)
+            matrix = None
+        if matrix is not None:
+            return matrix
+
+        vectors = [await self._embed_audio(window) for window in audio_windows]
+        dim = next((v.size for v in vectors if v is not None and v.size), 0)
+        if dim == 0:
+            return None
+        matrix = np.full((len(vectors), dim), np.nan, dtype=np.float32)
+        for i, vector in enumerate(vectors):
+            if vector is not None and vector.size == dim:
+                matrix[i] = vector.reshape(-1)
+        return matrix
 
     async def _embed_audio(self, audio_window: np.ndarray) -> Optional[np.ndarray]:
         if self._pyannote_inference is None or audio_window.size == 0:
             return None
-        waveform = torch.from_numpy(audio_window.astype(np.float32)).unsqueeze(0)
+        waveform = torch.from_numpy(np.asarray(audio_window, dtype=np.float32)).unsqueeze(0)
 
         def _infer() -> Optional[np.ndarray]:
             inference = self._pyannote_inference
@@ -1090,7 +1051,7 @@ class AudioPipeline:
             return result
 
         try:
-            result = await asyncio.to_thread(_infer)
+            result = await run_in_pool("inference", _infer)
         except Exception as exc:  # noqa: BLE001
             logger.exception("pyannote embedding failed: %s", exc)
             return None
@@ -1110,104 +1071,49 @@ class AudioPipeline:
     def _match_speaker(
         self, vector: np.ndarray, previous_speaker: Optional[str]
     ) -> Tuple[str, bool]:
-        normalized = self._normalize_vector(vector)
+        normalized = normalize(vector)
         if normalized.size == 0:
             fallback = previous_speaker or self._register_new_speaker(normalized)
             return fallback, fallback != previous_speaker
 
-        scores: List[Tuple[SpeakerProfile, float]] = []
-        for profile in self._speaker_profiles:
-            score = float(np.dot(normalized, profile.embedding))
-            scores.append((profile, score))
-
-        if scores:
-            similarity_map = ", ".join(
-                f"{profile.speaker_id}:{score:.3f}" for profile, score in scores
-            )
-            logger.info("Speaker similarity map: %s", similarity_map)
-
-        prev_profile = self._find_profile(previous_speaker)
-        prev_score = float("-inf")
-        if prev_profile is not None:
-            prev_score = next(
-                (score for profile, score in scores if profile is prev_profile),
-                float(np.dot(normalized, prev_profile.embedding)),
-            )
-            logger.info(
-                "Speaker similarity with previous %s: %.3f",
-                prev_profile.speaker_id,
-                prev_score,
-            )
-
-        best_profile: Optional[SpeakerProfile] = None
-        best_score = float("-inf")
-        for profile, score in scores:
-            if profile is prev_profile:
-                continue
-            if score > best_score:
-                best_score = score
-                best_profile = profile
-
-        if best_profile is not None:
-            logger.info(
-                "Best speaker candidate %s score=%.3f (threshold=%.3f)",
-                best_profile.speaker_id,
-                best_score,
-                self.config.speaker_match_threshold,
+        if logger.isEnabledFor(logging.DEBUG) and len(self._speaker_store):
+            scores = self._speaker_store.scores(normalized)
+            logger.debug(
+                "Speaker similarity map: %s",
+                ", ".join(
+                    f"{speaker_id}:{score:.3f}"
+                    for speaker_id, score in zip(self._speaker_store.ids, scores)
+                ),
             )
 
-        candidate: Optional[Tuple[SpeakerProfile, float]] = None
-        for profile, score in scores:
-            if score >= self.config.speaker_match_threshold:
-                if candidate is None or score > candidate[1]:
-                    candidate = (profile, score)
-
-        if candidate is not None:
-            profile, score = candidate
+        best = self._speaker_store.match(normalized)
+        if best is not None and best[1] >= self.config.speaker_match_threshold:
+            speaker_id, score = best
             logger.info(
-                "Selecting speaker %s with score %.3f", profile.speaker_id, score
+                "Selecting speaker %s with score %.3f (previous=%s)",
+                speaker_id,
+                score,
+                previous_speaker,
             )
-            self._update_profile(profile, normalized)
-            return profile.speaker_id, False
+            self._speaker_store.update(speaker_id, normalized)
+            if self._speaker_archive is not None:
+                self._speaker_archive.mark_dirty()
+            return speaker_id, False
 
         new_id = self._register_new_speaker(normalized)
         return new_id, True
 
-    def _find_profile(self, speaker_id: Optional[str]) -> Optional[SpeakerProfile]:
-        if speaker_id is None:
-            return None
-        for profile in self._speaker_profiles:
-            if profile.speaker_id == speaker_id:
-                return profile
-        return None
-
-    def _update_profile(self, profile: SpeakerProfile, vector: np.ndarray) -> None:
-        weight = 1.0 / (profile.count + 1)
-        updated = profile.embedding * (1.0 - weight) + vector * weight
-        profile.embedding = self._normalize_vector(updated)
-        profile.count += 1
-
     def _register_new_speaker(self, vector: np.ndarray) -> str:
         speaker_id = f"speaker_{self._next_speaker_index:03d}"
         self._next_speaker_index += 1
-        profile = SpeakerProfile(
-            speaker_id=speaker_id,
-            embedding=self._normalize_vector(vector),
-            count=1,
-        )
-        self._speaker_profiles.append(profile)
+        self._speaker_store.add(speaker_id, vector)
+        if self._speaker_archive is not None:
+            self._speaker_archive.append_profile(
+                speaker_id, self._speaker_store.get(speaker_id), self._next_speaker_index
+            )
         logger.info(
             "Registered new speaker profile %s (total=%d)",
             speaker_id,
-            len(self._speaker_profiles),
+            len(self._speaker_store),
         )
         return speaker_id
-
-    @staticmethod
-    def _normalize_vector(vector: np.ndarray) -> np.ndarray:
-        if vector.size == 0:
-            return vector
-        norm = float(np.linalg.norm(vector))
-        if norm == 0.0:
-            return np.zeros_like(vector)
-        return (vector / norm).astype(np.float32)
@@ -0,0 +1,139 @@
+"""Polyphase resampling with cached kernels and per-session filter state."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from math import gcd
+from typing import Dict, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger("webrtc.audio.resampler")
+
+ZERO_CROSSINGS = 8
+ROLLOFF = 0.94
+KAISER_BETA = 8.0
+
+
+@dataclass(frozen=True)
+class PolyphaseKernel:
+    """Windowed-sinc low-pass filter split into ``up`` polyphase branches."""
+
+    up: int
+    down: int
+    bank: np.ndarray  # (up, taps), taps reversed for direct dot products
+    delay: int  # group delay in output samples
+
+    @property
+    def taps(self) -> int:
+        return self.bank.shape[1]
+
+
+@lru_cache(maxsize=32)
+def get_kernel(src_sr: int, dst_sr: int) -> PolyphaseKernel:
+    """Return the cached kernel for ``src_sr -> dst_sr``."""
+    if src_sr <= 0 or dst_sr <= 0:
+        raise ValueError(f"Invalid sample rates: {src_sr} -> {dst_sr}")
+    g = gcd(src_sr, dst_sr)
+    up, down = dst_sr // g, src_sr // g
+    factor = max(up, down)
+    half = ZERO_CROSSINGS * factor
+    n = np.arange(-half, half + 1, dtype=np.float64)
+    cutoff = ROLLOFF / factor
+    proto = cutoff * np.sinc(cutoff * n) * np.kaiser(n.size, KAISER_BETA) * up
+
+    taps = -(-proto.size // up)
+    padded = np.zeros(taps * up, dtype=np.float64)
+    padded[: proto.size] = proto
+    bank = padded.reshape(taps, up).T[:, ::-1]
+    logger.debug(
+        "Built resampling kernel %d->%d (up=%d down=%d taps=%d)",
+        src_sr,
+        dst_sr,
+        up,
+        down,
+        taps,
+    )
+    return PolyphaseKernel(
+        up=up,
+        down=down,
+        bank=np.ascontiguousarray(bank, dtype=np.float32),
+        delay=int(round(half / down)),
+    )
+
+
+class StreamingResampler:
+    """Stateful resampler; consecutive chunks are filtered seamlessly."""
+
+    def __init__(self, src_sr: int, dst_sr: int) -> None:
+        self.src_sr = src_sr
+        self.dst_sr = dst_sr
+        self.kernel = get_kernel(src_sr, dst_sr)
+        self.reset()
+
+    def reset(self) -> None:
+        self._history = np.zeros(self.kernel.taps - 1, dtype=np.float32)
+        self._in_pos = 0
+        self._out_pos = 0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Resample float32 ``samples``, carrying filter state to the next call."""
+        if self.src_sr == self.dst_sr:
+            return np.asarray(samples, dtype=np.float32)
+        if samples.size == 0:
+            return np.empty(0, dtype=np.float32)
+
+        kernel = self.kernel
+        up, down, taps = kernel.up, kernel.down, kernel.taps
+        buf = np.concatenate((self._history, samples.astype(np.float32, copy=False)))
+        buf_origin = self._in_pos - (taps - 1)
+        last_input = self._in_pos + samples.size - 1
+        out_end = -(-((last_input + 1) * up) // down)
+
+        windows = sliding_window_view(buf, taps)
+        positions = np.arange(self._out_pos, out_end, dtype=np.int64) * down
+        starts = positions // up - buf_origin - (taps - 1)
+        if up == 1:
+            out = windows[starts] @ kernel.bank[0]
+        else:
+            phases = positions % up
+            out = np.einsum("nk,nk->n", windows[starts], kernel.bank[phases])
+
+        self._history = buf[buf.size - (taps - 1) :].copy()
+        self._in_pos += samples.size
+        self._out_pos = out_end
+        return out.astype(np.float32, copy=False)
+
+
+def resample(samples: np.ndarray, src_sr: int, dst_sr: int) -> np.ndarray:
+    """One-shot resample of a complete signal, compensating the filter delay."""
+    if src_sr == dst_sr or samples.size == 0:
+        return np.asarray(samples, dtype=np.float32)
+    stream = StreamingResampler(src_sr, dst_sr)
+    kernel = stream.kernel
+    expected = -(-samples.size * kernel.up // kernel.down)
+    tail = np.zeros(kernel.taps * kernel.down // kernel.up + kernel.taps, dtype=np.float32)
+    out = np.concatenate((stream.process(samples), stream.process(tail)))
+    return out[kernel.delay : kernel.delay + expected]
+
+
+class ResamplerRegistry:
+    """Hands out per-session streaming resamplers backed by shared kernels."""
+
+    def __init__(self) -> None:
+        self._streams: Dict[Tuple[str, int, int], StreamingResampler] = {}
+
+    def get(self, session_id: str, src_sr: int, dst_sr: int) -> StreamingResampler:
+        key = (session_id, src_sr, dst_sr)
+        stream = self._streams.get(key)
+        if stream is None:
+            stream = StreamingResampler(src_sr, dst_sr)
+            self._streams[key] = stream
+        return stream
+
+    def release(self, session_id: str) -> None:
+        for key in [key for key in self._streams if key[0] == session_id]:
+            del self._streams[key]
@@ -7,10 +7,10 @@ from dataclasses import dataclass
 from typing import List, Tuple
 
 import numpy as np
-import torch
-import webrtcvad
 
 from ..core import AudioSegment
+from .resampler import resample
+from .vad import VAD_SAMPLE_RATES, BatchedVAD, float_to_pcm16, speech_regions
 
 logger = logging.getLogger("webrtc.audio.segmenter")
 
@@ -29,20 +29,7 @@ class WebRTCVADSegmenter:
 
     def __init__(self, config: SegmenterConfig | None = None) -> None:
         self.config = config or SegmenterConfig()
-        self.vad = webrtcvad.Vad(self.config.mode)
-        self._resampler = None
-        self._load_resampler()
-
-    def _load_resampler(self) -> None:
-        try:
-            from torchaudio.functional import resample
-        except ImportError:  # pragma: no cover - runtime dependency
-            logger.warning(
-                "torchaudio is required for resampling; speech detection may be limited"
-            )
-            self._resampler = None
-        else:
-            self._resampler = resample
+        self._vad = BatchedVAD(self.config.mode, frame_ms=self.config.frame_duration_ms)
 
     async def segment(self, segment: AudioSegment) -> List[Tuple[int, int]]:
         raw = np.frombuffer(segment.payload, dtype=np.int16)
@@ -52,62 +39,23 @@ class WebRTCVADSegmenter:
         sr = segment.sample_rate
         target_sr = self.config.target_sample_rate
 
-        waveform = torch.from_numpy(raw.astype(np.float32)).unsqueeze(0)
-        if sr != target_sr:
-            if self._resampler is None:
-                logger.debug(
-                    "Skipping VAD for session=%s due to missing resampler",
-                    segment.session_id,
-                )
-                return []
-            waveform = self._resampler(waveform, sr, target_sr)
+        if sr not in VAD_SAMPLE_RATES:
+            waveform = resample(raw.astype(np.float32) / 32768.0, sr, target_sr)
+            pcm16 = float_to_pcm16(waveform)
             sr = target_sr
+        else:
+            pcm16 = raw
 
-        waveform = waveform.squeeze(0).clamp(-32768, 32767)
-        pcm16 = waveform.numpy().astype(np.int16)
-
-        frame_samples = int(sr * self.config.frame_duration_ms / 1000)
+        frame_samples = self._vad.frame_samples(sr)
         if frame_samples == 0:
             return []
 
-        bytes_pcm = pcm16.tobytes()
-        total_frames = len(bytes_pcm) // (frame_samples * 2)
-        speech_frames: list[Tuple[int, int]] = []
-
-        current_start: int | None = None
-        silence_count = 0
-
-        for idx in range(total_frames):
-            start = idx * frame_samples * 2
-            end = start + frame_samples * 2
-            frame_bytes = bytes_pcm[start:end]
-            if len(frame_bytes) < frame_samples * 2:
-                break
-            is_speech = self.vad.is_speech(frame_bytes, sr)
-            if is_speech:
-                if current_start is None:
-                    current_start = idx
-                silence_count = 0
-            elif current_start is not None:
-                silence_count += 1
-                if (
-                    silence_count * self.config.frame_duration_ms
-                    >= self.config.min_silence_ms
-                ):
-                    end_frame = idx - silence_count + 1
-                    duration_ms = (
-                        (end_frame - current_start) * self.config.frame_duration_ms
-                    )
-                    if duration_ms >= self.config.min_speech_ms:
-                        speech_frames.append((current_start, end_frame))
-                    current_start = None
-                    silence_count = 0
-
-        if current_start is not None:
-            end_frame = total_frames
-            duration_ms = (end_frame - current_start) * self.config.frame_duration_ms
-            if duration_ms >= self.config.min_speech_ms:
-                speech_frames.append((current_start, end_frame))
+        mask = self._vad.speech_mask(pcm16, sr)
+        speech_frames = speech_regions(
+            mask,
+            min_speech_frames=-(-self.config.min_speech_ms // self.config.frame_duration_ms),
+            min_silence_frames=-(-self.config.min_silence_ms // self.config.frame_duration_ms),
+        )
 
         if not speech_frames:
             logger.debug(
@@ -0,0 +1,415 @@
+"""In-memory speaker voice profiles backed by a contiguous embedding matrix."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..services.ann_index import EmbeddingIndex
+
+logger = logging.getLogger("webrtc.audio.speakers")
+
+
+def normalize(vector: np.ndarray) -> np.ndarray:
+    """L2-normalise ``vector`` as float32; zero and empty vectors pass through."""
+    vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+    if vector.size == 0:
+        return vector
+    norm = float(np.linalg.norm(vector))
+    if norm == 0.0:
+        return np.zeros_like(vector)
+    return vector / norm
+
+
+class SpeakerProfileStore:
+    """Speaker centroids stored as rows of one float32 matrix.
+
+    Best-match lookups go through an :class:`EmbeddingIndex` mirror of the
+    usable rows, which is an exact scan for small registries and switches
+    to approximate search as the registry grows; ids map to rows through a
+    dict. The embedding dimension is fixed by the first usable vector.
+    Profiles registered without one (e.g. when pyannote is unavailable) keep a zero row and are
+    never returned by :meth:`match`.
+    """
+
+    def __init__(self, initial_capacity: int = 64) -> None:
+        self._capacity = max(initial_capacity, 1)
+        self._dim = 0
+        self._matrix = np.zeros((self._capacity, 0), dtype=np.float32)
+        self._counts = np.zeros(self._capacity, dtype=np.int64)
+        self._valid = np.zeros(self._capacity, dtype=bool)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._index: Optional[EmbeddingIndex] = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, speaker_id: object) -> bool:
+        return speaker_id in self._rows
+
+    @property
+    def dim(self) -> int:
+        return self._dim
+
+    @property
+    def ids(self) -> List[str]:
+        return list(self._ids)
+
+    def get(self, speaker_id: Optional[str]) -> Optional[np.ndarray]:
+        """Copy of the profile's centroid, or ``None`` for unknown ids."""
+        row = self._rows.get(speaker_id) if speaker_id is not None else None
+        if row is None:
+            return None
+        if self._dim == 0:
+            return np.zeros(1, dtype=np.float32)
+        return self._matrix[row].copy()
+
+    def count(self, speaker_id: str) -> int:
+        row = self._rows.get(speaker_id)
+        return int(self._counts[row]) if row is not None else 0
+
+    def add(self, speaker_id: str, vector: np.ndarray) -> int:
+        """Register a new profile and return its row."""
+        if speaker_id in self._rows:
+            raise ValueError(f"Speaker profile {speaker_id} already exists")
+        vector = normalize(vector)
+        row = len(self._ids)
+        if row == self._capacity:
+            self._grow(self._capacity * 2)
+        self._ids.append(speaker_id)
+        self._rows[speaker_id] = row
+        self._counts[row] = 1
+        self._valid[row] = self._accepts(vector)
+        self._matrix[row] = vector if self._valid[row] else 0.0
+        if self._valid[row]:
+            self._index.add(speaker_id, self._matrix[row])
+        return row
+
+    def update(self, speaker_id: str, vector: np.ndarray) -> None:
+        """Fold ``vector`` into the profile's running-mean centroid."""
+        row = self._rows[speaker_id]
+        vector = normalize(vector)
+        if not self._accepts(vector):
+            return
+        if not self._valid[row]:
+            self._matrix[row] = vector
+            self._valid[row] = True
+        else:
+            weight = 1.0 / (self._counts[row] + 1)
+            self._matrix[row] = normalize(
+                self._matrix[row] * (1.0 - weight) + vector * weight
+            )
+        self._index.add(speaker_id, self._matrix[row])
+        self._counts[row] += 1
+
+    def scores(self, vector: np.ndarray) -> np.ndarray:
+        """Cosine similarity of a normalised probe against every profile.
+
+        Profiles without a usable embedding score ``-inf``.
+        """
+        n = len(self._ids)
+        if n == 0 or vector.size != self._dim:
+            return np.full(n, -np.inf, dtype=np.float32)
+        scores = self._matrix[:n] @ vector
+        scores[~self._valid[:n]] = -np.inf
+        return scores
+
+    def match(self, vector: np.ndarray) -> Optional[Tuple[str, float]]:
+        """Best-scoring profile for a normalised probe, or ``None`` if empty."""
+        if self._index is None or vector.size != self._dim:
+            return None
+        found = self._index.search(vector, k=1)
+        return found[0] if found else None
+
+    def to_arrays(self) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """Copies of ``(ids, matrix, counts, valid)`` trimmed to the live rows."""
+        n = len(self._ids)
+        return (
+            list(self._ids),
+            np.array(self._matrix[:n]),
+            self._counts[:n].copy(),
+            self._valid[:n].copy(),
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        ids: List[str],
+        matrix: np.ndarray,
+        counts: np.ndarray,
+        valid: np.ndarray,
+    ) -> "SpeakerProfileStore":
+        """Rebuild a store around ``matrix``, which may be a memory map.
+
+        Raises:
+            ValueError: If the array lengths disagree with ``ids`` (e.g. a
+                matrix and metadata from different snapshots).
+        """
+        n = len(ids)
+        if matrix.ndim != 2 or matrix.shape[0] != n or len(counts) != n or len(valid) != n:
+            raise ValueError(
+                f"Speaker snapshot mismatch: {len(ids)} ids, matrix {matrix.shape}, "
+                f"{len(counts)} counts, {len(valid)} valid flags"
+            )
+        store = cls(initial_capacity=max(len(ids), 1))
+        if not ids:
+            return store
+        store._ids = list(ids)
+        store._rows = {speaker_id: row for row, speaker_id in enumerate(ids)}
+        store._counts = np.asarray(counts, dtype=np.int64).copy()
+        store._valid = np.asarray(valid, dtype=bool).copy()
+        if matrix.shape[1] > 0 and store._valid.any():
+            store._dim = matrix.shape[1]
+            store._matrix = matrix
+            store._index = EmbeddingIndex(store._dim, metric="cosine", initial_capacity=len(ids))
+            for row in np.flatnonzero(store._valid):
+                store._index.add(ids[row], matrix[row])
+        else:
+            store._valid[:] = False
+        return store
+
+    def _accepts(self, vector: np.ndarray) -> bool:
+        if vector.size < 2 or not np.any(vector):
+            return False
+        if self._dim == 0:
+            self._dim = vector.size
+            self._matrix = np.zeros((self._capacity, self._dim), dtype=np.float32)
+            self._index = EmbeddingIndex(self._dim, metric="cosine")
+            return True
+        if vector.size != self._dim:
+            logger.warning(
+                "Ignoring %d-d speaker embedding; profiles are %d-d",
+                vector.size,
+                self._dim,
+            )
+            return False
+        return True
+
+    def _grow(self, capacity: int) -> None:
+        matrix = np.zeros((capacity, self._dim), dtype=np.float32)
+        matrix[: self._capacity] = self._matrix
+        counts = np.zeros(capacity, dtype=np.int64)
+        counts[: self._capacity] = self._counts
+        valid = np.zeros(capacity, dtype=bool)
+        valid[: self._capacity] = self._valid
+        self._matrix, self._counts, self._valid = matrix, counts, valid
+        self._capacity = capacity
+
+
+@dataclass
+class SpeakerRegistryState:
+    """Everything the pipeline needs to resume speaker attribution."""
+
+    store: SpeakerProfileStore = field(default_factory=SpeakerProfileStore)
+    names: Dict[str, str] = field(default_factory=dict)
+    convex_ids: Dict[str, str] = field(default_factory=dict)
+    next_index: int = 10
+
+
+class SpeakerProfileArchive:
+    """On-disk snapshot plus append-only journal of the speaker registry.
+
+    A snapshot is ``profiles.<generation>.npy`` (the centroid matrix,
+    memory-mapped on load) and ``profiles.json`` (ids, counts, names, Convex
+    ids, row count and the matrix file name). The matrix is written first
+    under a new name, so replacing ``profiles.json`` commits both at once.
+    Between snapshots, new profiles, names and Convex ids are appended to
+    ``journal.jsonl``, with new profile vectors as raw float32 rows in
+    ``journal.f32``; centroid refinements only mark the archive dirty and
+    reach disk with the next snapshot. Replaying is idempotent, so a crash
+    mid-snapshot only costs centroid drift since the previous snapshot.
+
+    The archive stays dirty, and the rotated journal stays on disk, until a
+    snapshot succeeds. A failed snapshot is therefore retried, and its
+    rotated journal is never overwritten by the next rotation.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self._journal_rows = 0
+        self._generation = 0
+        self._changes = 0
+        self._saved_changes = 0
+
+    def load(self) -> SpeakerRegistryState:
+        state = SpeakerRegistryState()
+        meta_path = self.directory / "profiles.json"
+        try:
+            if meta_path.exists():
+                meta = json.loads(meta_path.read_text())
+                self._generation = int(meta.get("generation", 0))
+                try:
+                    state.store = self._load_matrix(meta)
+                except ValueError as exc:
+                    logger.warning("Ignoring inconsistent speaker snapshot: %s", exc)
+                else:
+                    state.names = dict(meta.get("names", {}))
+                    state.convex_ids = dict(meta.get("convex_ids", {}))
+                    state.next_index = int(meta.get("next_index", state.next_index))
+            for suffix in (".old", ""):
+                self._replay(state, suffix)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to load speaker profiles from %s: %s", self.directory, exc)
+            return SpeakerRegistryState()
+        self._journal_rows = self._row_count("", state.store.dim)
+        logger.info(
+            "Loaded %d speaker profiles from %s", len(state.store), self.directory
+        )
+        return state
+
+    @property
+    def dirty(self) -> bool:
+        """Whether there are changes no successful snapshot has covered yet."""
+        return self._changes != self._saved_changes
+
+    def mark_dirty(self) -> None:
+        """Note an in-memory change (e.g. a refined centroid) for the next snapshot."""
+        self._changes += 1
+
+    def append_profile(self, speaker_id: str, vector: Optional[np.ndarray], next_index: int) -> None:
+        op: Dict[str, object] = {"op": "add", "id": speaker_id, "next_index": next_index}
+        if vector is not None and vector.size > 1 and np.any(vector):
+            op["row"] = self._journal_rows
+            op["dim"] = int(vector.size)
+            self._append_bytes(np.ascontiguousarray(vector, dtype=np.float32).tobytes())
+            self._journal_rows += 1
+        self._append_op(op)
+
+    def append_name(self, speaker_id: str, name: str) -> None:
+        self._append_op({"op": "name", "id": speaker_id, "name": name})
+
+    def append_convex_id(self, speaker_id: str, convex_id: str) -> None:
+        self._append_op({"op": "convex", "id": speaker_id, "convex_id": convex_id})
+
+    def rotate_journal(self) -> int:
+        """Set the live journal aside so a snapshot can be written concurrently.
+
+        If the previous snapshot failed, its rotated journal is still the
+        only copy of those updates, so the live journal is left in place
+        instead; the next snapshot supersedes both.
+
+        Returns:
+            The change count the snapshot covers, for :meth:`write_snapshot`.
+        """
+        journals = [self.directory / name for name in ("journal.jsonl", "journal.f32")]
+        if not any(path.with_name(path.name + ".old").exists() for path in journals):
+            for path in journals:
+                if path.exists():
+                    os.replace(path, path.with_name(path.name + ".old"))
+            self._journal_rows = 0
+        return self._changes
+
+    def write_snapshot(
+        self,
+        arrays: Tuple[List[str], np.ndarray, np.ndarray, np.ndarray],
+        names: Dict[str, str],
+        convex_ids: Dict[str, str],
+        next_index: int,
+        changes: Optional[int] = None,
+    ) -> None:
+        """Persist a snapshot and drop the rotated journal it supersedes.
+
+        Args:
+            changes: Value returned by :meth:`rotate_journal`; changes up to
+                it are marked saved once the snapshot is on disk.
+        """
+        ids, matrix, counts, valid = arrays
+        self.directory.mkdir(parents=True, exist_ok=True)
+        previous = self._matrix_name(self._generation)
+        generation = self._generation + 1
+        matrix_name = self._matrix_name(generation)
+        tmp = self.directory / f"{matrix_name}.tmp"
+        with open(tmp, "wb") as handle:
+            np.save(handle, matrix)
+        os.replace(tmp, self.directory / matrix_name)
+        meta = {
+            "generation": generation,
+            "matrix": matrix_name,
+            "rows": len(ids),
+            "ids": ids,
+            "counts": counts.tolist(),
+            "valid": valid.tolist(),
+            "names": names,
+            "convex_ids": convex_ids,
+            "next_index": next_index,
+        }
+        tmp = self.directory / "profiles.json.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self.directory / "profiles.json")
+        self._generation = generation
+        for name in ("journal.jsonl.old", "journal.f32.old", previous, "profiles.npy"):
+            if name != matrix_name:
+                (self.directory / name).unlink(missing_ok=True)
+        if changes is not None:
+            self._saved_changes = max(self._saved_changes, changes)
+
+    @staticmethod
+    def _matrix_name(generation: int) -> str:
+        return f"profiles.{generation}.npy"
+
+    def _load_matrix(self, meta: Dict[str, object]) -> SpeakerProfileStore:
+        # Snapshots from before versioned names used a fixed "profiles.npy".
+        matrix = np.load(self.directory / str(meta.get("matrix", "profiles.npy")), mmap_mode="c")
+        ids = list(meta["ids"])
+        rows = int(meta.get("rows", len(ids)))
+        if rows != len(ids):
+            raise ValueError(f"metadata lists {len(ids)} ids but records {rows} rows")
+        return SpeakerProfileStore.from_arrays(
+            ids, matrix, np.asarray(meta["counts"]), np.asarray(meta["valid"])
+        )
+
+    def _append_op(self, op: Dict[str, object]) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.directory / "journal.jsonl", "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(op) + "\n")
+            self._changes += 1
+        except OSError as exc:
+            logger.warning("Failed to journal speaker profile update: %s", exc)
+
+    def _append_bytes(self, payload: bytes) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.directory / "journal.f32", "ab") as handle:
+                handle.write(payload)
+        except OSError as exc:
+            logger.warning("Failed to journal speaker embedding: %s", exc)
+
+    def _row_count(self, suffix: str, dim: int) -> int:
+        path = self.directory / f"journal.f32{suffix}"
+        if dim == 0 or not path.exists():
+            return 0
+        return path.stat().st_size // (dim * 4)
+
+    def _replay(self, state: SpeakerRegistryState, suffix: str) -> None:
+        path = self.directory / f"journal.jsonl{suffix}"
+        if not path.exists():
+            return
+        vectors_path = self.directory / f"journal.f32{suffix}"
+        raw = np.fromfile(vectors_path, dtype=np.float32) if vectors_path.exists() else None
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                op = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn final line after a crash
+            speaker_id = op.get("id")
+            if op.get("op") == "add":
+                state.next_index = max(state.next_index, int(op.get("next_index", 0)))
+                if speaker_id in state.store:
+                    continue
+                vector = np.zeros(1, dtype=np.float32)
+                row, dim = op.get("row"), op.get("dim", 0)
+                if raw is not None and row is not None and (row + 1) * dim <= raw.size:
+                    vector = raw[row * dim : (row + 1) * dim]
+                state.store.add(speaker_id, vector)
+            elif op.get("op") == "name":
+                state.names[speaker_id] = op["name"]
+            elif op.get("op") == "convex":
+                state.convex_ids[speaker_id] = op["convex_id"]
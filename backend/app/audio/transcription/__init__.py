@@ -1,9 +1,11 @@
 """Transcription backend implementations."""
 
 from .base import INDIAN_ENGLISH_PROMPT, TranscriptSegment, Transcriber
+from .batching import WhisperBatchServer
 from .elevenlabs import ElevenLabsTranscriber
 from .groq import GroqTranscriber
 from .local import LocalWhisperTranscriber
+from .router import TranscriberRouter, build_default_router
 from .sarvam import SarvamTranscriber
 
 __all__ = [
@@ -14,4 +16,7 @@ __all__ = [
     "GroqTranscriber",
     "LocalWhisperTranscriber",
     "SarvamTranscriber",
+    "TranscriberRouter",
+    "WhisperBatchServer",
+    "build_default_router",
 ]
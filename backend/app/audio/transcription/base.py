@@ -18,7 +18,11 @@ class TranscriptSegment:
 
 
 class Transcriber(ABC):
-    """Abstract base class for transcription backends."""
+    """Abstract base class for transcription backends.
+
+    Cloud backends create their SDK client once, in ``__init__``, so its
+    HTTP connection pool stays warm across requests.
+    """
 
     @abstractmethod
     async def transcribe(self, audio: np.ndarray, sample_rate: int) -> List[TranscriptSegment]:
@@ -39,6 +43,10 @@ class Transcriber(ABC):
         """Check if this transcriber is available."""
         pass
 
+    async def warm_up(self) -> None:
+        """Load models or open connections ahead of the first request."""
+        return None
+
 
 INDIAN_ENGLISH_PROMPT = """My name is Mayank. I'm Mayank. Hi, I'm Mayank Joshi. 
 Mayank speaking here. This is Mayank. Hello, my name is Mayank.
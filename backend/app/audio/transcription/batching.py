@@ -0,0 +1,206 @@
+"""Cross-session request batching for local faster-whisper inference."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ...core.executors import run_in_pool
+from .base import INDIAN_ENGLISH_PROMPT, TranscriptSegment
+
+logger = logging.getLogger("webrtc.audio.transcription.batching")
+
+try:  # pragma: no cover - optional dependency (faster-whisper >= 1.1)
+    from faster_whisper import BatchedInferencePipeline
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+except ImportError:  # pragma: no cover
+    BatchedInferencePipeline = None
+
+WHISPER_SAMPLE_RATE = 16000
+MAX_CLIP_SECONDS = 30.0
+MIN_SILENCE_MS = 500
+
+
+@dataclass
+class _PendingRequest:
+    audio: np.ndarray
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class WhisperBatchServer:
+    """Collects utterances from every session and decodes them together.
+
+    The first queued request opens a short collection window
+    (``batch_window_ms``); everything that arrives before it closes, up to
+    ``max_batch_size`` requests, is decoded in a single batched call. Clips
+    longer than Whisper's 30 s window are decoded on their own.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        beam_size: int = 5,
+        batch_window_ms: float = 20.0,
+        max_batch_size: int = 8,
+    ) -> None:
+        self._model = model
+        self._batched = BatchedInferencePipeline(model=model) if BatchedInferencePipeline else None
+        self.beam_size = beam_size
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch_size = max(max_batch_size, 1)
+        self._queue: asyncio.Queue[_PendingRequest] = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._in_flight = 0
+        self._batches = 0
+        self._requests = 0
+        self._last_batch_size = 0
+        self._last_wait_ms = 0.0
+
+    def metrics(self) -> Dict[str, float]:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "in_flight": self._in_flight,
+            "batches": self._batches,
+            "last_batch_size": self._last_batch_size,
+            "avg_batch_size": self._requests / self._batches if self._batches else 0.0,
+            "last_queue_wait_ms": self._last_wait_ms,
+        }
+
+    async def transcribe(self, audio: np.ndarray) -> List[TranscriptSegment]:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingRequest(audio, future, time.perf_counter()))
+        return await future
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self._batches += 1
+            self._requests += len(batch)
+            self._last_batch_size = len(batch)
+            self._last_wait_ms = (time.perf_counter() - batch[0].enqueued_at) * 1000
+            self._in_flight = len(batch)
+            try:
+                results = await run_in_pool(
+                    "inference", self._transcribe_batch, [req.audio for req in batch]
+                )
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Batched Whisper transcription failed: %s", exc)
+                results = [[] for _ in batch]
+            finally:
+                self._in_flight = 0
+
+            for req, result in zip(batch, results):
+                if not req.future.done():
+                    req.future.set_result(result)
+
+    def _transcribe_batch(self, audios: List[np.ndarray]) -> List[List[TranscriptSegment]]:
+        results: List[List[TranscriptSegment]] = [[] for _ in audios]
+        short = [
+            i for i, audio in enumerate(audios)
+            if 0 < audio.size <= MAX_CLIP_SECONDS * WHISPER_SAMPLE_RATE
+        ]
+        if self._batched is not None and len(short) > 1:
+            for i, segments in zip(short, self._decode_clips([audios[i] for i in short])):
+                results[i] = segments
+            batched = set(short)
+            remaining = [i for i in range(len(audios)) if i not in batched]
+        else:
+            remaining = list(range(len(audios)))
+
+        for i in remaining:
+            if audios[i].size:
+                results[i] = self._decode_single(audios[i])
+        return results
+
+    def _decode_single(self, audio: np.ndarray) -> List[TranscriptSegment]:
+        segments, _ = self._model.transcribe(
+            audio,
+            language="en",
+            task="transcribe",
+            beam_size=self.beam_size,
+            best_of=self.beam_size,
+            vad_filter=True,
+            vad_parameters=dict(min_silence_duration_ms=MIN_SILENCE_MS),
+            condition_on_previous_text=False,
+            initial_prompt=INDIAN_ENGLISH_PROMPT,
+        )
+        return [
+            TranscriptSegment(start=seg.start, end=seg.end, text=seg.text.strip())
+            for seg in segments
+            if seg.text and seg.text.strip()
+        ]
+
+    def _decode_clips(self, audios: List[np.ndarray]) -> List[List[TranscriptSegment]]:
+        """Decode several clips in one batched pass over their concatenation.
+
+        VAD runs on each clip separately, with the same settings as
+        :meth:`_decode_single`, so speech chunks never straddle two clips.
+        """
+        offsets = np.cumsum([0] + [audio.size for audio in audios])
+        joined = np.concatenate(audios).astype(np.float32, copy=False)
+        vad_options = VadOptions(min_silence_duration_ms=MIN_SILENCE_MS)
+        # clip_timestamps are in seconds; VAD chunks are in samples.
+        clips = [
+            {
+                "start": (int(offsets[i]) + chunk["start"]) / WHISPER_SAMPLE_RATE,
+                "end": (int(offsets[i]) + chunk["end"]) / WHISPER_SAMPLE_RATE,
+            }
+            for i, audio in enumerate(audios)
+            for chunk in get_speech_timestamps(
+                audio.astype(np.float32, copy=False),
+                vad_options=vad_options,
+                sampling_rate=WHISPER_SAMPLE_RATE,
+            )
+        ]
+        if not clips:
+            return [[] for _ in audios]
+        segments, _ = self._batched.transcribe(
+            joined,
+            language="en",
+            task="transcribe",
+            beam_size=self.beam_size,
+            vad_filter=False,
+            clip_timestamps=clips,
+            batch_size=min(len(clips), self.max_batch_size),
+            condition_on_previous_text=False,
+            initial_prompt=INDIAN_ENGLISH_PROMPT,
+        )
+
+        starts_s = offsets / WHISPER_SAMPLE_RATE
+        results: List[List[TranscriptSegment]] = [[] for _ in audios]
+        for seg in segments:
+            text = seg.text.strip() if seg.text else ""
+            if not text:
+                continue
+            midpoint = (seg.start + seg.end) / 2
+            idx = int(np.clip(np.searchsorted(starts_s, midpoint, side="right") - 1, 0, len(audios) - 1))
+            base = starts_s[idx]
+            results[idx].append(
+                TranscriptSegment(start=seg.start - base, end=seg.end - base, text=text)
+            )
+        return results
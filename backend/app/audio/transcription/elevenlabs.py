@@ -2,16 +2,15 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
 import os
-import tempfile
-import wave
 from typing import TYPE_CHECKING, List
 
 import numpy as np
 
+from ...core.executors import run_in_pool
 from .base import TranscriptSegment, Transcriber
+from .encoding import as_upload_file, encode_audio
 
 if TYPE_CHECKING:
     from elevenlabs.client import ElevenLabs
@@ -29,9 +28,11 @@ except ImportError:
 class ElevenLabsTranscriber(Transcriber):
     """Transcribe audio using ElevenLabs Scribe v2."""
 
-    def __init__(self, model: str = "scribe_v2"):
+    def __init__(self, model: str = "scribe_v2", upload_format: str = "wav"):
         self._model = model
+        self._upload_format = upload_format
         self._api_key = os.environ.get("ELEVENLABS_API_KEY")
+        self._client = ElevenLabsClient(api_key=self._api_key) if self.is_available else None
 
     @property
     def is_available(self) -> bool:
@@ -48,26 +49,15 @@ class ElevenLabsTranscriber(Transcriber):
                 gain = min(target_rms / audio_rms, 10.0)
                 audio = np.clip(audio * gain, -1.0, 1.0)
 
-            audio_int16 = (audio * 32767).astype(np.int16)
-
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-                temp_path = f.name
-                with wave.open(f, 'wb') as wav:
-                    wav.setnchannels(1)
-                    wav.setsampwidth(2)
-                    wav.setframerate(sample_rate)
-                    wav.writeframes(audio_int16.tobytes())
+            payload, filename = encode_audio(audio, sample_rate, self._upload_format)
 
             def _call_scribe():
-                client = ElevenLabsClient(api_key=self._api_key)
-                with open(temp_path, "rb") as audio_file:
-                    return client.speech_to_text.convert(
-                        file=audio_file,
-                        model_id=self._model
-                    )
-
-            result = await asyncio.to_thread(_call_scribe)
-            os.unlink(temp_path)
+                return self._client.speech_to_text.convert(
+                    file=as_upload_file(payload, filename),
+                    model_id=self._model
+                )
+
+            result = await run_in_pool("io", _call_scribe)
 
             if result and hasattr(result, "text"):
                 logger.info("ElevenLabs transcription: %s", result.text)
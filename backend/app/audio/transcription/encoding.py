@@ -0,0 +1,91 @@
+"""In-memory audio encoding for upload to cloud transcription APIs."""
+
+from __future__ import annotations
+
+import io
+import logging
+import struct
+
+import numpy as np
+
+logger = logging.getLogger("webrtc.audio.transcription.encoding")
+
+try:  # pragma: no cover - optional dependency
+    import soundfile
+except ImportError:  # pragma: no cover
+    soundfile = None
+
+UPLOAD_FORMATS = ("wav", "flac", "opus")
+
+
+def to_pcm16(audio: np.ndarray) -> np.ndarray:
+    """Float32 samples in [-1, 1] to int16; int16 input is returned as-is."""
+    if audio.dtype == np.int16:
+        return audio
+    return (audio * 32767).astype(np.int16)
+
+
+def wav_header(num_samples: int, sample_rate: int, channels: int = 1) -> bytes:
+    """Canonical 44-byte RIFF header for 16-bit PCM."""
+    data_size = num_samples * channels * 2
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,  # PCM
+        channels,
+        sample_rate,
+        sample_rate * channels * 2,
+        channels * 2,
+        16,
+        b"data",
+        data_size,
+    )
+
+
+def encode_wav(audio: np.ndarray, sample_rate: int) -> bytes:
+    """Build a WAV file in memory straight from the sample buffer."""
+    pcm = np.ascontiguousarray(to_pcm16(audio))
+    return b"".join((wav_header(pcm.size, sample_rate), memoryview(pcm).cast("B")))
+
+
+def encode_audio(
+    audio: np.ndarray, sample_rate: int, fmt: str = "wav"
+) -> tuple[bytes, str]:
+    """Encode audio for upload, returning ``(payload, filename)``.
+
+    FLAC and Opus shrink uploads considerably but need ``soundfile``
+    (libsndfile >= 1.0.29 for Opus); without it, or if the codec is missing,
+    this falls back to WAV.
+    """
+    if fmt not in UPLOAD_FORMATS:
+        raise ValueError(f"Unsupported upload format: {fmt}")
+    if fmt != "wav" and soundfile is not None:
+        buffer = io.BytesIO()
+        try:
+            if fmt == "flac":
+                soundfile.write(buffer, to_pcm16(audio), sample_rate, format="FLAC")
+                return buffer.getvalue(), "audio.flac"
+            soundfile.write(
+                buffer,
+                audio.astype(np.float32, copy=False),
+                sample_rate,
+                format="OGG",
+                subtype="OPUS",
+            )
+            return buffer.getvalue(), "audio.ogg"
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("%s encoding failed; falling back to WAV: %s", fmt, exc)
+    elif fmt != "wav":
+        logger.debug("soundfile not installed; uploading %s as WAV", fmt)
+    return encode_wav(audio, sample_rate), "audio.wav"
+
+
+def as_upload_file(payload: bytes, filename: str) -> io.BytesIO:
+    """Wrap an encoded payload as a named file object for SDK uploads."""
+    handle = io.BytesIO(payload)
+    handle.name = filename
+    return handle
@@ -2,16 +2,15 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
 import os
-import tempfile
-import wave
 from typing import TYPE_CHECKING, List
 
 import numpy as np
 
+from ...core.executors import run_in_pool
 from .base import INDIAN_ENGLISH_PROMPT, TranscriptSegment, Transcriber
+from .encoding import encode_audio
 
 if TYPE_CHECKING:
     from groq import Groq
@@ -29,9 +28,11 @@ except ImportError:
 class GroqTranscriber(Transcriber):
     """Transcribe audio using Groq's cloud Whisper API."""
 
-    def __init__(self, model: str = "whisper-large-v3-turbo"):
+    def __init__(self, model: str = "whisper-large-v3-turbo", upload_format: str = "wav"):
         self._model = model
+        self._upload_format = upload_format
         self._api_key = os.environ.get("GROQ_API_KEY")
+        self._client = GroqClient(api_key=self._api_key) if self.is_available else None
 
     @property
     def is_available(self) -> bool:
@@ -42,34 +43,22 @@ class GroqTranscriber(Transcriber):
             return []
 
         try:
-            audio_int16 = (audio * 32767).astype(np.int16)
+            payload, filename = encode_audio(audio, sample_rate, self._upload_format)
 
             duration_sec = len(audio) / sample_rate
-            logger.debug("Sending %.2fs audio to Groq", duration_sec)
-
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-                temp_path = f.name
-                with wave.open(f, 'wb') as wav:
-                    wav.setnchannels(1)
-                    wav.setsampwidth(2)
-                    wav.setframerate(sample_rate)
-                    wav.writeframes(audio_int16.tobytes())
+            logger.debug("Sending %.2fs audio to Groq (%d bytes)", duration_sec, len(payload))
 
             def _call_groq():
-                client = GroqClient(api_key=self._api_key)
-                with open(temp_path, "rb") as audio_file:
-                    transcription = client.audio.transcriptions.create(
-                        file=(temp_path, audio_file.read()),
-                        model=self._model,
-                        temperature=0.0,
-                        prompt=INDIAN_ENGLISH_PROMPT,
-                        language="en",
-                        response_format="verbose_json",
-                    )
-                return transcription
-
-            result = await asyncio.to_thread(_call_groq)
-            os.unlink(temp_path)
+                return self._client.audio.transcriptions.create(
+                    file=(filename, payload),
+                    model=self._model,
+                    temperature=0.0,
+                    prompt=INDIAN_ENGLISH_PROMPT,
+                    language="en",
+                    response_format="verbose_json",
+                )
+
+            result = await run_in_pool("io", _call_groq)
 
             snippets: List[TranscriptSegment] = []
             if hasattr(result, "segments") and result.segments:
@@ -4,11 +4,21 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Dict, List
 
 import numpy as np
 
-from .base import INDIAN_ENGLISH_PROMPT, TranscriptSegment, Transcriber
+from ...core.config import (
+    WHISPER_BATCH_WINDOW_MS,
+    WHISPER_BEAM_SIZE,
+    WHISPER_COMPUTE_TYPE,
+    WHISPER_CPU_THREADS,
+    WHISPER_DEVICE,
+    WHISPER_MAX_BATCH,
+)
+from ...core.executors import run_in_pool
+from .base import TranscriptSegment, Transcriber
+from .batching import WhisperBatchServer
 
 if TYPE_CHECKING:
     from faster_whisper import WhisperModel
@@ -22,21 +32,75 @@ try:
 except ImportError:
     WhisperModelClass = None
 
+try:  # pragma: no cover - ships with faster-whisper
+    import ctranslate2
+except ImportError:  # pragma: no cover
+    ctranslate2 = None
 
-class LocalWhisperTranscriber(Transcriber):
-    """Transcribe audio using local faster-whisper model."""
 
-    def __init__(self, model: str = "large-v3", device: str = "cuda", compute_type: str = "int8_float16"):
+def resolve_device(device: str, compute_type: str) -> tuple[str, str]:
+    """Resolve ``"auto"`` device and compute type to concrete values.
+
+    CUDA keeps int8 weights with float16 activations; CPU uses plain int8,
+    which is the fastest CTranslate2 mode there.
+    """
+    if device == "auto":
+        has_cuda = False
+        if ctranslate2 is not None:
+            try:
+                has_cuda = ctranslate2.get_cuda_device_count() > 0
+            except Exception:  # noqa: BLE001
+                has_cuda = False
+        device = "cuda" if has_cuda else "cpu"
+    if compute_type == "auto":
+        compute_type = "int8_float16" if device == "cuda" else "int8"
+    return device, compute_type
+
+
+class LocalWhisperTranscriber(Transcriber):
+    """Transcribe audio using local faster-whisper model.
+
+    Requests from every session share one model and one
+    :class:`WhisperBatchServer`, which decodes whatever arrives within
+    ``batch_window_ms`` of each other as a single batch.
+    """
+
+    def __init__(
+        self,
+        model: str = "large-v3",
+        device: str = WHISPER_DEVICE,
+        compute_type: str = WHISPER_COMPUTE_TYPE,
+        cpu_threads: int = WHISPER_CPU_THREADS,
+        beam_size: int = WHISPER_BEAM_SIZE,
+        batch_window_ms: float = WHISPER_BATCH_WINDOW_MS,
+        max_batch_size: int = WHISPER_MAX_BATCH,
+    ):
         self._model_name = model
-        self._device = device
-        self._compute_type = compute_type
+        self._device, self._compute_type = resolve_device(device, compute_type)
+        self._cpu_threads = cpu_threads
+        self._beam_size = beam_size
+        self._batch_window_ms = batch_window_ms
+        self._max_batch_size = max_batch_size
         self._model: WhisperModel | None = None
+        self._server: WhisperBatchServer | None = None
         self._lock = asyncio.Lock()
 
     @property
     def is_available(self) -> bool:
         return _faster_whisper_available
 
+    def metrics(self) -> Dict[str, float]:
+        """Queue depth and batch-size counters of the shared batch server."""
+        if self._server is None:
+            return {}
+        return self._server.metrics()
+
+    async def warm_up(self) -> None:
+        if not _faster_whisper_available:
+            logger.info("faster-whisper not installed; skipping warm-up")
+            return
+        await self._load_model()
+
     async def _load_model(self) -> WhisperModel | None:
         async with self._lock:
             if self._model is not None:
@@ -52,13 +116,21 @@ class LocalWhisperTranscriber(Transcriber):
                         self._model_name,
                         device=self._device,
                         compute_type=self._compute_type,
+                        cpu_threads=self._cpu_threads,
                     )
-                self._model = await asyncio.to_thread(_load)
+                self._model = await run_in_pool("inference", _load)
+                self._server = WhisperBatchServer(
+                    self._model,
+                    beam_size=self._beam_size,
+                    batch_window_ms=self._batch_window_ms,
+                    max_batch_size=self._max_batch_size,
+                )
                 logger.info(
-                    "Loaded faster-whisper model '%s' (%s, %s)",
+                    "Loaded faster-whisper model '%s' (%s, %s, cpu_threads=%s)",
                     self._model_name,
                     self._device,
                     self._compute_type,
+                    self._cpu_threads or "auto",
                 )
                 return self._model
             except Exception as exc:
@@ -70,38 +142,11 @@ class LocalWhisperTranscriber(Transcriber):
             logger.warning("No transcription backend available")
             return []
 
-        model = await self._load_model()
-        if model is None:
+        if await self._load_model() is None or self._server is None:
             return []
 
         try:
-            def _transcribe():
-                segments, info = model.transcribe(
-                    audio,
-                    language="en",
-                    task="transcribe",
-                    beam_size=5,
-                    best_of=5,
-                    vad_filter=True,
-                    vad_parameters=dict(min_silence_duration_ms=500),
-                    condition_on_previous_text=False,
-                    initial_prompt=INDIAN_ENGLISH_PROMPT,
-                )
-                return list(segments), info
-
-            segments, info = await asyncio.to_thread(_transcribe)
+            return await self._server.transcribe(audio.astype(np.float32, copy=False))
         except Exception as exc:
             logger.warning("Local Whisper transcription failed: %s", exc)
             return []
-
-        snippets: List[TranscriptSegment] = []
-        for seg in segments:
-            text = seg.text.strip() if seg.text else ""
-            if text:
-                snippets.append(TranscriptSegment(
-                    start=seg.start,
-                    end=seg.end,
-                    text=text,
-                ))
-
-        return snippets
@@ -0,0 +1,231 @@
+"""Latency-aware routing across transcription backends."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .base import TranscriptSegment, Transcriber
+from .elevenlabs import ElevenLabsTranscriber
+from .groq import GroqTranscriber
+from .local import LocalWhisperTranscriber
+from .sarvam import SarvamTranscriber
+
+logger = logging.getLogger("webrtc.audio.transcription.router")
+
+
+OK = "ok"
+ERROR = "error"
+CANCELLED = "cancelled"
+
+
+class BackendStats:
+    """Rolling latency and outcome window for one backend.
+
+    A cancelled hedge loser has only a lower bound on its latency, so it
+    adds no latency sample but counts towards ``error_rate``. Otherwise a
+    degraded backend that always loses the hedge would keep its old fast
+    percentiles and stay ranked first.
+    """
+
+    def __init__(self, window: int) -> None:
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[str] = deque(maxlen=window)
+        self.in_flight = 0
+
+    def record(self, latency: float, outcome: str) -> None:
+        self.outcomes.append(outcome)
+        if outcome == OK:
+            self.latencies.append(latency)
+
+    @property
+    def samples(self) -> int:
+        return len(self.outcomes)
+
+    @property
+    def cancelled(self) -> int:
+        return self.outcomes.count(CANCELLED)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1.0 - self.outcomes.count(OK) / len(self.outcomes)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        return float(np.percentile(np.fromiter(self.latencies, dtype=np.float64), q))
+
+
+class TranscriberRouter(Transcriber):
+    """Routes each request to the backend with the lowest expected cost.
+
+    Backends are ordered by rolling p50 latency plus a penalty proportional to
+    their error rate; backends without enough history are assumed to cost
+    ``default_latency`` so the configured order wins until data arrives. If
+    the chosen backend has not answered within its own p95, a hedged request
+    is sent to the next backend and whichever returns text first wins. An
+    empty or failed result falls through to the next backend.
+
+    Cancelling a hedge loser cannot stop the pool thread running its SDK
+    call, so each backend may have at most ``max_in_flight`` calls
+    outstanding. Saturated backends are ranked last and never hedged into.
+    """
+
+    def __init__(
+        self,
+        transcribers: Sequence[Transcriber],
+        window: int = 50,
+        min_samples: int = 5,
+        default_latency: float = 2.0,
+        default_hedge_delay: float = 4.0,
+        error_penalty: float = 10.0,
+        hedge: bool = True,
+        max_in_flight: int = 4,
+    ) -> None:
+        self._transcribers = list(transcribers)
+        self._stats: Dict[int, BackendStats] = {
+            id(t): BackendStats(window) for t in self._transcribers
+        }
+        self.min_samples = min_samples
+        self.default_latency = default_latency
+        self.default_hedge_delay = default_hedge_delay
+        self.error_penalty = error_penalty
+        self.hedge = hedge
+        self.max_in_flight = max(max_in_flight, 1)
+
+    @property
+    def is_available(self) -> bool:
+        return any(t.is_available for t in self._transcribers)
+
+    @property
+    def transcribers(self) -> List[Transcriber]:
+        return list(self._transcribers)
+
+    def ranked(self) -> List[Transcriber]:
+        """Available backends, cheapest expected cost first, saturated ones last."""
+        available = [t for t in self._transcribers if t.is_available]
+        return sorted(available, key=lambda t: (self._saturated(t), self._expected_cost(t)))
+
+    def stats(self) -> Dict[str, Dict[str, float | int | None]]:
+        return {
+            getattr(t, "name", type(t).__name__): {
+                "p50": self._stats[id(t)].percentile(50),
+                "p95": self._stats[id(t)].percentile(95),
+                "error_rate": self._stats[id(t)].error_rate,
+                "samples": self._stats[id(t)].samples,
+                "cancelled": self._stats[id(t)].cancelled,
+                "in_flight": self._stats[id(t)].in_flight,
+            }
+            for t in self._transcribers
+        }
+
+    async def warm_up(self) -> None:
+        await asyncio.gather(*(t.warm_up() for t in self._transcribers if t.is_available))
+
+    async def transcribe(self, audio: np.ndarray, sample_rate: int) -> List[TranscriptSegment]:
+        remaining = self.ranked()
+        while remaining:
+            primary = remaining.pop(0)
+            primary_task = asyncio.create_task(self._timed(primary, audio, sample_rate))
+            can_hedge = self.hedge and remaining and not self._saturated(remaining[0])
+            delay = self._hedge_delay(primary) if can_hedge else None
+            done, _ = await asyncio.wait({primary_task}, timeout=delay)
+            if done:
+                result = primary_task.result()
+                if result:
+                    return result
+                continue
+
+            secondary = remaining.pop(0)
+            logger.info(
+                "%s slower than %.2fs; hedging with %s",
+                type(primary).__name__,
+                delay,
+                type(secondary).__name__,
+            )
+            pending = {
+                primary_task,
+                asyncio.create_task(self._timed(secondary, audio, sample_rate)),
+            }
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    result = task.result()
+                    if result:
+                        for loser in pending:
+                            loser.cancel()
+                        return result
+        return []
+
+    async def _timed(
+        self, transcriber: Transcriber, audio: np.ndarray, sample_rate: int
+    ) -> List[TranscriptSegment]:
+        stats = self._stats[id(transcriber)]
+        started = time.perf_counter()
+        # Shielded so in_flight tracks the underlying call, which keeps
+        # running in its pool after the hedge loser is cancelled.
+        call = asyncio.ensure_future(transcriber.transcribe(audio, sample_rate))
+        stats.in_flight += 1
+        call.add_done_callback(lambda task: self._call_finished(stats, task))
+        try:
+            result = await asyncio.shield(call)
+        except asyncio.CancelledError:
+            stats.record(time.perf_counter() - started, CANCELLED)
+            raise
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("%s transcription raised: %s", type(transcriber).__name__, exc)
+            result = []
+        latency = time.perf_counter() - started
+        stats.record(latency, OK if result else ERROR)
+        logger.info(
+            "%s returned %d segments in %.3fs",
+            type(transcriber).__name__,
+            len(result),
+            latency,
+        )
+        return result
+
+    @staticmethod
+    def _call_finished(stats: BackendStats, task: asyncio.Future) -> None:
+        stats.in_flight -= 1
+        if not task.cancelled():
+            task.exception()  # retrieved here when the awaiting hedge was cancelled
+
+    def _saturated(self, transcriber: Transcriber) -> bool:
+        return self._stats[id(transcriber)].in_flight >= self.max_in_flight
+
+    def _expected_cost(self, transcriber: Transcriber) -> float:
+        stats = self._stats[id(transcriber)]
+        p50 = stats.percentile(50)
+        if stats.samples < self.min_samples or p50 is None:
+            p50 = self.default_latency
+        return p50 + stats.error_rate * self.error_penalty
+
+    def _hedge_delay(self, transcriber: Transcriber) -> float:
+        stats = self._stats[id(transcriber)]
+        p95 = stats.percentile(95)
+        if stats.samples < self.min_samples or p95 is None:
+            return self.default_hedge_delay
+        return p95
+
+
+def build_default_router(whisper_model: str = "large-v3", **kwargs) -> TranscriberRouter:
+    """Router over the cloud backends in preference order, then local Whisper."""
+    return TranscriberRouter(
+        [
+            SarvamTranscriber(),
+            GroqTranscriber(),
+            ElevenLabsTranscriber(),
+            LocalWhisperTranscriber(model=whisper_model),
+        ],
+        **kwargs,
+    )
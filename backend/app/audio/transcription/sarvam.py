@@ -5,13 +5,14 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
-import tempfile
-import wave
 from typing import TYPE_CHECKING, List
 
 import numpy as np
 
+from ...core.executors import run_in_pool
+from ..vad import VAD_SAMPLE_RATES, BatchedVAD, float_to_pcm16
 from .base import TranscriptSegment, Transcriber
+from .encoding import as_upload_file, encode_audio
 
 if TYPE_CHECKING:
     from sarvamai import SarvamAI
@@ -31,10 +32,23 @@ class SarvamTranscriber(Transcriber):
 
     MAX_CHUNK_SEC = 25.0
     OVERLAP_SEC = 1.0
-
-    def __init__(self, model: str = "saarika:v2.5"):
+    SPLIT_SEARCH_SEC = 5.0
+    SILENCE_RMS = 0.01
+
+    def __init__(
+        self,
+        model: str = "saarika:v2.5",
+        upload_format: str = "wav",
+        max_concurrency: int = 4,
+    ):
         self._model = model
+        self._upload_format = upload_format
+        self._max_concurrency = max(max_concurrency, 1)
+        self._vad = BatchedVAD(aggressiveness=2, frame_ms=20)
         self._api_key = os.environ.get("SARVAM_API_KEY")
+        self._client = (
+            SarvamAIClient(api_subscription_key=self._api_key) if self.is_available else None
+        )
 
     @property
     def is_available(self) -> bool:
@@ -48,43 +62,43 @@ class SarvamTranscriber(Transcriber):
             duration_sec = len(audio) / sample_rate
 
             if duration_sec <= self.MAX_CHUNK_SEC:
-                chunks = [(audio, 0.0)]
+                chunks = [(audio, 0.0, False)]
             else:
                 chunks = self._split_into_chunks(audio, sample_rate)
                 logger.info("Splitting %.2fs audio into %d chunks for Sarvam", duration_sec, len(chunks))
 
-            all_segments: List[TranscriptSegment] = []
-
-            for chunk_audio, chunk_offset in chunks:
-                audio_int16 = (chunk_audio * 32767).astype(np.int16)
+            semaphore = asyncio.Semaphore(self._max_concurrency)
 
-                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-                    temp_path = f.name
-                    with wave.open(f, 'wb') as wav:
-                        wav.setnchannels(1)
-                        wav.setsampwidth(2)
-                        wav.setframerate(sample_rate)
-                        wav.writeframes(audio_int16.tobytes())
+            async def _transcribe_chunk(chunk_audio: np.ndarray) -> str:
+                payload, filename = encode_audio(chunk_audio, sample_rate, self._upload_format)
 
                 def _call_sarvam():
-                    client = SarvamAIClient(api_subscription_key=self._api_key)
-                    with open(temp_path, "rb") as audio_file:
-                        response = client.speech_to_text.transcribe(
-                            file=audio_file,
-                            language_code="en-IN",
-                            model=self._model
-                        )
-                    return response
-
-                result = await asyncio.to_thread(_call_sarvam)
-                os.unlink(temp_path)
-
+                    return self._client.speech_to_text.transcribe(
+                        file=as_upload_file(payload, filename),
+                        language_code="en-IN",
+                        model=self._model
+                    )
+
+                async with semaphore:
+                    result = await run_in_pool("io", _call_sarvam)
                 if result and hasattr(result, 'transcript') and result.transcript:
+                    return result.transcript.strip()
+                return ""
+
+            texts = await asyncio.gather(*(_transcribe_chunk(chunk) for chunk, _, _ in chunks))
+
+            all_segments: List[TranscriptSegment] = []
+            previous_text = ""
+            for (chunk_audio, chunk_offset, overlaps), text in zip(chunks, texts):
+                if overlaps and previous_text:
+                    text = _dedupe_overlap(previous_text, text)
+                previous_text = text or previous_text
+                if text:
                     chunk_duration = len(chunk_audio) / sample_rate
                     all_segments.append(TranscriptSegment(
                         start=chunk_offset,
                         end=chunk_offset + chunk_duration,
-                        text=result.transcript.strip(),
+                        text=text,
                     ))
 
             if all_segments:
@@ -98,18 +112,74 @@ class SarvamTranscriber(Transcriber):
             return []
 
     def _split_into_chunks(self, audio: np.ndarray, sample_rate: int) -> List[tuple]:
-        """Split audio into overlapping chunks for Sarvam's 30s limit."""
+        """Split audio into chunks under Sarvam's 30s limit.
+
+        Each cut is placed at the quietest non-speech frame within the last
+        ``SPLIT_SEARCH_SEC`` of the window, so no overlap is needed. When the
+        search region is continuous speech, falls back to a fixed cut with
+        ``OVERLAP_SEC`` of overlap, flagged so the text can be de-duplicated.
+
+        Returns:
+            List of ``(chunk_audio, start_seconds, overlaps_previous)``
+        """
         chunks = []
         chunk_samples = int(self.MAX_CHUNK_SEC * sample_rate)
         overlap_samples = int(self.OVERLAP_SEC * sample_rate)
-        step_samples = chunk_samples - overlap_samples
+        search_samples = int(self.SPLIT_SEARCH_SEC * sample_rate)
 
         offset = 0
+        overlaps = False
         while offset < len(audio):
-            chunk_end = min(offset + chunk_samples, len(audio))
-            chunk_audio = audio[offset:chunk_end]
-            chunk_start_time = offset / sample_rate
-            chunks.append((chunk_audio, chunk_start_time))
-            offset += step_samples
+            chunk_end = offset + chunk_samples
+            if chunk_end >= len(audio):
+                chunks.append((audio[offset:], offset / sample_rate, overlaps))
+                break
+
+            cut = self._find_silence(audio, chunk_end - search_samples, chunk_end, sample_rate)
+            if cut is None:
+                chunks.append((audio[offset:chunk_end], offset / sample_rate, overlaps))
+                offset = chunk_end - overlap_samples
+                overlaps = True
+            else:
+                chunks.append((audio[offset:cut], offset / sample_rate, overlaps))
+                offset = cut
+                overlaps = False
 
         return chunks
+
+    def _find_silence(
+        self, audio: np.ndarray, start: int, end: int, sample_rate: int
+    ) -> int | None:
+        """Sample index at the centre of the quietest non-speech frame in ``[start, end)``."""
+        region = audio[max(start, 0):end]
+        frame_samples = sample_rate * self._vad.frame_ms // 1000
+        total_frames = region.size // frame_samples
+        if total_frames == 0:
+            return None
+        frames = region[: total_frames * frame_samples].reshape(total_frames, frame_samples)
+        rms = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+
+        if self._vad.is_available and sample_rate in VAD_SAMPLE_RATES:
+            silent = ~self._vad.speech_mask(float_to_pcm16(region), sample_rate)
+        else:
+            silent = rms < self.SILENCE_RMS
+        if not silent.any():
+            return None
+        candidates = np.flatnonzero(silent)
+        best = candidates[np.argmin(rms[candidates])]
+        return max(start, 0) + int(best) * frame_samples + frame_samples // 2
+
+
+def _dedupe_overlap(previous: str, text: str, max_words: int = 12) -> str:
+    """Drop the leading words of ``text`` that repeat the tail of ``previous``."""
+    prev_words = [_normalize_word(w) for w in previous.split()[-max_words:]]
+    words = text.split()
+    normalized = [_normalize_word(w) for w in words[:max_words]]
+    for size in range(min(len(prev_words), len(normalized)), 0, -1):
+        if prev_words[-size:] == normalized[:size]:
+            return " ".join(words[size:])
+    return text
+
+
+def _normalize_word(word: str) -> str:
+    return "".join(ch for ch in word.lower() if ch.isalnum())
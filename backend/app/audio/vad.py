@@ -0,0 +1,150 @@
+"""Batched WebRTC voice activity detection over contiguous PCM buffers."""
+
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+
+logger = logging.getLogger("webrtc.audio.vad")
+
+try:  # pragma: no cover - optional dependency
+    import webrtcvad
+except ImportError:  # pragma: no cover
+    webrtcvad = None
+
+VAD_SAMPLE_RATES = (8000, 16000, 32000, 48000)
+VAD_FRAME_MS = (10, 20, 30)
+
+
+class BatchedVAD:
+    """Classifies every frame of a PCM buffer in a single pass.
+
+    Frame energies are computed for the whole buffer at once and frames below
+    the energy floor are marked as non-speech without touching WebRTC VAD.
+    The remaining frames are fed to ``webrtcvad`` as zero-copy slices of one
+    contiguous byte buffer.
+    """
+
+    def __init__(
+        self,
+        aggressiveness: int = 2,
+        frame_ms: int = 20,
+        energy_floor: float = 0.002,
+    ) -> None:
+        if frame_ms not in VAD_FRAME_MS:
+            raise ValueError(f"WebRTC VAD frames must be one of {VAD_FRAME_MS} ms")
+        self.frame_ms = frame_ms
+        self.energy_floor = energy_floor
+        self._vad = webrtcvad.Vad(aggressiveness) if webrtcvad else None
+        if self._vad is None:
+            logger.info("webrtcvad not installed; VAD falls back to the energy gate")
+
+    @property
+    def is_available(self) -> bool:
+        return self._vad is not None
+
+    def frame_samples(self, sample_rate: int) -> int:
+        return sample_rate * self.frame_ms // 1000
+
+    def speech_mask(
+        self,
+        pcm16: np.ndarray,
+        sample_rate: int,
+        noise_floor: float | None = None,
+        stop_on_first: bool = False,
+    ) -> np.ndarray:
+        """Return a boolean speech flag for each whole frame in ``pcm16``.
+
+        Args:
+            pcm16: Contiguous int16 samples
+            sample_rate: One of the WebRTC VAD rates
+            noise_floor: Optional RMS (in [-1, 1] units) frames must exceed
+            stop_on_first: Stop classifying after the first speech frame
+
+        Returns:
+            Array of shape ``(len(pcm16) // frame_samples,)``
+        """
+        if sample_rate not in VAD_SAMPLE_RATES:
+            raise ValueError(f"Unsupported VAD sample rate: {sample_rate}")
+        frame_samples = self.frame_samples(sample_rate)
+        total_frames = pcm16.size // frame_samples
+        mask = np.zeros(total_frames, dtype=bool)
+        if total_frames == 0:
+            return mask
+
+        frames = pcm16[: total_frames * frame_samples].reshape(total_frames, frame_samples)
+        energy = np.einsum("ij,ij->i", frames, frames, dtype=np.float64)
+        rms = np.sqrt(energy / frame_samples) / 32768.0
+        floor = self.energy_floor
+        if noise_floor is not None:
+            floor = max(floor, noise_floor)
+        candidates = np.flatnonzero(rms >= floor)
+
+        if self._vad is None:
+            mask[candidates] = True
+            return mask
+
+        pcm = np.ascontiguousarray(frames)
+        view = memoryview(pcm.tobytes())
+        stride = frame_samples * 2
+        is_speech = self._vad.is_speech
+        for idx in candidates.tolist():
+            start = idx * stride
+            try:
+                speech = is_speech(view[start : start + stride], sample_rate)
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("WebRTC VAD error: %s", exc)
+                speech = True
+            if speech:
+                mask[idx] = True
+                if stop_on_first:
+                    break
+        return mask
+
+    def has_speech(
+        self,
+        pcm16: np.ndarray,
+        sample_rate: int,
+        noise_floor: float | None = None,
+    ) -> bool:
+        return bool(
+            self.speech_mask(pcm16, sample_rate, noise_floor, stop_on_first=True).any()
+        )
+
+
+def float_to_pcm16(audio: np.ndarray) -> np.ndarray:
+    """Convert float32 samples in [-1, 1] to int16 PCM."""
+    return np.clip(audio * 32768.0, -32768, 32767).astype(np.int16)
+
+
+def speech_regions(
+    mask: np.ndarray,
+    min_speech_frames: int,
+    min_silence_frames: int,
+) -> list[tuple[int, int]]:
+    """Collapse a per-frame speech mask into ``(start_frame, end_frame)`` runs.
+
+    Runs separated by fewer than ``min_silence_frames`` silent frames are
+    merged; a trailing gap shorter than that extends the last region to the
+    end of the mask. Regions shorter than ``min_speech_frames`` are dropped.
+    """
+    if mask.size == 0 or not mask.any():
+        return []
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.diff(padded)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    gaps = starts[1:] - ends[:-1]
+    split = np.flatnonzero(gaps >= min_silence_frames)
+    region_starts = np.concatenate(([starts[0]], starts[split + 1]))
+    region_ends = np.concatenate((ends[split], [ends[-1]]))
+    if mask.size - region_ends[-1] < min_silence_frames:
+        region_ends[-1] = mask.size
+
+    keep = (region_ends - region_starts) >= min_speech_frames
+    return [
+        (int(start), int(end))
+        for start, end in zip(region_starts[keep], region_ends[keep])
+    ]
@@ -1,5 +1,6 @@
 """Core data models and utilities for the backend."""
 
+from .frames import PcmFrame
 from .models import (
     AudioChunk,
     AudioSegment,
@@ -14,6 +15,7 @@ __all__ = [
     "AudioSegment",
     "ConversationEvent",
     "ConversationUtterance",
+    "PcmFrame",
     "SpeakerEmbedding",
     "VectorSimilarityResult",
 ]
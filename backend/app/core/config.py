@@ -3,8 +3,14 @@
 import os
 from pathlib import Path
 
+from dotenv import load_dotenv
+
 ROOT_DIR = Path(__file__).resolve().parents[2]
 
+# Load .env before any setting below is read; app.main imports this module
+# (through the audio and video packages) before its own startup code runs.
+load_dotenv(ROOT_DIR / ".env")
+
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
 
 FACE_REPUBLISH_INTERVAL_SECONDS = 4.0
@@ -16,3 +22,43 @@ MIN_CONVERSATION_SECONDS = 2.0
 VAD_AGGRESSIVENESS = 2
 MIN_SPEECH_RMS = 0.05
 SPEAKER_MATCH_THRESHOLD = 0.25
+
+# Local faster-whisper. "auto" picks CUDA when ctranslate2 sees a GPU, else CPU
+# with int8 weights; WHISPER_CPU_THREADS=0 lets ctranslate2 choose.
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "auto")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "auto")
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))
+WHISPER_BEAM_SIZE = int(os.getenv("WHISPER_BEAM_SIZE", "5"))
+WHISPER_BATCH_WINDOW_MS = float(os.getenv("WHISPER_BATCH_WINDOW_MS", "20"))
+WHISPER_MAX_BATCH = int(os.getenv("WHISPER_MAX_BATCH", "8"))
+
+# Speaker registry snapshot location; empty disables persistence.
+SPEAKER_PROFILE_DIR = os.getenv("SPEAKER_PROFILE_DIR", str(ROOT_DIR / "data" / "speaker_profiles"))
+SPEAKER_SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("SPEAKER_SNAPSHOT_INTERVAL_SECONDS", "300"))
+
+# Executor pool sizes (see app.core.executors).
+_CPU_COUNT = os.cpu_count() or 4
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", str(min(4, _CPU_COUNT))))
+VIDEO_WORKERS = int(os.getenv("VIDEO_WORKERS", str(min(2, _CPU_COUNT))))
+DSP_WORKERS = int(os.getenv("DSP_WORKERS", "2"))
+IO_WORKERS = int(os.getenv("IO_WORKERS", "16"))
+# >0 runs pyannote and face_recognition in that many worker processes.
+MODEL_WORKER_PROCESSES = int(os.getenv("MODEL_WORKER_PROCESSES", "0"))
+
+# Live audio ingestion: WebRTC frames are grouped into blocks of this length,
+# and at most AUDIO_QUEUE_BLOCKS blocks wait per session before the oldest drops.
+AUDIO_BLOCK_MS = int(os.getenv("AUDIO_BLOCK_MS", "160"))
+AUDIO_QUEUE_BLOCKS = int(os.getenv("AUDIO_QUEUE_BLOCKS", "25"))
+# Audio kept ahead of speech (and of the open utterance when streaming).
+AUDIO_PRE_ROLL_SECONDS = float(os.getenv("AUDIO_PRE_ROLL_SECONDS", "1.0"))
+
+# Face backend for VideoPipeline: "dlib" (face_recognition) or "onnx" (ONNX Runtime, CPU).
+FACE_BACKEND = os.getenv("FACE_BACKEND", "dlib")
+FACE_ONNX_DETECTOR = os.getenv("FACE_ONNX_DETECTOR", str(ROOT_DIR / "models" / "face_detector.onnx"))
+FACE_ONNX_EMBEDDER = os.getenv("FACE_ONNX_EMBEDDER", str(ROOT_DIR / "models" / "face_embedder.onnx"))
+FACE_ONNX_THREADS = int(os.getenv("FACE_ONNX_THREADS", "0"))
+FACE_ONNX_INT8 = os.getenv("FACE_ONNX_INT8", "0").lower() in {"1", "true", "yes"}
+# Face match distance threshold; empty uses the backend's default (dlib 0.6, onnx 1.1).
+FACE_MATCH_THRESHOLD = (
+    float(os.environ["FACE_MATCH_THRESHOLD"]) if os.getenv("FACE_MATCH_THRESHOLD") else None
+)
@@ -0,0 +1,159 @@
+"""Named, sized executor pools for blocking work.
+
+Each class of blocking work gets its own pool so that, for example, a slow
+Convex round trip cannot occupy the threads face detection is waiting for:
+
+- ``inference``: pyannote embeddings and local Whisper decoding
+- ``video``: face detection and encoding
+- ``dsp``: per-chunk audio processing such as RNNoise
+- ``io``: blocking network SDK calls (Convex, Groq, cloud STT) and disk writes
+
+Sizes come from :mod:`app.core.config`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from .config import DSP_WORKERS, INFERENCE_WORKERS, IO_WORKERS, VIDEO_WORKERS
+
+logger = logging.getLogger("webrtc.executors")
+
+T = TypeVar("T")
+
+POOL_SIZES: Dict[str, int] = {
+    "inference": INFERENCE_WORKERS,
+    "video": VIDEO_WORKERS,
+    "dsp": DSP_WORKERS,
+    "io": IO_WORKERS,
+}
+
+
+class InstrumentedPool:
+    """Executor wrapper that tracks queue depth and throughput.
+
+    For process pools the callable cannot be wrapped (the wrapper would have
+    to be pickled), so ``queued`` counts every unfinished task there and
+    ``running`` stays at zero.
+    """
+
+    def __init__(self, name: str, executor: Executor, max_workers: int) -> None:
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = executor
+        self._in_process = isinstance(executor, ProcessPoolExecutor)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._peak_queued = 0
+
+    @property
+    def executor(self) -> Executor:
+        return self._executor
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> Future:
+        with self._lock:
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+        try:
+            if self._in_process:
+                future = self._executor.submit(fn, *args, **kwargs)
+                future.add_done_callback(self._finished)
+                return future
+            return self._executor.submit(self._tracked, fn, args, kwargs)
+        except Exception:
+            with self._lock:
+                self._queued -= 1
+            raise
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "peak_queued": self._peak_queued,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self._queued -= 1
+            self._completed += 1
+            if future.cancelled() or future.exception() is not None:
+                self._failed += 1
+
+    def _tracked(self, fn: Callable[..., T], args: tuple, kwargs: dict) -> T:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._failed += 0 if ok else 1
+
+
+_pools: Dict[str, InstrumentedPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name: str) -> InstrumentedPool:
+    """Get or lazily create the named pool."""
+    pool = _pools.get(name)
+    if pool is not None:
+        return pool
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            if name not in POOL_SIZES:
+                raise KeyError(f"Unknown executor pool: {name}")
+            workers = max(POOL_SIZES[name], 1)
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+            pool = InstrumentedPool(name, executor, workers)
+            _pools[name] = pool
+            logger.info("Started %s pool with %d workers", name, workers)
+    return pool
+
+
+def register_pool(name: str, executor: Executor, max_workers: int) -> InstrumentedPool:
+    """Track an externally created executor (e.g. a process pool) by name."""
+    pool = InstrumentedPool(name, executor, max_workers)
+    with _pools_lock:
+        _pools[name] = pool
+    return pool
+
+
+async def run_in_pool(name: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run ``fn(*args, **kwargs)`` on the named pool and await the result."""
+    future = get_pool(name).submit(fn, *args, **kwargs)
+    return await asyncio.wrap_future(future)
+
+
+def executor_metrics() -> Dict[str, Dict[str, int]]:
+    """Queue depth and throughput counters for every started pool."""
+    return {name: pool.metrics() for name, pool in list(_pools.items())}
+
+
+def shutdown_executors(wait: bool = False) -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=wait)
+
@@ -0,0 +1,95 @@
+"""Lightweight audio frame type for the internal real-time path.
+
+``AudioChunk``/``AudioSegment`` in :mod:`app.core.models` are pydantic models
+carrying ``bytes``; validating and copying one per block adds measurable
+overhead. Inside the pipeline audio moves as :class:`PcmFrame`, a slotted
+dataclass holding a NumPy view and a monotonic timestamp. The pydantic
+models remain for API boundaries and convert via :meth:`PcmFrame.from_chunk`.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .models import AudioChunk
+
+
+@dataclass(slots=True)
+class PcmFrame:
+    """Mono int16 PCM for one session.
+
+    ``samples`` may be a view into a larger buffer; consumers must not
+    mutate it. ``timestamp`` is ``time.monotonic()`` at capture.
+    """
+
+    session_id: str
+    samples: np.ndarray
+    sample_rate: int
+    timestamp: float
+
+    @classmethod
+    def now(cls, session_id: str, samples: np.ndarray, sample_rate: int) -> "PcmFrame":
+        return cls(session_id, samples, sample_rate, time.monotonic())
+
+    @classmethod
+    def from_chunk(cls, chunk: "AudioChunk") -> "PcmFrame":
+        """Zero-copy conversion from the pydantic API model."""
+        return cls(
+            chunk.session_id,
+            np.frombuffer(chunk.data, dtype=np.int16),
+            chunk.sample_rate,
+            time.monotonic(),
+        )
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.samples.size / self.sample_rate if self.sample_rate else 0.0
+
+    def with_samples(self, samples: np.ndarray) -> "PcmFrame":
+        """Same session and timing, different audio (e.g. after denoising)."""
+        return PcmFrame(self.session_id, samples, self.sample_rate, self.timestamp)
+
+
+def benchmark_overhead(iterations: int = 20000, block_ms: int = 160) -> Dict[str, float]:
+    """Per-chunk construction overhead in microseconds.
+
+    Compares building a pydantic ``AudioChunk`` (bytes copy, validation,
+    ``datetime`` default) plus the ``np.frombuffer`` the pipeline then needs,
+    against wrapping the same block in a :class:`PcmFrame`.
+    """
+    from datetime import datetime
+
+    from .models import AudioChunk
+
+    block = np.zeros(48000 * block_ms // 1000, dtype=np.int16)
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        chunk = AudioChunk(
+            session_id="bench",
+            data=block.tobytes(),
+            sample_rate=48000,
+            timestamp=datetime.utcnow(),
+        )
+        np.frombuffer(chunk.data, dtype=np.int16)
+    pydantic_us = (time.perf_counter() - started) / iterations * 1e6
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        PcmFrame.now("bench", block, 48000)
+    frame_us = (time.perf_counter() - started) / iterations * 1e6
+
+    return {"audio_chunk_us": pydantic_us, "pcm_frame_us": frame_us}
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark
+    result = benchmark_overhead()
+    print(
+        f"AudioChunk: {result['audio_chunk_us']:.2f} us/chunk, "
+        f"PcmFrame: {result['pcm_frame_us']:.2f} us/chunk"
+    )
@@ -0,0 +1,199 @@
+"""Optional worker processes for pyannote and face_recognition inference.
+
+With ``MODEL_WORKER_PROCESSES`` > 0, speaker embeddings and face detection
+run in a pool of spawned processes instead of threads, so concurrent rooms
+are not serialised on the GIL. Each worker loads its models once in the pool
+initializer. Audio batches and video frames travel through
+``multiprocessing.shared_memory`` rather than being pickled; only the small
+result arrays (embedding vectors, face boxes) come back through the pipe.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from .config import MODEL_WORKER_PROCESSES
+from .executors import register_pool
+
+logger = logging.getLogger("webrtc.model_workers")
+
+# Per-process model state, populated by ``_init_worker``.
+_worker_inference: Any = None
+_worker_face_recognition: Any = None
+
+ArraySpec = Tuple[str, Tuple[int, ...], str]
+
+
+def _init_worker(embedding_model: str, auth_token: Optional[str]) -> None:
+    """Load the models once per worker process."""
+    global _worker_inference, _worker_face_recognition
+    try:
+        import face_recognition
+
+        _worker_face_recognition = face_recognition
+    except ImportError:
+        _worker_face_recognition = None
+
+    try:
+        from pyannote.audio import Inference, Model
+
+        model = Model.from_pretrained(embedding_model, use_auth_token=auth_token)
+        _worker_inference = Inference(model=model, window="whole")
+    except Exception as exc:  # noqa: BLE001
+        logging.getLogger("webrtc.model_workers").warning(
+            "Worker could not load pyannote model '%s': %s", embedding_model, exc
+        )
+        _worker_inference = None
+
+
+def _attach(spec: ArraySpec) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    name, shape, dtype = spec
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: spawned workers share the parent's resource tracker,
+        # so this duplicate registration is cleared by the parent's unlink().
+        shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def _embed_windows(spec: ArraySpec, batch_size: int) -> Optional[np.ndarray]:
+    """Embed a ``(N, 1, samples)`` float32 batch; runs in a worker."""
+    if _worker_inference is None:
+        return None
+    import torch
+
+    shm, batch = _attach(spec)
+    try:
+        parts = []
+        step = max(batch_size, 1)
+        for start in range(0, batch.shape[0], step):
+            chunk = torch.from_numpy(np.array(batch[start : start + step]))
+            result = _worker_inference.infer(chunk)
+            if hasattr(result, "cpu"):
+                result = result.detach().cpu().numpy()
+            parts.append(np.asarray(result, dtype=np.float32).reshape(chunk.shape[0], -1))
+        return np.concatenate(parts, axis=0)
+    finally:
+        del batch
+        shm.close()
+
+
+def _locate_faces(
+    spec: ArraySpec,
+    detector: str,
+    scale: float,
+    rois: Optional[List[tuple]],
+    margin: float,
+) -> Tuple[List[tuple], bool]:
+    """Face boxes for an RGB frame (see ``app.video.detection``); runs in a worker."""
+    if _worker_face_recognition is None:
+        return [], True
+    from ..video.detection import locate_faces
+
+    shm, frame = _attach(spec)
+    try:
+        return locate_faces(
+            _worker_face_recognition.face_locations, frame, scale, rois, margin, detector
+        )
+    finally:
+        del frame
+        shm.close()
+
+
+def _encode_faces(
+    spec: ArraySpec, locations: List[tuple], embedding_model: str
+) -> List[np.ndarray]:
+    """128-d encodings for the given boxes of an RGB frame; runs in a worker."""
+    if _worker_face_recognition is None or not locations:
+        return []
+    shm, frame = _attach(spec)
+    try:
+        encodings = _worker_face_recognition.face_encodings(
+            frame, locations, model=embedding_model
+        )
+        return [np.asarray(e, dtype=np.float64) for e in encodings]
+    finally:
+        del frame
+        shm.close()
+
+
+class ModelWorkerPool:
+    """Process pool whose workers hold the embedding and face models."""
+
+    def __init__(
+        self,
+        processes: int,
+        embedding_model: str = "pyannote/embedding",
+        auth_token: Optional[str] = None,
+    ) -> None:
+        self.processes = processes
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(embedding_model, auth_token),
+        )
+        self._pool = register_pool("model_process", self._executor, processes)
+        logger.info("Started %d model worker processes", processes)
+
+    async def embed_windows(self, batch: np.ndarray, batch_size: int = 32) -> Optional[np.ndarray]:
+        """``(N, D)`` embeddings for a ``(N, 1, samples)`` float32 batch."""
+        return await self._run(_embed_windows, np.ascontiguousarray(batch, dtype=np.float32), batch_size)
+
+    async def locate_faces(
+        self,
+        rgb_frame: np.ndarray,
+        detector: str = "hog",
+        scale: float = 1.0,
+        rois: Optional[List[tuple]] = None,
+        margin: float = 0.5,
+    ) -> Tuple[List[tuple], bool]:
+        return await self._run(
+            _locate_faces, np.ascontiguousarray(rgb_frame), detector, scale, rois, margin
+        )
+
+    async def encode_faces(
+        self, rgb_frame: np.ndarray, locations: List[tuple], embedding_model: str = "large"
+    ) -> List[np.ndarray]:
+        return await self._run(
+            _encode_faces, np.ascontiguousarray(rgb_frame), list(locations), embedding_model
+        )
+
+    async def _run(self, fn, array: np.ndarray, *args: Any) -> Any:
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        try:
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+            spec: ArraySpec = (shm.name, array.shape, array.dtype.str)
+            return await asyncio.wrap_future(self._pool.submit(fn, spec, *args))
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+_model_workers: Optional[ModelWorkerPool] = None
+
+
+def get_model_workers(
+    embedding_model: str = "pyannote/embedding",
+    auth_token: Optional[str] = None,
+) -> Optional[ModelWorkerPool]:
+    """Shared worker pool, or ``None`` when ``MODEL_WORKER_PROCESSES`` is 0."""
+    global _model_workers
+    if MODEL_WORKER_PROCESSES <= 0:
+        return None
+    if _model_workers is None:
+        _model_workers = ModelWorkerPool(
+            MODEL_WORKER_PROCESSES,
+            embedding_model,
+            auth_token or os.getenv("PYANNOTE_AUTH_TOKEN"),
+        )
+    return _model_workers
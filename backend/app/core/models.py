@@ -56,9 +56,13 @@ class ConversationUtterance(BaseModel):
 class ConversationEvent(BaseModel):
     """Event emitted by the audio pipeline for downstream consumers."""
 
-    event_type: Literal["PERSON_DETECTED", "CONVERSATION_END", "FACE_DETECTED"]
+    event_type: Literal[
+        "PERSON_DETECTED", "CONVERSATION_PARTIAL", "CONVERSATION_END", "FACE_DETECTED"
+    ]
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     person_id: Optional[str] = None
+    # Everyone recognised in a multi-person FACE_DETECTED event; person_id is the first.
+    person_ids: list[str] = Field(default_factory=list)
     conversation_id: Optional[str] = None
     session_id: Optional[str] = None
     conversation: list[ConversationUtterance] = Field(default_factory=list)
@@ -7,12 +7,12 @@ import logging
 import os
 from pathlib import Path
 
-from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .audio import AdaptiveDenoiser, AudioPipeline, PipelineConfig
-from .core.config import CORS_ORIGINS, ROOT_DIR
+from .core.config import CORS_ORIGINS
+from .core.executors import executor_metrics, shutdown_executors
 from .services.conversation_stream import ConversationEventBus
 from .services.convex_client import get_convex_service
 from .video.pipeline import VideoPipeline, get_video_pipeline
@@ -43,7 +43,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-load_dotenv(ROOT_DIR / ".env")
 os.environ.setdefault("TORCHAUDIO_PYTHON_ONLY", "1")
 
 pipeline_config = PipelineConfig()
@@ -74,13 +73,14 @@ app.include_router(webrtc_router)
 
 @app.on_event("startup")
 async def on_startup() -> None:
-    """Warm up Whisper model asynchronously."""
+    """Warm up Whisper and seed the face gallery asynchronously."""
     async def _warmup():
         try:
             await audio_pipeline.warm_whisper()
         except Exception as exc:
             logger.warning("Whisper warm-up failed: %s", exc)
     asyncio.create_task(_warmup())
+    asyncio.create_task(video_pipeline.load_face_gallery())
 
 
 @app.get("/")
@@ -89,7 +89,15 @@ async def index():
     return {"status": "ok", "service": "ForgetMeNot Backend"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Queue depth and throughput of the executor pools."""
+    return {"executors": executor_metrics()}
+
+
 @app.on_event("shutdown")
 async def on_shutdown() -> None:
     """Close all peer connections on shutdown."""
     await close_all_connections()
+    await audio_pipeline.save_speaker_profiles(force=True)
+    shutdown_executors()
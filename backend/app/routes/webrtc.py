@@ -5,7 +5,8 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from typing import TYPE_CHECKING, Set
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
 from uuid import uuid4
 
 from aiortc import RTCPeerConnection, RTCSessionDescription
@@ -13,13 +14,18 @@ from fastapi import APIRouter
 from pydantic import BaseModel
 
 from ..core import ConversationEvent, ConversationUtterance
-from ..core.config import FACE_REPUBLISH_INTERVAL_SECONDS, SPEAKER_ASSOCIATION_WINDOW_SECONDS
+from ..core.config import (
+    AUDIO_BLOCK_MS,
+    AUDIO_QUEUE_BLOCKS,
+    FACE_REPUBLISH_INTERVAL_SECONDS,
+    SPEAKER_ASSOCIATION_WINDOW_SECONDS,
+)
 
 if TYPE_CHECKING:
     from ..audio import AudioPipeline
     from ..services.conversation_stream import ConversationEventBus
     from ..services.convex_client import ConvexService
-    from ..video.pipeline import VideoPipeline
+    from ..video.pipeline import FaceDetection, VideoPipeline
 
 logger = logging.getLogger("webrtc.webrtc")
 
@@ -98,133 +104,76 @@ async def offer(session: SDPModel) -> SDPModel:
 
 
 async def _consume_audio(track, session_id: str) -> None:
-    """Consume audio track from WebRTC."""
-    from datetime import datetime
+    """Consume audio track from WebRTC and feed the audio pipeline."""
+    from ..audio.ingest import AudioIngestor
 
-    from ..core import AudioChunk
+    if _audio_pipeline is None:
+        return
 
-    last_sample_rate: int | None = None
+    ingestor = AudioIngestor(
+        _audio_pipeline,
+        session_id,
+        block_ms=AUDIO_BLOCK_MS,
+        max_queue_blocks=AUDIO_QUEUE_BLOCKS,
+    )
     while True:
         try:
             frame = await track.recv()
-            if not frame.planes:
-                continue
-            plane = frame.planes[0]
-            try:
-                data = plane.to_bytes()
-            except AttributeError:
-                data = bytes(plane)
-            sample_rate = getattr(frame, "sample_rate", None) or 16000
-            last_sample_rate = sample_rate
-            chunk = AudioChunk(
-                session_id=session_id,
-                data=data,
-                sample_rate=sample_rate,
-                timestamp=datetime.utcnow(),
-            )
         except Exception:
-            break
-
-        if last_sample_rate:
-            try:
-                if _audio_pipeline is not None:
-                    await _audio_pipeline.flush_session(session_id, last_sample_rate)
-            except Exception as exc:
-                logger.exception(
-                    "Error flushing audio buffer for session %s: %s",
-                    session_id,
-                    exc,
-                )
+            break  # MediaStreamError: track ended
+        try:
+            ingestor.push_frame(frame)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("Session %s skipped undecodable audio frame: %s", session_id, exc)
+
+    try:
+        await ingestor.close()
+    except Exception as exc:
+        logger.exception(
+            "Error flushing audio buffer for session %s: %s",
+            session_id,
+            exc,
+        )
+    if ingestor.dropped_blocks:
+        logger.warning(
+            "Session %s dropped %d audio blocks under load",
+            session_id,
+            ingestor.dropped_blocks,
+        )
 
 
 async def _consume_video(track, session_id: str) -> None:
     """Consume video track for face recognition."""
-    import numpy as np
+    from ..video.scheduler import AdaptiveFrameScheduler, decode_rgb, decode_thumbnail
 
     if _video_pipeline is None or _conversation_bus is None:
         return
 
-    frame_count = 0
-    last_face_id = None
-    last_publish_ts = 0.0
+    scheduler = AdaptiveFrameScheduler.from_config(_video_pipeline.config)
+    identities: Dict[str, _TrackIdentity] = {}
 
     while True:
         try:
             frame = await track.recv()
-            frame_count += 1
-
-            if frame_count % 30 != 0:
-                continue
 
             if not _video_pipeline.is_available:
                 continue
 
             try:
-                img = frame.to_ndarray(format="bgr24")
+                mono_now = time.monotonic()
+                if not scheduler.wants_probe(mono_now):
+                    continue
+                if not scheduler.should_process(decode_thumbnail(frame), mono_now):
+                    continue
+
+                img = decode_rgb(frame, _video_pipeline.config.decode_width)
                 timestamp = time.time()
 
-                detections = await _video_pipeline.process_frame(img, timestamp)
+                detections = await _video_pipeline.process_frame(img, timestamp, session_id)
+                scheduler.record_faces(len(detections), time.monotonic())
 
                 if detections:
-                    face = detections[0]
-                    result = await _video_pipeline.match_face_to_speaker(face.embedding)
-
-                    if result and result.get("found"):
-                        speaker_id = result.get("speakerId")
-                        name = result.get("speaker", {}).get("name", "Unknown")
-
-                        now = time.time()
-                        if speaker_id != last_face_id or (now - last_publish_ts > FACE_REPUBLISH_INTERVAL_SECONDS):
-                            logger.info(
-                                "Face recognized: %s (score=%.2f)",
-                                name,
-                                result.get("score", 0)
-                            )
-                            last_face_id = speaker_id
-                            last_publish_ts = now
-
-                            try:
-                                event = ConversationEvent(
-                                    event_type="FACE_DETECTED",
-                                    person_id=speaker_id,
-                                    conversation_id=uuid4().hex,
-                                    session_id=session_id,
-                                    conversation=[ConversationUtterance(speaker=name, text="")]
-                                )
-                                await _conversation_bus.publish(event)
-                            except Exception as e:
-                                logger.warning("Failed to publish face event: %s", e)
-
-                    else:
-                        latest_speaker_info = _latest_speaker_info_getter() if _latest_speaker_info_getter else {"ts": 0}
-                        now = time.time()
-                        last_active_ts = latest_speaker_info.get("ts", 0)
-
-                        if now - last_active_ts < SPEAKER_ASSOCIATION_WINDOW_SECONDS and latest_speaker_info.get("id"):
-                            active_id = latest_speaker_info["id"]
-                            active_name = latest_speaker_info["name"]
-
-                            logger.info("Associating unknown face with active speaker: %s", active_name)
-                            success = await _video_pipeline.update_speaker_face(
-                                active_id,
-                                face.embedding
-                            )
-                            if success:
-                                logger.info("Learned face for %s!", active_name)
-                                last_face_id = active_id
-                                try:
-                                    event = ConversationEvent(
-                                        event_type="FACE_DETECTED",
-                                        person_id=active_id,
-                                        conversation_id=uuid4().hex,
-                                        session_id=session_id,
-                                        conversation=[ConversationUtterance(speaker=active_name, text="")]
-                                    )
-                                    await _conversation_bus.publish(event)
-                                except Exception:
-                                    pass
-                        else:
-                            last_face_id = None
+                    await _recognize_faces(detections, session_id, identities)
             except Exception as exc:
                 logger.debug("Video frame processing error: %s", exc)
                 continue
@@ -232,6 +181,99 @@ async def _consume_video(track, session_id: str) -> None:
         except Exception:
             break
 
+    _video_pipeline.release_session(session_id)
+    logger.debug("Session %s video sampling: %s", session_id, scheduler.stats())
+
+
+@dataclass
+class _TrackIdentity:
+    """Who a face track was recognised as, and when it was last announced."""
+    speaker_id: Optional[str] = None
+    name: str = "Unknown"
+    last_published: float = 0.0
+    last_seen: float = 0.0
+
+
+async def _recognize_faces(
+    detections: "List[FaceDetection]",
+    session_id: str,
+    identities: Dict[str, _TrackIdentity],
+) -> None:
+    """Match every face in a frame and publish one FACE_DETECTED event.
+
+    Faces whose track kept its cached embedding reuse the track's identity,
+    the rest are matched in one batched call. Announcements are debounced
+    per track: an event goes out when a track is newly recognised or its
+    republish interval has passed, and it lists everyone in the frame.
+    """
+    now = time.time()
+    to_match = [d for d in detections if d.reencoded or d.face_id not in identities]
+    results = await _video_pipeline.match_faces([d.embedding for d in to_match])
+    for detection, result in zip(to_match, results):
+        identity = identities.setdefault(detection.face_id, _TrackIdentity())
+        if result and result.get("found"):
+            speaker_id = result.get("speakerId")
+            if speaker_id != identity.speaker_id:
+                identity.last_published = 0.0
+            identity.speaker_id = speaker_id
+            identity.name = (result.get("speaker") or {}).get("name", "Unknown")
+        # A miss on a refreshed encoding keeps the track's earlier identity.
+
+    present = [identities[d.face_id] for d in detections]
+    for identity in present:
+        identity.last_seen = now
+
+    unknown = [d for d in detections if identities[d.face_id].speaker_id is None]
+    recognized = {i.speaker_id for i in present if i.speaker_id}
+    if len(unknown) == 1:
+        # Only an unambiguous stranger can be the person who is talking.
+        latest_speaker_info = _latest_speaker_info_getter() if _latest_speaker_info_getter else {"ts": 0}
+        last_active_ts = latest_speaker_info.get("ts", 0)
+        active_id = latest_speaker_info.get("id")
+        if (
+            active_id
+            and active_id not in recognized
+            and now - last_active_ts < SPEAKER_ASSOCIATION_WINDOW_SECONDS
+        ):
+            active_name = latest_speaker_info["name"]
+            logger.info("Associating unknown face with active speaker: %s", active_name)
+            success = await _video_pipeline.update_speaker_face(
+                active_id,
+                unknown[0].embedding,
+                active_name,
+            )
+            if success:
+                logger.info("Learned face for %s!", active_name)
+                identity = identities[unknown[0].face_id]
+                identity.speaker_id = active_id
+                identity.name = active_name
+                identity.last_published = 0.0
+
+    known = [i for i in present if i.speaker_id]
+    if any(now - i.last_published > FACE_REPUBLISH_INTERVAL_SECONDS for i in known):
+        people: Dict[str, str] = {}
+        for identity in known:
+            people.setdefault(identity.speaker_id, identity.name)
+            identity.last_published = now
+        logger.info("Faces recognized: %s", ", ".join(people.values()))
+        try:
+            event = ConversationEvent(
+                event_type="FACE_DETECTED",
+                person_id=next(iter(people)),
+                person_ids=list(people),
+                conversation_id=uuid4().hex,
+                session_id=session_id,
+                conversation=[
+                    ConversationUtterance(speaker=name, text="") for name in people.values()
+                ],
+            )
+            await _conversation_bus.publish(event)
+        except Exception as e:
+            logger.warning("Failed to publish face event: %s", e)
+
+    for face_id in [k for k, i in identities.items() if now - i.last_seen > FACE_REPUBLISH_INTERVAL_SECONDS * 4]:
+        del identities[face_id]
+
 
 async def close_all_connections() -> None:
     """Close all peer connections on shutdown."""
@@ -3,11 +3,12 @@ Convex Memory Service for storing and retrieving speaker profiles and conversati
 Uses Convex's real-time database with vector search for speaker matching.
 """
 
-import asyncio
 import logging
 import os
 from typing import Any, Optional
 
+from ..core.executors import run_in_pool
+
 logger = logging.getLogger("webrtc.convex")
 
 try:
@@ -84,7 +85,8 @@ class ConvexMemoryService:
             if speaking_time is not None:
                 args["speakingTime"] = speaking_time
             
-            result = await asyncio.to_thread(
+            result = await run_in_pool(
+                "io",
                 client.action,
                 "speakers:findOrCreateSpeaker",
                 args
@@ -137,7 +139,8 @@ class ConvexMemoryService:
             if topics is not None:
                 args["topics"] = topics
             
-            conversation_id = await asyncio.to_thread(
+            conversation_id = await run_in_pool(
+                "io",
                 client.mutation,
                 "context:saveConversation",
                 args
@@ -163,7 +166,8 @@ class ConvexMemoryService:
             return None
         
         try:
-            context = await asyncio.to_thread(
+            context = await run_in_pool(
+                "io",
                 client.query,
                 "context:getPersonContext",
                 {"speakerId": speaker_id}
@@ -189,7 +193,8 @@ class ConvexMemoryService:
             return False
         
         try:
-            await asyncio.to_thread(
+            await run_in_pool(
+                "io",
                 client.mutation,
                 "speakers:updateSpeakerName",
                 {"id": speaker_id, "name": name}
@@ -237,7 +242,8 @@ class ConvexMemoryService:
             if photo_url is not None:
                 args["photoUrl"] = photo_url
             
-            await asyncio.to_thread(
+            await run_in_pool(
+                "io",
                 client.mutation,
                 "speakers:updateSpeakerProfile",
                 args
@@ -268,7 +274,8 @@ class ConvexMemoryService:
             return {"found": False, "speakerId": None, "speaker": None, "score": 0}
 
         try:
-            result = await asyncio.to_thread(
+            result = await run_in_pool(
+                "io",
                 client.action,
                 "speakers:findSpeakerByFace",
                 {"faceEmbedding": face_embedding, "threshold": threshold}
@@ -298,7 +305,8 @@ class ConvexMemoryService:
             return False
 
         try:
-            await asyncio.to_thread(
+            await run_in_pool(
+                "io",
                 client.mutation,
                 "speakers:updateSpeakerFace",
                 {"id": speaker_id, "faceEmbedding": face_embedding}
@@ -324,7 +332,8 @@ class ConvexMemoryService:
             return None
 
         try:
-            speaker = await asyncio.to_thread(
+            speaker = await run_in_pool(
+                "io",
                 client.query,
                 "speakers:getSpeakerByName",
                 {"name": name}
@@ -346,7 +355,8 @@ class ConvexMemoryService:
             return []
         
         try:
-            speakers = await asyncio.to_thread(
+            speakers = await run_in_pool(
+                "io",
                 client.query,
                 "speakers:listSpeakers",
                 {}
@@ -5,9 +5,12 @@ from __future__ import annotations
 import asyncio
 import logging
 from collections import defaultdict
-from typing import DefaultDict, List, Set, Tuple
+from typing import DefaultDict, Dict, List, Optional, Set, Tuple
+
+import numpy as np
 
 from ..core import SpeakerEmbedding, VectorSimilarityResult
+from .ann_index import EmbeddingIndex
 
 logger = logging.getLogger("webrtc.vector_store")
 
@@ -20,6 +23,8 @@ class MongoDBVectorStore:
         self.database = database
         self.collection = collection
         self._store: DefaultDict[str, list[SpeakerEmbedding]] = defaultdict(list)
+        self._index: Optional[EmbeddingIndex] = None
+        self._index_entries: Dict[str, Tuple[str, SpeakerEmbedding]] = {}
         self._metrics_lock = asyncio.Lock()
         self._query_count = 0
         self._unique_match_ids: Set[str] = set()
@@ -43,6 +48,13 @@ class MongoDBVectorStore:
 
         stored = embedding.model_copy()
         self._store[person_id].append(stored)
+        if stored.vector:
+            if self._index is None:
+                self._index = EmbeddingIndex(dim=len(stored.vector))
+            if len(stored.vector) == self._index.dim:
+                key = f"{person_id}:{len(self._store[person_id]) - 1}"
+                self._index.add(key, np.asarray(stored.vector, dtype=np.float32))
+                self._index_entries[key] = (person_id, stored)
         async with self._metrics_lock:
             self._embedding_total += 1
         logger.info(
@@ -57,20 +69,18 @@ class MongoDBVectorStore:
     ) -> List[VectorSimilarityResult]:
         """Return cosine similarity scores against all stored identities."""
 
-        results: list[VectorSimilarityResult] = []
-        for person_id, embeddings in self._store.items():
-            for stored in embeddings:
-                score = self._cosine_proxy(embedding.vector, stored.vector)
-                results.append(
+        trimmed: list[VectorSimilarityResult] = []
+        index = self._index
+        if index is not None and len(embedding.vector) == index.dim and any(embedding.vector):
+            for key, score in index.search(np.asarray(embedding.vector, dtype=np.float32), limit):
+                person_id, stored = self._index_entries[key]
+                trimmed.append(
                     VectorSimilarityResult(
                         matched_person_id=person_id,
                         score=score,
                         embedding=stored,
                     )
                 )
-
-        results.sort(key=lambda r: r.score, reverse=True)
-        trimmed = results[:limit]
         async with self._metrics_lock:
             self._query_count += 1
             self._unique_match_ids.update(
@@ -94,14 +104,3 @@ class MongoDBVectorStore:
             self._query_count = 0
             self._unique_match_ids.clear()
         return lookups, unique, total
-
-    @staticmethod
-    def _cosine_proxy(a: list[float], b: list[float]) -> float:
-        if not a or not b:
-            return 0.0
-        numerator = sum(x * y for x, y in zip(a, b))
-        denom_a = sum(x * x for x in a) ** 0.5
-        denom_b = sum(y * y for y in b) ** 0.5
-        if denom_a == 0 or denom_b == 0:
-            return 0.0
-        return numerator / (denom_a * denom_b)
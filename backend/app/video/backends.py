@@ -0,0 +1,304 @@
+"""Pluggable face detection and embedding backends for ``VideoPipeline``.
+
+``dlib`` wraps the ``face_recognition`` library (HOG detector, 68-landmark
+ResNet encoder). ``onnx`` runs a detector and an embedder with ONNX Runtime
+on the CPU. It encodes all crops of a frame in one batched call, can use
+int8 dynamically quantised weights, and has a configurable intra-op thread
+count.
+
+Embeddings from different backends are not comparable. Switching backends
+means re-enrolling faces, and each backend has its own
+``default_match_threshold``. Convex's
+``by_face_embedding`` index also expects 128-d vectors, so the ONNX
+embedder should produce 128 dimensions (e.g. a 128-d MobileFaceNet).
+"""
+
+from __future__ import annotations
+
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .pipeline import VideoPipelineConfig
+
+logger = logging.getLogger("webrtc.video.backends")
+
+try:
+    import face_recognition
+except ImportError:
+    face_recognition = None
+
+try:  # pragma: no cover - optional dependency
+    import onnxruntime as ort
+except ImportError:  # pragma: no cover
+    ort = None
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+Box = Tuple[int, int, int, int]  # (top, right, bottom, left)
+
+BACKENDS = ("dlib", "onnx")
+
+
+class FaceBackend(ABC):
+    """Face localisation and embedding on RGB ``uint8`` frames.
+
+    :meth:`locate` matches the detector callable that
+    :mod:`app.video.detection` expects, so scaled and ROI detection work
+    with any backend.
+    """
+
+    name: str = ""
+    embedding_dim: int = 128
+    default_match_threshold: float = 0.6  # Euclidean distance between embeddings
+
+    @property
+    @abstractmethod
+    def available(self) -> bool:
+        """Whether the backend's libraries and models loaded."""
+
+    @abstractmethod
+    def locate(self, rgb: np.ndarray, model: str = "hog") -> List[Box]:
+        """Face boxes in ``rgb``."""
+
+    @abstractmethod
+    def encode(self, rgb: np.ndarray, locations: Sequence[Box]) -> List[np.ndarray]:
+        """One embedding per box, in order."""
+
+
+class DlibFaceBackend(FaceBackend):
+    """``face_recognition`` (dlib) HOG detection and 128-d encodings."""
+
+    name = "dlib"
+    embedding_dim = 128
+    default_match_threshold = 0.6  # face_recognition's recommended tolerance
+
+    def __init__(self, embedding_model: str = "large") -> None:
+        self.embedding_model = embedding_model
+
+    @property
+    def available(self) -> bool:
+        return face_recognition is not None
+
+    def locate(self, rgb: np.ndarray, model: str = "hog") -> List[Box]:
+        return list(face_recognition.face_locations(rgb, model=model))
+
+    def encode(self, rgb: np.ndarray, locations: Sequence[Box]) -> List[np.ndarray]:
+        if not locations:
+            return []
+        encodings = face_recognition.face_encodings(rgb, list(locations), model=self.embedding_model)
+        return [np.asarray(e, dtype=np.float64) for e in encodings]
+
+
+def quantize_model(path: str | Path) -> Path:
+    """int8 dynamically quantised copy of an ONNX model, cached next to it."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    source = Path(path)
+    target = source.with_suffix(".int8.onnx")
+    if not target.exists() or target.stat().st_mtime < source.stat().st_mtime:
+        logger.info("Quantising %s to int8", source.name)
+        quantize_dynamic(str(source), str(target), weight_type=QuantType.QInt8)
+    return target
+
+
+def _nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> List[int]:
+    """Greedy non-maximum suppression over ``(N, 4)`` x1, y1, x2, y2 boxes."""
+    order = scores.argsort()[::-1]
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    keep: List[int] = []
+    while order.size:
+        i = int(order[0])
+        keep.append(i)
+        rest = order[1:]
+        xx1 = np.maximum(boxes[i, 0], boxes[rest, 0])
+        yy1 = np.maximum(boxes[i, 1], boxes[rest, 1])
+        xx2 = np.minimum(boxes[i, 2], boxes[rest, 2])
+        yy2 = np.minimum(boxes[i, 3], boxes[rest, 3])
+        inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+        iou = inter / np.maximum(areas[i] + areas[rest] - inter, 1e-9)
+        order = rest[iou <= iou_threshold]
+    return keep
+
+
+class OnnxFaceBackend(FaceBackend):
+    """ONNX Runtime CPU detector and embedder.
+
+    The detector is expected to follow the Ultra-Light-Fast-Generic-Face-
+    Detector (``version-RFB-320``) contract: a ``(1, 3, H, W)`` input
+    normalised as ``(x - 127) / 128`` and ``scores (1, N, 2)`` plus
+    normalised ``boxes (1, N, 4)`` outputs. The embedder takes
+    ``(B, 3, S, S)`` face crops normalised as ``(x - 127.5) / 128`` (the
+    MobileFaceNet/ArcFace convention) and returns ``(B, D)`` embeddings,
+    which are L2-normalised here.
+
+    Args:
+        detector_path: Detector ``.onnx`` file.
+        embedder_path: Embedder ``.onnx`` file.
+        intra_op_threads: ONNX Runtime intra-op threads (0 lets it decide).
+        quantize: Run int8 dynamically quantised copies of both models.
+        score_threshold: Minimum detector face score.
+        crop_margin: Fraction of the box added on each side before cropping.
+    """
+
+    name = "onnx"
+    # Unit-length embeddings are in [0, 2] apart; 1.1 is cosine similarity ~0.4.
+    default_match_threshold = 1.1
+
+    def __init__(
+        self,
+        detector_path: str,
+        embedder_path: str,
+        intra_op_threads: int = 0,
+        quantize: bool = False,
+        score_threshold: float = 0.7,
+        nms_threshold: float = 0.3,
+        crop_margin: float = 0.1,
+    ) -> None:
+        self.score_threshold = score_threshold
+        self.nms_threshold = nms_threshold
+        self.crop_margin = crop_margin
+        self._detector = None
+        self._embedder = None
+        if ort is None:
+            logger.warning("onnxruntime not installed; ONNX face backend disabled")
+            return
+        try:
+            self._detector = self._session(detector_path, intra_op_threads, quantize)
+            self._embedder = self._session(embedder_path, intra_op_threads, quantize)
+            # Input sizes must be fixed; symbolic (dynamic) dims raise here.
+            det_input = self._detector.get_inputs()[0]
+            self._det_name = det_input.name
+            self._det_size = (int(det_input.shape[3]), int(det_input.shape[2]))  # (W, H)
+            emb_input = self._embedder.get_inputs()[0]
+            self._emb_name = emb_input.name
+            self._emb_size = int(emb_input.shape[2])
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Failed to load ONNX face models: %s", exc)
+            self._detector = self._embedder = None
+            return
+
+        emb_dim = self._embedder.get_outputs()[0].shape[-1]
+        self.embedding_dim = int(emb_dim) if isinstance(emb_dim, int) else 128
+        logger.info(
+            "ONNX face backend ready (detector %dx%d, %d-d embeddings, int8=%s)",
+            self._det_size[0],
+            self._det_size[1],
+            self.embedding_dim,
+            quantize,
+        )
+
+    @staticmethod
+    def _session(path: str, intra_op_threads: int, quantize: bool):
+        model_path = quantize_model(path) if quantize else Path(path)
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = max(intra_op_threads, 0)
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        return ort.InferenceSession(
+            str(model_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+
+    @property
+    def available(self) -> bool:
+        return self._detector is not None and self._embedder is not None
+
+    def locate(self, rgb: np.ndarray, model: str = "hog") -> List[Box]:
+        """Face boxes; ``model`` is accepted for detector-callable parity and ignored."""
+        height, width = rgb.shape[:2]
+        blob = _resize(rgb, self._det_size).astype(np.float32)
+        blob = ((blob - 127.0) / 128.0).transpose(2, 0, 1)[None]
+        scores, boxes = self._detector.run(None, {self._det_name: blob})
+        scores = scores[0, :, 1]
+        keep = scores > self.score_threshold
+        if not np.any(keep):
+            return []
+        boxes = boxes[0, keep] * np.array([width, height, width, height], dtype=np.float32)
+        scores = scores[keep]
+        located: List[Box] = []
+        for i in _nms(boxes, scores, self.nms_threshold):
+            x1, y1, x2, y2 = boxes[i]
+            located.append(
+                (max(int(y1), 0), min(int(x2), width), min(int(y2), height), max(int(x1), 0))
+            )
+        return located
+
+    def encode(self, rgb: np.ndarray, locations: Sequence[Box]) -> List[np.ndarray]:
+        """Embeddings for all boxes in one batched run."""
+        if not locations:
+            return []
+        size = self._emb_size
+        batch = np.empty((len(locations), 3, size, size), dtype=np.float32)
+        for i, box in enumerate(locations):
+            crop = _square_crop(rgb, box, self.crop_margin)
+            batch[i] = ((_resize(crop, (size, size)).astype(np.float32) - 127.5) / 128.0).transpose(
+                2, 0, 1
+            )
+        embeddings = self._embedder.run(None, {self._emb_name: batch})[0]
+        embeddings = embeddings.reshape(len(locations), -1).astype(np.float64)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.maximum(norms, 1e-12)
+        return list(embeddings)
+
+
+def _resize(rgb: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    """Resize to ``(width, height)``; nearest-neighbour without OpenCV."""
+    width, height = size
+    if rgb.shape[1] == width and rgb.shape[0] == height:
+        return rgb
+    if cv2 is not None:
+        return cv2.resize(rgb, size, interpolation=cv2.INTER_LINEAR)
+    rows = (np.arange(height) * rgb.shape[0] / height).astype(np.intp)
+    cols = (np.arange(width) * rgb.shape[1] / width).astype(np.intp)
+    return rgb[rows[:, None], cols[None, :]]
+
+
+def _square_crop(rgb: np.ndarray, box: Box, margin: float) -> np.ndarray:
+    """Square crop centred on ``box``, grown by ``margin``, edge-padded at borders."""
+    top, right, bottom, left = box
+    side = int(max(right - left, bottom - top) * (1.0 + 2.0 * margin))
+    side = max(side, 1)
+    cy, cx = (top + bottom) // 2, (left + right) // 2
+    y0, x0 = cy - side // 2, cx - side // 2
+    height, width = rgb.shape[:2]
+    crop = rgb[max(y0, 0) : min(y0 + side, height), max(x0, 0) : min(x0 + side, width)]
+    pad = (
+        (max(-y0, 0), max(y0 + side - height, 0)),
+        (max(-x0, 0), max(x0 + side - width, 0)),
+        (0, 0),
+    )
+    return np.pad(crop, pad, mode="edge") if any(p for axis in pad for p in axis) else crop
+
+
+def create_face_backend(config: "VideoPipelineConfig") -> FaceBackend:
+    """Backend selected by ``config.backend``; falls back to dlib if ONNX cannot load."""
+    if config.backend not in BACKENDS:
+        raise ValueError(f"Unsupported face backend: {config.backend}")
+    if config.backend == "onnx":
+        backend = OnnxFaceBackend(
+            config.onnx_detector_path,
+            config.onnx_embedder_path,
+            intra_op_threads=config.onnx_threads,
+            quantize=config.onnx_int8,
+        )
+        if backend.available:
+            return backend
+        logger.warning("ONNX face backend unavailable; falling back to dlib")
+    return DlibFaceBackend(config.embedding_model)
+
+
+def load_backend(name: str, config: Optional["VideoPipelineConfig"] = None) -> FaceBackend:
+    """Backend by name with the remaining settings taken from ``config``."""
+    from dataclasses import replace
+
+    from .pipeline import VideoPipelineConfig
+
+    return create_face_backend(replace(config or VideoPipelineConfig(), backend=name))
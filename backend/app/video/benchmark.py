@@ -0,0 +1,212 @@
+"""Benchmark face detection settings over a folder of recorded frames.
+
+Usage::
+
+    python -m app.video.benchmark path/to/frames [--scale 0.5] [--width 640]
+    python -m app.video.benchmark path/to/frames --backends dlib,onnx
+
+Frames are read in filename order and treated as one video stream sampled
+at ``--fps``. The reference is the previous behaviour: HOG on the full
+frame at its native resolution. Candidates are a scaled full-frame scan
+and the scaled scan with ROI re-detection around tracked faces, as
+``VideoPipeline`` runs it. Recall is the fraction of reference boxes
+matched by a candidate box with IoU >= 0.5.
+
+With ``--backends`` the face backends are compared side by side instead:
+detection ms/frame, batched encoding ms/face, and detection recall against
+the dlib boxes. That recall uses IoU >= 0.3, because detectors frame faces
+differently.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .backends import FaceBackend, load_backend
+from .detection import Box, locate_faces, locate_scaled, resize
+from .tracking import FaceTracker, iou_matrix
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+def load_frames(folder: Path) -> List[np.ndarray]:
+    """RGB frames from ``folder`` in filename order."""
+    import face_recognition
+
+    return [
+        face_recognition.load_image_file(str(path))
+        for path in sorted(p for p in folder.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    ]
+
+
+def _matched(reference: Sequence[Box], candidate: Sequence[Box], min_iou: float = 0.5) -> int:
+    if not reference or not candidate:
+        return 0
+    ious = iou_matrix(np.array(reference, dtype=np.float64), np.array(candidate, dtype=np.float64))
+    return int((ious.max(axis=1) >= min_iou).sum())
+
+
+def _run(
+    frames: List[np.ndarray], locate: Callable[[np.ndarray, float], List[Box]], fps: float
+) -> Tuple[List[List[Box]], float]:
+    results = []
+    started = time.perf_counter()
+    for i, frame in enumerate(frames):
+        results.append(locate(frame, i / fps))
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    return results, elapsed_ms / max(len(frames), 1)
+
+
+def benchmark(
+    frames: List[np.ndarray],
+    native: List[np.ndarray],
+    scale: float = 0.5,
+    margin: float = 0.5,
+    full_scan_interval: float = 5.0,
+    fps: float = 1.0,
+    model: str = "hog",
+) -> Dict[str, Dict[str, float]]:
+    """ms/frame and recall for the reference and candidate detectors.
+
+    Args:
+        frames: Frames at the pipeline's decode resolution.
+        native: The same frames at native resolution (reference).
+        scale: ``VideoPipelineConfig.detection_scale``.
+        margin: ``VideoPipelineConfig.roi_margin``.
+        full_scan_interval: ``VideoPipelineConfig.full_scan_interval_seconds``.
+        fps: Sampling rate the frames represent.
+        model: face_recognition detector model.
+    """
+    import face_recognition
+
+    detector = face_recognition.face_locations
+
+    def reference(frame: np.ndarray, _: float) -> List[Box]:
+        return [tuple(int(v) for v in box) for box in detector(frame, model=model)]
+
+    def scaled(frame: np.ndarray, _: float) -> List[Box]:
+        return locate_scaled(detector, frame, scale, model)
+
+    tracker = FaceTracker()
+
+    def tracked(frame: np.ndarray, now: float) -> List[Box]:
+        rois = None
+        if tracker.tracks and now - tracker.last_full_scan < full_scan_interval:
+            rois = [track.location for track in tracker.tracks]
+        boxes, full_scan = locate_faces(detector, frame, scale, rois, margin, model)
+        if full_scan:
+            tracker.last_full_scan = now
+        tracker.update(boxes, now)
+        return boxes
+
+    ref_boxes, ref_ms = _run(native, reference, fps)
+    # Reference boxes mapped to decode resolution for comparison.
+    mapped = [
+        [
+            tuple(int(round(v * f.shape[1] / n.shape[1])) for v in box)
+            for box in boxes
+        ]
+        for boxes, f, n in zip(ref_boxes, frames, native)
+    ]
+    total = sum(len(b) for b in mapped)
+
+    report: Dict[str, Dict[str, float]] = {"reference": {"ms_per_frame": ref_ms, "recall": 1.0}}
+    for name, fn in (("scaled", scaled), ("scaled+roi", tracked)):
+        boxes, ms = _run(frames, fn, fps)
+        hits = sum(_matched(r, c) for r, c in zip(mapped, boxes))
+        report[name] = {"ms_per_frame": ms, "recall": hits / total if total else 1.0}
+    report["reference"]["faces"] = float(total)
+    return report
+
+
+def compare_backends(
+    frames: List[np.ndarray],
+    backends: Sequence[FaceBackend],
+    scale: float = 1.0,
+    min_iou: float = 0.3,
+) -> Dict[str, Dict[str, float]]:
+    """Detection and encoding cost of each backend on the same frames.
+
+    The first backend's boxes are the recall reference.
+    """
+    report: Dict[str, Dict[str, float]] = {}
+    reference: List[List[Box]] = []
+    for backend in backends:
+        boxes, detect_ms = _run(
+            frames, lambda frame, _: locate_scaled(backend.locate, frame, scale), 1.0
+        )
+        faces = sum(len(b) for b in boxes)
+        started = time.perf_counter()
+        for frame, frame_boxes in zip(frames, boxes):
+            backend.encode(frame, frame_boxes)
+        encode_ms = (time.perf_counter() - started) * 1000.0 / max(faces, 1)
+        if not reference:
+            reference = boxes
+        total = sum(len(b) for b in reference)
+        hits = sum(_matched(r, c, min_iou) for r, c in zip(reference, boxes))
+        report[backend.name] = {
+            "detect_ms_per_frame": detect_ms,
+            "encode_ms_per_face": encode_ms,
+            "faces": float(faces),
+            "recall": hits / total if total else 1.0,
+        }
+    return report
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("folder", type=Path)
+    parser.add_argument("--scale", type=float, default=0.5, help="detection_scale")
+    parser.add_argument("--width", type=int, default=640, help="decode_width (0 = native)")
+    parser.add_argument("--margin", type=float, default=0.5, help="roi_margin")
+    parser.add_argument("--full-scan-interval", type=float, default=5.0)
+    parser.add_argument("--fps", type=float, default=1.0, help="sampling rate of the frames")
+    parser.add_argument("--model", default="hog")
+    parser.add_argument(
+        "--backends", default="", help="comma-separated face backends to compare, e.g. dlib,onnx"
+    )
+    args = parser.parse_args(argv)
+
+    native = load_frames(args.folder)
+    if not native:
+        print(f"No images found in {args.folder}", file=sys.stderr)
+        return 1
+    frames = [
+        resize(f, args.width / f.shape[1]) if args.width and f.shape[1] > args.width else f
+        for f in native
+    ]
+    if args.backends:
+        backends = []
+        for name in args.backends.split(","):
+            backend = load_backend(name.strip())
+            if backend.name != name.strip() or not backend.available:
+                print(f"Face backend '{name}' is not available", file=sys.stderr)
+                return 1
+            backends.append(backend)
+        report = compare_backends(frames, backends, args.scale)
+        print(f"{len(frames)} frames, recall relative to '{backends[0].name}'")
+        for name, row in report.items():
+            print(
+                f"{name:>6}: detect {row['detect_ms_per_frame']:8.1f} ms/frame  "
+                f"encode {row['encode_ms_per_face']:7.1f} ms/face  "
+                f"faces {int(row['faces'])}  recall {row['recall']:.3f}"
+            )
+        return 0
+
+    report = benchmark(
+        frames, native, args.scale, args.margin, args.full_scan_interval, args.fps, args.model
+    )
+    print(f"{len(native)} frames, {int(report['reference']['faces'])} reference faces")
+    for name, row in report.items():
+        print(f"{name:>12}: {row['ms_per_frame']:8.1f} ms/frame  recall {row['recall']:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""Face localisation on downscaled frames and around known tracks.
+
+HOG cost grows with pixel count, so full-frame scans run on a copy resized
+by ``scale`` and the boxes are mapped back to the original frame, where
+encodings are computed. When faces are already tracked, only regions around
+their last boxes are searched. Those crops are small, so they are scanned
+at full resolution.
+
+The helpers take the detector as a callable so the same code runs in the
+``video`` thread pool, in model worker processes and in the benchmark.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+Box = Tuple[int, int, int, int]  # (top, right, bottom, left)
+Detector = Callable[..., List[Box]]
+
+
+def resize(rgb: np.ndarray, scale: float) -> np.ndarray:
+    """Downscale an image by ``scale`` (area interpolation when OpenCV is present)."""
+    if scale >= 1.0:
+        return rgb
+    height, width = rgb.shape[:2]
+    size = (max(int(round(width * scale)), 1), max(int(round(height * scale)), 1))
+    if cv2 is not None:
+        return cv2.resize(rgb, size, interpolation=cv2.INTER_AREA)
+    step = max(int(round(1.0 / scale)), 1)
+    return np.ascontiguousarray(rgb[::step, ::step])
+
+
+def scale_boxes(boxes: Sequence[Box], sx: float, sy: float, shape: Tuple[int, ...]) -> List[Box]:
+    """Map boxes from a resized image back to one of ``shape``."""
+    height, width = shape[:2]
+    return [
+        (
+            max(int(round(top * sy)), 0),
+            min(int(round(right * sx)), width),
+            min(int(round(bottom * sy)), height),
+            max(int(round(left * sx)), 0),
+        )
+        for top, right, bottom, left in boxes
+    ]
+
+
+def expand_box(box: Box, margin: float, shape: Tuple[int, ...]) -> Box:
+    """Grow a box by ``margin`` of its size on every side, clipped to the frame."""
+    top, right, bottom, left = box
+    height, width = shape[:2]
+    dy = int((bottom - top) * margin)
+    dx = int((right - left) * margin)
+    return (max(top - dy, 0), min(right + dx, width), min(bottom + dy, height), max(left - dx, 0))
+
+
+def locate_scaled(detector: Detector, rgb: np.ndarray, scale: float, model: str = "hog") -> List[Box]:
+    """Full-frame detection on a copy of ``rgb`` resized by ``scale``."""
+    small = resize(rgb, scale)
+    boxes = detector(small, model=model)
+    if small is rgb:
+        return [tuple(int(v) for v in box) for box in boxes]
+    sy = rgb.shape[0] / small.shape[0]
+    sx = rgb.shape[1] / small.shape[1]
+    return scale_boxes(boxes, sx, sy, rgb.shape)
+
+
+def locate_in_rois(
+    detector: Detector,
+    rgb: np.ndarray,
+    rois: Sequence[Box],
+    margin: float = 0.5,
+    model: str = "hog",
+) -> Tuple[List[Box], int]:
+    """Detect faces only inside regions around ``rois``.
+
+    Returns:
+        The boxes found, in frame coordinates, and how many regions yielded
+        no face (a hint that a full scan is due).
+    """
+    found: List[Box] = []
+    empty = 0
+    for roi in rois:
+        top, right, bottom, left = expand_box(roi, margin, rgb.shape)
+        if bottom - top < 2 or right - left < 2:
+            empty += 1
+            continue
+        crop = np.ascontiguousarray(rgb[top:bottom, left:right])
+        boxes = detector(crop, model=model)
+        if not boxes:
+            empty += 1
+        for b_top, b_right, b_bottom, b_left in boxes:
+            box = (int(b_top) + top, int(b_right) + left, int(b_bottom) + top, int(b_left) + left)
+            if not any(_overlap(box, other) > 0.5 for other in found):
+                found.append(box)
+    return found, empty
+
+
+def locate_faces(
+    detector: Detector,
+    rgb: np.ndarray,
+    scale: float = 1.0,
+    rois: Optional[Sequence[Box]] = None,
+    margin: float = 0.5,
+    model: str = "hog",
+) -> Tuple[List[Box], bool]:
+    """Face boxes for ``rgb``, searching only ``rois`` when given.
+
+    Falls back to a scaled full-frame scan when there are no regions or any
+    region loses its face.
+
+    Returns:
+        The boxes and whether a full-frame scan was performed.
+    """
+    if rois:
+        boxes, empty = locate_in_rois(detector, rgb, rois, margin, model)
+        if not empty:
+            return boxes, False
+    return locate_scaled(detector, rgb, scale, model), True
+
+
+def _overlap(a: Box, b: Box) -> float:
+    top, right = max(a[0], b[0]), min(a[1], b[1])
+    bottom, left = min(a[2], b[2]), max(a[3], b[3])
+    inter = max(right - left, 0) * max(bottom - top, 0)
+    area_a = (a[1] - a[3]) * (a[2] - a[0])
+    area_b = (b[1] - b[3]) * (b[2] - b[0])
+    union = area_a + area_b - inter
+    return inter / union if union > 0 else 0.0
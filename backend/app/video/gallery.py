@@ -0,0 +1,148 @@
+"""Local gallery of known face encodings for in-process identity lookup."""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger("webrtc.video.gallery")
+
+
+@dataclass
+class GalleryMatch:
+    """Closest known speaker for a probe face."""
+    speaker_id: str
+    distance: float  # Euclidean distance between embeddings of the active face backend
+    speaker: Dict[str, Any]
+
+    def as_result(self) -> Dict[str, Any]:
+        """Same shape as ``ConvexMemoryService.find_speaker_by_face`` results.
+
+        ``score`` is ``1 - distance`` so that, as with Convex, higher is better.
+        """
+        return {
+            "found": True,
+            "speakerId": self.speaker_id,
+            "speaker": self.speaker,
+            "score": 1.0 - self.distance,
+            "source": "gallery",
+        }
+
+
+class FaceGallery:
+    """Known face encodings as rows of one matrix, keyed by speaker ID.
+
+    ``match_threshold`` is a Euclidean distance on the active backend's
+    embeddings; see ``FaceBackend.default_match_threshold``.
+
+    Seeded from Convex ``listSpeakers`` and kept current by
+    ``VideoPipeline.update_speaker_face``; a speaker has at most one row, so
+    setting a new encoding replaces (invalidates) the old one.
+    """
+
+    def __init__(self, dim: int = 128, match_threshold: float = 0.6, initial_capacity: int = 64) -> None:
+        self.dim = dim
+        self.match_threshold = match_threshold
+        self._matrix = np.zeros((max(initial_capacity, 1), dim), dtype=np.float64)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._speakers: Dict[str, Dict[str, Any]] = {}
+        self.seeded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, speaker_id: object) -> bool:
+        return speaker_id in self._rows
+
+    @property
+    def ids(self) -> List[str]:
+        return list(self._ids)
+
+    def set(
+        self,
+        speaker_id: str,
+        embedding: np.ndarray,
+        speaker: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Add or replace a speaker's encoding; returns False for unusable vectors."""
+        vector = np.asarray(embedding, dtype=np.float64).reshape(-1)
+        if vector.size != self.dim or not np.all(np.isfinite(vector)):
+            return False
+        row = self._rows.get(speaker_id)
+        if row is None:
+            row = len(self._ids)
+            if row == self._matrix.shape[0]:
+                grown = np.zeros((row * 2, self.dim), dtype=np.float64)
+                grown[:row] = self._matrix[:row]
+                self._matrix = grown
+            self._ids.append(speaker_id)
+            self._rows[speaker_id] = row
+        self._matrix[row] = vector
+        if speaker is not None:
+            # The encoding already lives in the matrix.
+            self._speakers[speaker_id] = {k: v for k, v in speaker.items() if k != "faceEmbedding"}
+        else:
+            self._speakers.setdefault(speaker_id, {"_id": speaker_id})
+        return True
+
+    def remove(self, speaker_id: str) -> bool:
+        row = self._rows.pop(speaker_id, None)
+        if row is None:
+            return False
+        last = len(self._ids) - 1
+        if row != last:
+            moved = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = moved
+            self._rows[moved] = row
+        self._ids.pop()
+        self._speakers.pop(speaker_id, None)
+        return True
+
+    def distances(self, embeddings: np.ndarray) -> np.ndarray:
+        """``(F, G)`` Euclidean distances from ``F`` probes to every entry."""
+        probes = np.asarray(embeddings, dtype=np.float64).reshape(-1, self.dim)
+        gallery = self._matrix[: len(self._ids)]
+        return np.linalg.norm(probes[:, None, :] - gallery[None, :, :], axis=2)
+
+    def match_many(self, embeddings: np.ndarray) -> List[Optional[GalleryMatch]]:
+        """Closest entry within ``match_threshold`` for each probe, in one pass."""
+        probes = np.asarray(embeddings, dtype=np.float64).reshape(-1, self.dim)
+        if not self._ids or probes.shape[0] == 0:
+            return [None] * probes.shape[0]
+        dists = self.distances(probes)
+        best = dists.argmin(axis=1)
+        matches: List[Optional[GalleryMatch]] = []
+        for i, row in enumerate(best):
+            distance = float(dists[i, row])
+            if distance > self.match_threshold:
+                matches.append(None)
+                continue
+            speaker_id = self._ids[int(row)]
+            matches.append(GalleryMatch(speaker_id, distance, self._speakers[speaker_id]))
+        return matches
+
+    def match(self, embedding: np.ndarray) -> Optional[GalleryMatch]:
+        return self.match_many(np.asarray(embedding).reshape(1, -1))[0]
+
+    async def seed(self, convex_service: Any) -> int:
+        """Load every speaker with a stored ``faceEmbedding`` from Convex.
+
+        Returns:
+            Number of gallery entries after seeding.
+        """
+        speakers = await convex_service.list_speakers()
+        loaded = 0
+        for speaker in speakers or []:
+            speaker_id = speaker.get("_id")
+            embedding = speaker.get("faceEmbedding")
+            if speaker_id and embedding and self.set(speaker_id, embedding, speaker):
+                loaded += 1
+        self.seeded_at = time.monotonic()
+        logger.info("Face gallery seeded with %d of %d speakers", loaded, len(speakers or []))
+        return len(self)
@@ -10,45 +10,61 @@ from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 import numpy as np
 
-logger = logging.getLogger("webrtc.video")
+from ..core.config import (
+    FACE_BACKEND,
+    FACE_MATCH_THRESHOLD,
+    FACE_ONNX_DETECTOR,
+    FACE_ONNX_EMBEDDER,
+    FACE_ONNX_INT8,
+    FACE_ONNX_THREADS,
+)
+from ..core.executors import run_in_pool
+from ..core.model_workers import get_model_workers
+from .backends import FaceBackend, create_face_backend
+from .detection import locate_faces
+from .gallery import FaceGallery
+from .tracking import FaceTracker
 
-# Try to import face_recognition (requires dlib)
-try:
-    import face_recognition
-    FACE_RECOGNITION_AVAILABLE = True
-    logger.info("face_recognition library loaded successfully")
-except ImportError:
-    face_recognition = None
-    FACE_RECOGNITION_AVAILABLE = False
-    logger.warning("face_recognition not available - face detection disabled")
-
-# Try to import OpenCV
-try:
-    import cv2
-    CV2_AVAILABLE = True
-except ImportError:
-    cv2 = None
-    CV2_AVAILABLE = False
-    logger.warning("OpenCV not available")
+logger = logging.getLogger("webrtc.video")
 
 
 @dataclass
 class FaceDetection:
     """Represents a detected face in a frame."""
     face_id: str
-    embedding: List[float]  # 128-dim dlib embedding
+    embedding: List[float]  # 128-dim for the dlib backend
     location: tuple  # (top, right, bottom, left)
     confidence: float
     timestamp: float
+    reencoded: bool = True  # False when the embedding was reused from the track
 
 
 @dataclass
 class VideoPipelineConfig:
     """Configuration for video processing."""
-    target_fps: float = 1.0  # Process 1 frame per second (save resources)
+    target_fps: float = 1.0  # Sampling rate after motion or a new face
+    present_fps: float = 0.5  # Faces present, scene static
+    idle_fps: float = 0.2  # Empty, static room
+    motion_probe_fps: float = 5.0  # Thumbnail frame-difference checks per second
+    motion_threshold: float = 6.0  # Mean absolute grey-level change that counts as motion
+    boost_seconds: float = 3.0  # How long motion or a new face keeps target_fps
+    decode_width: int = 640  # Frames are decoded to RGB at most this wide (0 = native)
     min_face_size: int = 50  # Minimum face size in pixels
     embedding_model: str = "large"  # 'small' (5 landmarks) or 'large' (68 landmarks)
-    match_threshold: float = 0.6  # Face distance threshold for matching
+    match_threshold: Optional[float] = FACE_MATCH_THRESHOLD  # None = backend default
+    track_iou_threshold: float = 0.3  # Box overlap needed to continue a face track
+    track_max_misses: int = 2  # Processed frames a track may be unseen before it ends
+    reencode_seconds: float = 10.0  # Refresh a tracked face's encoding after this long
+    detection_scale: float = 0.5  # Full-frame HOG runs on a frame resized by this factor
+    roi_redetect: bool = True  # Between full scans, search only around tracked faces
+    roi_margin: float = 0.5  # Search region grows each track box by this fraction per side
+    full_scan_interval_seconds: float = 5.0  # Full-frame scan at least this often
+    gallery_refresh_seconds: float = 300.0  # Re-seed the local face gallery from Convex
+    backend: str = FACE_BACKEND  # "dlib" (face_recognition) or "onnx" (ONNX Runtime)
+    onnx_detector_path: str = FACE_ONNX_DETECTOR
+    onnx_embedder_path: str = FACE_ONNX_EMBEDDER
+    onnx_threads: int = FACE_ONNX_THREADS  # Intra-op threads (0 = ONNX Runtime default)
+    onnx_int8: bool = FACE_ONNX_INT8  # Use int8 dynamically quantised weights
 
 
 class VideoPipeline:
@@ -57,9 +73,9 @@ class VideoPipeline:
     
     Workflow:
     1. Receive video frame from WebRTC
-    2. Detect faces using face_recognition (HOG or CNN)
-    3. Extract 128-dim face embeddings
-    4. Match against known speakers in Convex
+    2. Detect faces with the configured backend (dlib HOG or ONNX)
+    3. Extract face embeddings (128-dim for dlib)
+    4. Match against the local gallery, then known speakers in Convex
     5. Return identity information
     """
 
@@ -70,127 +86,251 @@ class VideoPipeline:
     ):
         self.config = config or VideoPipelineConfig()
         self._convex_service = convex_service
-        self._last_process_time: float = 0.0
-        self._known_faces: Dict[str, np.ndarray] = {}  # speaker_id -> embedding
-        self._face_cache: Dict[str, FaceDetection] = {}  # face_id -> detection
-        
-        if not FACE_RECOGNITION_AVAILABLE:
-            logger.warning("VideoPipeline initialized but face_recognition not available")
+        self._backend: FaceBackend = create_face_backend(self.config)
+        # Resolved against the backend actually loaded (ONNX may fall back to dlib).
+        self.match_threshold = (
+            self.config.match_threshold
+            if self.config.match_threshold is not None
+            else self._backend.default_match_threshold
+        )
+        self._gallery = FaceGallery(
+            dim=self._backend.embedding_dim, match_threshold=self.match_threshold
+        )
+        self._gallery_seeding: Optional[asyncio.Task] = None
+        self._trackers: Dict[str, FaceTracker] = {}  # session_id -> tracker
+        # Worker processes only host the dlib models.
+        self._model_workers = get_model_workers() if self._backend.name == "dlib" else None
+
+        if not self._backend.available:
+            logger.warning(
+                "VideoPipeline initialized but the %s face backend is not available",
+                self._backend.name,
+            )
 
     @property
     def is_available(self) -> bool:
         """Check if face recognition is available."""
-        return FACE_RECOGNITION_AVAILABLE and CV2_AVAILABLE
+        return self._backend.available
+
+    @property
+    def backend(self) -> FaceBackend:
+        return self._backend
 
-    async def process_frame(self, frame: np.ndarray, timestamp: float) -> List[FaceDetection]:
+    async def process_frame(
+        self, frame: np.ndarray, timestamp: float, session_id: str = "default"
+    ) -> List[FaceDetection]:
         """
         Process a single video frame for face detection.
-        
+
+        Faces are tracked per session, so ``face_id`` is a stable track ID and
+        the 128-d encoding is only recomputed for new, re-acquired or stale
+        tracks; other detections carry the track's cached embedding.
+
         Args:
-            frame: BGR numpy array from OpenCV/WebRTC
+            frame: RGB numpy array (see ``scheduler.decode_rgb``)
             timestamp: Frame timestamp in seconds
-            
+            session_id: Video stream the frame belongs to
+
         Returns:
             List of detected faces with embeddings
         """
         if not self.is_available:
             return []
 
-        # Rate limiting - only process at target FPS
-        elapsed = timestamp - self._last_process_time
-        if elapsed < (1.0 / self.config.target_fps):
-            return list(self._face_cache.values())
-
-        self._last_process_time = timestamp
-
+        # Sampling rate is decided per track by AdaptiveFrameScheduler.
         try:
-            # Convert BGR to RGB for face_recognition
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-            # Detect face locations
-            face_locations = await asyncio.to_thread(
-                face_recognition.face_locations,
-                rgb_frame,
-                model="hog"  # Use 'cnn' for GPU acceleration
-            )
-
-            if not face_locations:
-                self._face_cache.clear()
+            tracker = self._tracker(session_id)
+            face_locations = await self._locate_faces(frame, tracker, timestamp)
+            face_locations = [
+                location for location in face_locations
+                if max(location[1] - location[3], location[2] - location[0])
+                >= self.config.min_face_size
+            ]
+
+            tracks, needs_encoding = tracker.update(face_locations, timestamp)
+            if not tracks:
                 return []
 
-            # Extract face encodings (128-dim embeddings)
-            face_encodings = await asyncio.to_thread(
-                face_recognition.face_encodings,
-                rgb_frame,
-                face_locations,
-                model=self.config.embedding_model
-            )
+            if needs_encoding:
+                encodings = await self._encode_faces(
+                    frame, [face_locations[i] for i in needs_encoding]
+                )
+                for i, encoding in zip(needs_encoding, encodings):
+                    tracker.set_embedding(tracks[i], encoding, timestamp)
 
+            fresh = set(needs_encoding)
             detections: List[FaceDetection] = []
-            for i, (location, encoding) in enumerate(zip(face_locations, face_encodings)):
-                top, right, bottom, left = location
-                face_size = max(right - left, bottom - top)
-
-                # Skip small faces
-                if face_size < self.config.min_face_size:
+            for i, track in enumerate(tracks):
+                if track.embedding is None:
                     continue
-
-                # Generate stable face ID based on position
-                face_id = f"face_{i}"
-
-                detection = FaceDetection(
-                    face_id=face_id,
-                    embedding=encoding.tolist(),
-                    location=location,
-                    confidence=1.0,  # face_recognition doesn't provide confidence
-                    timestamp=timestamp,
+                detections.append(
+                    FaceDetection(
+                        face_id=track.track_id,
+                        embedding=track.embedding.tolist(),
+                        location=track.location,
+                        confidence=1.0,  # backends don't report a confidence
+                        timestamp=timestamp,
+                        reencoded=i in fresh,
+                    )
                 )
-                detections.append(detection)
-
-            # Update cache
-            self._face_cache = {d.face_id: d for d in detections}
 
-            logger.debug("Detected %d faces in frame", len(detections))
+            logger.debug(
+                "Detected %d faces in frame (%d encoded)", len(detections), len(needs_encoding)
+            )
             return detections
 
         except Exception as exc:
             logger.error("Face detection failed: %s", exc)
             return []
 
+    def release_session(self, session_id: str) -> None:
+        """Drop face tracks once a session's video ends."""
+        self._trackers.pop(session_id, None)
+
+    def _tracker(self, session_id: str) -> FaceTracker:
+        tracker = self._trackers.get(session_id)
+        if tracker is None:
+            tracker = FaceTracker(
+                iou_threshold=self.config.track_iou_threshold,
+                max_misses=self.config.track_max_misses,
+                reencode_seconds=self.config.reencode_seconds,
+            )
+            self._trackers[session_id] = tracker
+        return tracker
+
+    async def _locate_faces(
+        self, rgb_frame: np.ndarray, tracker: FaceTracker, timestamp: float
+    ) -> List[tuple]:
+        """Detect on a downscaled frame, or only around tracks between full scans."""
+        rois = None
+        if (
+            self.config.roi_redetect
+            and tracker.tracks
+            and timestamp - tracker.last_full_scan < self.config.full_scan_interval_seconds
+        ):
+            rois = [track.location for track in tracker.tracks]
+
+        if self._model_workers is not None:
+            boxes, full_scan = await self._model_workers.locate_faces(
+                rgb_frame, "hog", self.config.detection_scale, rois, self.config.roi_margin
+            )
+        else:
+            boxes, full_scan = await run_in_pool(
+                "video",
+                locate_faces,
+                self._backend.locate,
+                rgb_frame,
+                self.config.detection_scale,
+                rois,
+                self.config.roi_margin,
+                "hog",  # Use 'cnn' for GPU acceleration
+            )
+        if full_scan:
+            tracker.last_full_scan = timestamp
+        return boxes
+
+    async def _encode_faces(
+        self, rgb_frame: np.ndarray, locations: List[tuple]
+    ) -> List[np.ndarray]:
+        if self._model_workers is not None:
+            return await self._model_workers.encode_faces(
+                rgb_frame, locations, self.config.embedding_model
+            )
+        return await run_in_pool("video", self._backend.encode, rgb_frame, locations)
+
+    @property
+    def gallery(self) -> FaceGallery:
+        return self._gallery
+
+    async def load_face_gallery(self) -> int:
+        """Seed the local face gallery from Convex; returns its size."""
+        if not self._convex_service or not self._convex_service.is_available:
+            return 0
+        try:
+            return await self._gallery.seed(self._convex_service)
+        except Exception as exc:
+            logger.error("Failed to seed face gallery: %s", exc)
+            return len(self._gallery)
+
     async def match_face_to_speaker(
         self,
         face_embedding: List[float],
     ) -> Optional[Dict[str, Any]]:
         """
-        Match a face embedding against known speakers in database.
-        
+        Match a face embedding against known speakers.
+
         Args:
             face_embedding: 128-dim face embedding
-            
+
         Returns:
             Speaker info if match found, None otherwise
         """
-        if not self._convex_service or not self._convex_service.is_available:
-            return None
+        return (await self.match_faces([face_embedding]))[0]
+
+    async def match_faces(
+        self,
+        face_embeddings: List[List[float]],
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Match every face in a frame against known speakers.
+
+        All faces are compared with the local gallery in one batched distance
+        computation; Convex ``findSpeakerByFace`` is only called, concurrently,
+        for the faces the gallery misses, and its hits are added to the gallery.
+
+        Args:
+            face_embeddings: 128-dim face embeddings
+
+        Returns:
+            Speaker info or None for each embedding, in order
+        """
+        if not face_embeddings:
+            return []
+        self._refresh_gallery_if_stale()
+        matches = self._gallery.match_many(np.asarray(face_embeddings, dtype=np.float64))
+        results: List[Optional[Dict[str, Any]]] = [
+            match.as_result() if match is not None else None for match in matches
+        ]
+        for match in matches:
+            if match is not None:
+                logger.debug(
+                    "Face matched to speaker %s locally (distance=%.2f)",
+                    match.speaker_id,
+                    match.distance,
+                )
+
+        misses = [i for i, result in enumerate(results) if result is None]
+        if misses and self._convex_service and self._convex_service.is_available:
+            remote = await asyncio.gather(
+                *(self._match_remote(face_embeddings[i]) for i in misses)
+            )
+            for i, result in zip(misses, remote):
+                results[i] = result
+        return results
 
+    async def _match_remote(self, face_embedding: List[float]) -> Optional[Dict[str, Any]]:
         try:
-            # Use Convex vector search for face matching
-            # This would call a new action: findSpeakerByFace
             result = await self._convex_service.find_speaker_by_face(
                 face_embedding,
-                threshold=self.config.match_threshold
+                threshold=self.match_threshold
             )
-            
+
             if result and result.get("found"):
                 logger.info(
                     "Face matched to speaker %s (score=%.2f)",
                     result.get("speakerId"),
                     result.get("score", 0)
                 )
+                speaker = result.get("speaker") or {}
+                self._gallery.set(
+                    result["speakerId"],
+                    speaker.get("faceEmbedding") or face_embedding,
+                    speaker or None,
+                )
                 return result
 
             return None
-            
+
         except Exception as exc:
             logger.error("Face matching failed: %s", exc)
             return None
@@ -199,14 +339,16 @@ class VideoPipeline:
         self,
         speaker_id: str,
         face_embedding: List[float],
+        name: Optional[str] = None,
     ) -> bool:
         """
         Associate a face embedding with an existing speaker.
-        
+
         Args:
             speaker_id: Convex speaker ID
             face_embedding: 128-dim face embedding
-            
+            name: Speaker name, kept with the gallery entry
+
         Returns:
             True if successful
         """
@@ -214,21 +356,32 @@ class VideoPipeline:
             return False
 
         try:
-            await self._convex_service.update_speaker_face(
+            ok = await self._convex_service.update_speaker_face(
                 speaker_id,
                 face_embedding
             )
-            
-            # Update local cache
-            self._known_faces[speaker_id] = np.array(face_embedding)
-            
+            if not ok:
+                return False
+
+            # Replace the gallery entry so stale encodings stop matching
+            speaker = {"_id": speaker_id, "name": name} if name else None
+            self._gallery.set(speaker_id, face_embedding, speaker)
+
             logger.info("Updated face embedding for speaker %s", speaker_id)
             return True
-            
+
         except Exception as exc:
             logger.error("Failed to update speaker face: %s", exc)
             return False
 
+    def _refresh_gallery_if_stale(self) -> None:
+        seeded_at = self._gallery.seeded_at
+        if seeded_at is None or time.monotonic() - seeded_at < self.config.gallery_refresh_seconds:
+            return
+        if self._gallery_seeding is None or self._gallery_seeding.done():
+            self._gallery.seeded_at = time.monotonic()
+            self._gallery_seeding = asyncio.create_task(self.load_face_gallery())
+
     def compare_faces(
         self,
         known_embedding: List[float],
@@ -242,17 +395,13 @@ class VideoPipeline:
             unknown_embedding: Unknown face embedding
             
         Returns:
-            Euclidean distance (lower = more similar, <0.6 is same person)
+            Euclidean distance (lower = more similar, <0.6 is same person for dlib)
         """
-        if not FACE_RECOGNITION_AVAILABLE:
+        known = np.asarray(known_embedding, dtype=np.float64)
+        unknown = np.asarray(unknown_embedding, dtype=np.float64)
+        if known.shape != unknown.shape:
             return float('inf')
-
-        distance = face_recognition.face_distance(
-            [np.array(known_embedding)],
-            np.array(unknown_embedding)
-        )[0]
-        
-        return float(distance)
+        return float(np.linalg.norm(known - unknown))
 
 
 # Global instance
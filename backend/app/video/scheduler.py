@@ -0,0 +1,151 @@
+"""Adaptive sampling of live video frames for face recognition.
+
+Most frames show an unchanged room, often an empty chair, and face
+recognition is the most expensive thing the backend does. Rather than
+processing every Nth frame, :class:`AdaptiveFrameScheduler` samples at a
+rate that follows what is happening:
+
+- ``active_fps`` for a few seconds after the scene changes or a new face
+  appears,
+- ``present_fps`` while faces remain in a static scene,
+- ``idle_fps`` when the room is static and empty.
+
+Scene changes are found by comparing a tiny greyscale thumbnail, decoded at
+``probe_fps``, with the thumbnail of the last processed frame.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("webrtc.video.scheduler")
+
+THUMBNAIL_SIZE: Tuple[int, int] = (64, 36)  # (width, height)
+
+
+def decode_thumbnail(frame, size: Tuple[int, int] = THUMBNAIL_SIZE) -> np.ndarray:
+    """Downscaled greyscale ``uint8`` copy of an aiortc/PyAV ``VideoFrame``."""
+    width, height = size
+    return frame.to_ndarray(format="gray", width=width, height=height)
+
+
+def decode_rgb(frame, max_width: int = 0) -> np.ndarray:
+    """RGB ``uint8`` array, scaled down so its width is at most ``max_width``.
+
+    Decoding straight to RGB at the reduced size does the colour conversion
+    and resize in one libswscale pass; ``max_width`` of 0 keeps the native size.
+    """
+    if max_width <= 0 or frame.width <= max_width:
+        return frame.to_ndarray(format="rgb24")
+    height = int(round(frame.height * max_width / frame.width)) & ~1
+    return frame.to_ndarray(format="rgb24", width=max_width, height=max(height, 2))
+
+
+class AdaptiveFrameScheduler:
+    """Decides which frames of one video track go to face recognition.
+
+    Call :meth:`wants_probe` for each received frame; when it returns True,
+    decode a thumbnail and pass it to :meth:`should_process`. After a
+    processed frame, report the number of faces found with
+    :meth:`record_faces`.
+    """
+
+    def __init__(
+        self,
+        active_fps: float = 1.0,
+        present_fps: float = 0.5,
+        idle_fps: float = 0.2,
+        probe_fps: float = 5.0,
+        motion_threshold: float = 6.0,
+        boost_seconds: float = 3.0,
+    ) -> None:
+        self.active_fps = active_fps
+        self.present_fps = present_fps
+        self.idle_fps = idle_fps
+        self.probe_fps = probe_fps
+        self.motion_threshold = motion_threshold
+        self.boost_seconds = boost_seconds
+
+        self._reference: Optional[np.ndarray] = None
+        self._last_probe = float("-inf")
+        self._last_process = float("-inf")
+        self._boost_until = float("-inf")
+        self._face_count = 0
+        self.probes = 0
+        self.processed = 0
+        self.motion_triggers = 0
+
+    @classmethod
+    def from_config(cls, config) -> "AdaptiveFrameScheduler":
+        """Build from a :class:`~app.video.pipeline.VideoPipelineConfig`."""
+        return cls(
+            active_fps=config.target_fps,
+            present_fps=config.present_fps,
+            idle_fps=config.idle_fps,
+            probe_fps=config.motion_probe_fps,
+            motion_threshold=config.motion_threshold,
+            boost_seconds=config.boost_seconds,
+        )
+
+    @property
+    def face_count(self) -> int:
+        return self._face_count
+
+    def current_fps(self, now: float) -> float:
+        if now < self._boost_until:
+            return self.active_fps
+        if self._face_count:
+            return self.present_fps
+        return self.idle_fps
+
+    def wants_probe(self, now: float) -> bool:
+        """Whether this frame is due for a thumbnail check."""
+        if now - self._last_probe < 1.0 / max(self.probe_fps, 1e-6):
+            return False
+        self._last_probe = now
+        return True
+
+    def should_process(self, thumbnail: np.ndarray, now: float) -> bool:
+        """Whether the probed frame should be run through face recognition.
+
+        Args:
+            thumbnail: Greyscale thumbnail from :func:`decode_thumbnail`.
+            now: Monotonic time in seconds.
+
+        Returns:
+            True if the frame is due at the current sampling rate.
+        """
+        self.probes += 1
+        if self._reference is None or self._reference.shape != thumbnail.shape:
+            self._boost_until = now + self.boost_seconds
+        else:
+            diff = np.abs(thumbnail.astype(np.int16) - self._reference).mean()
+            if diff > self.motion_threshold:
+                if now >= self._boost_until:
+                    self.motion_triggers += 1
+                    logger.debug("Scene change (mean diff %.1f); sampling at %.1f fps", diff, self.active_fps)
+                self._boost_until = now + self.boost_seconds
+
+        fps = self.current_fps(now)
+        if now - self._last_process < 1.0 / max(fps, 1e-6):
+            return False
+        self._last_process = now
+        self._reference = thumbnail.astype(np.int16)
+        self.processed += 1
+        return True
+
+    def record_faces(self, count: int, now: float) -> None:
+        """Report how many faces the last processed frame contained."""
+        if count > self._face_count:
+            self._boost_until = now + self.boost_seconds
+        self._face_count = count
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "probes": self.probes,
+            "processed": self.processed,
+            "motion_triggers": self.motion_triggers,
+        }
@@ -0,0 +1,189 @@
+"""Lightweight face tracking between detections.
+
+Face encoding (the 68-landmark dlib model) costs far more than detection,
+and a visitor sitting still produces nearly the same box on every sample.
+:class:`FaceTracker` matches each frame's boxes to existing tracks by IoU,
+falling back to centroid distance for small fast moves, so a face keeps a
+stable track ID. Its encoding is recomputed only when the track is new, has
+just been re-acquired after being lost, or the cached encoding is stale.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("webrtc.video.tracking")
+
+Box = Tuple[int, int, int, int]  # (top, right, bottom, left), face_recognition order
+
+
+@dataclass
+class FaceTrack:
+    """A face followed across processed frames."""
+    track_id: str
+    location: Box
+    first_seen: float
+    last_seen: float
+    embedding: Optional[np.ndarray] = None
+    last_encoded: float = float("-inf")
+    misses: int = 0
+    hits: int = 1
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of ``(N, 4)`` and ``(M, 4)`` boxes in (top, right, bottom, left)."""
+    top = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    right = np.minimum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    bottom = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    left = np.maximum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    inter = np.clip(right - left, 0, None) * np.clip(bottom - top, 0, None)
+    area_a = (boxes_a[:, 1] - boxes_a[:, 3]) * (boxes_a[:, 2] - boxes_a[:, 0])
+    area_b = (boxes_b[:, 1] - boxes_b[:, 3]) * (boxes_b[:, 2] - boxes_b[:, 0])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+class FaceTracker:
+    """Assigns stable track IDs to face boxes for one video stream.
+
+    Args:
+        iou_threshold: Minimum IoU for a box to continue a track.
+        centroid_fraction: Fallback match when the centres are closer than
+            this fraction of the track's box size.
+        max_misses: Processed frames a track may go unseen before it is dropped.
+        reencode_seconds: Age after which a track's encoding is refreshed.
+    """
+
+    def __init__(
+        self,
+        iou_threshold: float = 0.3,
+        centroid_fraction: float = 0.5,
+        max_misses: int = 2,
+        reencode_seconds: float = 10.0,
+    ) -> None:
+        self.iou_threshold = iou_threshold
+        self.centroid_fraction = centroid_fraction
+        self.max_misses = max_misses
+        self.reencode_seconds = reencode_seconds
+        self._tracks: Dict[str, FaceTrack] = {}
+        self._ids = itertools.count(1)
+        self.last_full_scan = float("-inf")
+
+    @property
+    def tracks(self) -> List[FaceTrack]:
+        return list(self._tracks.values())
+
+    def update(
+        self, locations: Sequence[Box], now: float
+    ) -> Tuple[List[FaceTrack], List[int]]:
+        """Match this frame's boxes to tracks.
+
+        Args:
+            locations: Face boxes detected in the frame.
+            now: Frame time in seconds.
+
+        Returns:
+            The track for each box (same order as ``locations``) and the
+            indices of the boxes whose encoding must be computed.
+        """
+        tracks = list(self._tracks.values())
+        assigned: List[Optional[FaceTrack]] = [None] * len(locations)
+        if tracks and locations:
+            for det_idx, track_idx in self._match(tracks, locations):
+                assigned[det_idx] = tracks[track_idx]
+
+        needs_encoding: List[int] = []
+        matched_ids = set()
+        for i, location in enumerate(locations):
+            track = assigned[i]
+            box = tuple(int(v) for v in location)
+            if track is None:
+                track = FaceTrack(
+                    track_id=f"track_{next(self._ids)}",
+                    location=box,
+                    first_seen=now,
+                    last_seen=now,
+                )
+                self._tracks[track.track_id] = track
+                assigned[i] = track
+                needs_encoding.append(i)
+            else:
+                reacquired = track.misses > 0
+                track.location = box
+                track.last_seen = now
+                track.misses = 0
+                track.hits += 1
+                if (
+                    track.embedding is None
+                    or reacquired
+                    or now - track.last_encoded >= self.reencode_seconds
+                ):
+                    needs_encoding.append(i)
+            matched_ids.add(track.track_id)
+        result: List[FaceTrack] = [t for t in assigned if t is not None]
+
+        for track_id in list(self._tracks):
+            if track_id in matched_ids:
+                continue
+            track = self._tracks[track_id]
+            track.misses += 1
+            if track.misses > self.max_misses:
+                del self._tracks[track_id]
+                logger.debug("Dropped face track %s", track_id)
+
+        return result, needs_encoding
+
+    def set_embedding(self, track: FaceTrack, embedding: np.ndarray, now: float) -> None:
+        track.embedding = np.asarray(embedding, dtype=np.float64)
+        track.last_encoded = now
+
+    def _match(
+        self, tracks: List[FaceTrack], locations: Sequence[Box]
+    ) -> List[Tuple[int, int]]:
+        """Greedy one-to-one matching, best IoU first, then nearest centroid."""
+        track_boxes = np.array([t.location for t in tracks], dtype=np.float64)
+        det_boxes = np.array(locations, dtype=np.float64).reshape(-1, 4)
+        ious = iou_matrix(det_boxes, track_boxes)
+
+        pairs: List[Tuple[int, int]] = []
+        used_det: set = set()
+        used_track: set = set()
+        for flat in np.argsort(-ious, axis=None):
+            det_idx, track_idx = divmod(int(flat), ious.shape[1])
+            if ious[det_idx, track_idx] < self.iou_threshold:
+                break
+            if det_idx in used_det or track_idx in used_track:
+                continue
+            pairs.append((det_idx, track_idx))
+            used_det.add(det_idx)
+            used_track.add(track_idx)
+
+        if len(used_det) < len(det_boxes) and len(used_track) < len(track_boxes):
+            det_centres = np.stack(
+                [(det_boxes[:, 1] + det_boxes[:, 3]) / 2, (det_boxes[:, 0] + det_boxes[:, 2]) / 2],
+                axis=1,
+            )
+            track_centres = np.stack(
+                [(track_boxes[:, 1] + track_boxes[:, 3]) / 2, (track_boxes[:, 0] + track_boxes[:, 2]) / 2],
+                axis=1,
+            )
+            sizes = np.maximum(
+                track_boxes[:, 1] - track_boxes[:, 3], track_boxes[:, 2] - track_boxes[:, 0]
+            )
+            dist = np.linalg.norm(det_centres[:, None, :] - track_centres[None, :, :], axis=2)
+            limit = self.centroid_fraction * sizes[None, :]
+            for flat in np.argsort(dist, axis=None):
+                det_idx, track_idx = divmod(int(flat), dist.shape[1])
+                if det_idx in used_det or track_idx in used_track:
+                    continue
+                if dist[det_idx, track_idx] > limit[0, track_idx]:
+                    continue
+                pairs.append((det_idx, track_idx))
+                used_det.add(det_idx)
+                used_track.add(track_idx)
+        return pairs
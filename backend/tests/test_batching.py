@@ -0,0 +1,59 @@
+"""Batched faster-whisper decoding keeps each clip's text inside its own clip.
+
+Runs a real two-clip batch through ``BatchedInferencePipeline``. Needs
+faster-whisper, a model (``WHISPER_TEST_MODEL``, default ``tiny.en``) and
+a short English speech recording (``WHISPER_TEST_AUDIO``); skipped otherwise.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+faster_whisper = pytest.importorskip("faster_whisper")
+
+from app.audio.transcription.batching import WHISPER_SAMPLE_RATE, WhisperBatchServer  # noqa: E402
+
+AUDIO_PATH = os.getenv("WHISPER_TEST_AUDIO", "")
+LEAD_IN_SECONDS = 2.0
+
+
+@pytest.fixture(scope="module")
+def server() -> WhisperBatchServer:
+    model = faster_whisper.WhisperModel(
+        os.getenv("WHISPER_TEST_MODEL", "tiny.en"), device="cpu", compute_type="int8"
+    )
+    return WhisperBatchServer(model, beam_size=1)
+
+
+@pytest.fixture(scope="module")
+def speech() -> np.ndarray:
+    if not AUDIO_PATH or not os.path.exists(AUDIO_PATH):
+        pytest.skip("WHISPER_TEST_AUDIO not set")
+    audio = faster_whisper.decode_audio(AUDIO_PATH, sampling_rate=WHISPER_SAMPLE_RATE)
+    return audio[: 20 * WHISPER_SAMPLE_RATE]
+
+
+def _words(segments) -> set:
+    return {w.strip(".,!?").lower() for seg in segments for w in seg.text.split()}
+
+
+def test_two_clip_batch_segments_stay_in_their_clips(server, speech):
+    if server._batched is None:
+        pytest.skip("BatchedInferencePipeline unavailable")
+    lead_in = np.zeros(int(LEAD_IN_SECONDS * WHISPER_SAMPLE_RATE), dtype=np.float32)
+    clips = [speech, np.concatenate([lead_in, speech])]
+
+    results = server._decode_clips(clips)
+
+    assert len(results) == 2
+    for clip, segments in zip(clips, results):
+        assert segments, "every clip should decode to text"
+        duration = clip.size / WHISPER_SAMPLE_RATE
+        for seg in segments:
+            assert 0.0 <= seg.start < seg.end <= duration + 0.5
+
+    # The second clip is the first one after a silent lead-in.
+    assert results[1][0].start >= LEAD_IN_SECONDS - 0.5
+    first, second = _words(results[0]), _words(results[1])
+    assert len(first & second) >= 0.5 * max(len(first), len(second))
@@ -239,6 +239,11 @@ async def consume_metadata_stream():
                                     await handle_conversation_end(event)
                                     # No result to stream - just storage
 
+                                elif event.event_type == "CONVERSATION_PARTIAL":
+                                    # The full transcript arrives with CONVERSATION_END;
+                                    # storing partials as well would duplicate it.
+                                    pass
+
                             except json.JSONDecodeError as e:
                                 logger.error(f"Failed to parse event data: {e}")
                             except Exception as e:
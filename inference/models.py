@@ -23,13 +23,19 @@ class ConversationUtterance(BaseModel):
 class ConversationEvent(BaseModel):
     """Event from speaker diarization metadata service - two types."""
 
-    event_type: Literal["PERSON_DETECTED", "CONVERSATION_END", "FACE_DETECTED"] = Field(
-        ..., description="Type of event: PERSON_DETECTED or CONVERSATION_END"
+    event_type: Literal[
+        "PERSON_DETECTED", "CONVERSATION_PARTIAL", "CONVERSATION_END", "FACE_DETECTED"
+    ] = Field(
+        ...,
+        description=(
+            "Type of event: PERSON_DETECTED, CONVERSATION_PARTIAL (streamed utterances "
+            "while a conversation is in progress), CONVERSATION_END or FACE_DETECTED"
+        ),
     )
     person_id: str = Field(..., description="Person identifier from diarization")
     timestamp: datetime | None = Field(None, description="Event timestamp (auto-generated if not provided)")
     conversation: list[ConversationUtterance] | None = Field(
-        None, description="Structured conversation array (only for CONVERSATION_END)"
+        None, description="Structured conversation array (CONVERSATION_PARTIAL and CONVERSATION_END)"
     )
 
     class Config: